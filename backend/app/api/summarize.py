@@ -3,6 +3,7 @@ summarize.py — async summarization pipeline with persistent task store.
 
 Flow:
   POST /api/summarize/  → enqueues job, returns 202 + task_id
+                          (jobs are run by worker processes, see app/worker.py)
   GET  /api/summarize/status/{task_id} → poll until status == "done" | "failed"
   GET  /api/summarize/history          → list user's completed summaries
   GET  /api/summarize/{summary_id}     → fetch one summary
@@ -14,10 +15,10 @@ import os
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import numpy as np
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from slowapi import Limiter
@@ -26,12 +27,41 @@ from slowapi.util import get_remote_address
 from ..core.config import settings
 from ..core.database import get_database
 from ..core.security import get_current_user
-from ..core.task_store import create_task, get_task, update_task, mark_done, mark_failed
+from ..core.task_store import (
+    create_task,
+    get_task,
+    update_task,
+    mark_done,
+    mark_failed,
+    mark_cancelled,
+    save_artifact,
+    get_artifacts,
+    requeue_task,
+    request_cancel,
+    get_batch_tasks,
+    TERMINAL_TASK_STATUSES,
+)
+from ..core.content_store import get_content_artifacts, save_content_artifacts, is_complete
+from ..core.stage_limits import stage_slot
+from ..core.stage_graph import Stage, StageGraph
+from ..core.cpu_pool import run_cpu
+from ..core.cancellation import CancelToken, TaskCancelled
+from ..core.metrics import DB_PERSIST_SECONDS
+from ..core.tokens import count_tokens
+from ..core.transcript_cache import BlockingTranscriptCache
+from ..core.youtube import download_video, extract_youtube_id, fetch_caption_segments
 from ..core.constants import (
+    TASK_STATUS_PENDING,
     TASK_STATUS_PROCESSING,
     TASK_STATUS_TRANSCRIBING,
     TASK_STATUS_SUMMARIZING,
     TASK_STATUS_GENERATING_VIDEO,
+    TASK_STATUS_DONE,
+    TASK_STATUS_FAILED,
+    TASK_STATUS_CANCELLED,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+    MAX_BATCH_SIZE,
     DEFAULT_SUMMARY_RATIO,
     DEFAULT_MAX_SUMMARY_LENGTH,
     MAX_TRANSCRIPT_STORE_CHARS,
@@ -42,8 +72,8 @@ from ..core.constants import (
 from fastapi import File, UploadFile
 import tempfile
 import shutil
-from youtube_transcript_api import YouTubeTranscriptApi
-from ..models.summarizer import VideoSummarizer
+from ..models.summarizer import VideoSummarizer, prune_to_budget, score_segments
+from ..models.segments import SegmentTable
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -64,6 +94,22 @@ class YouTubeSummarizeRequest(BaseModel):
     url: str
 
 
+class TaskActionRequest(BaseModel):
+    action: str  # "resume"
+
+
+class BatchSummarizeRequest(BaseModel):
+    file_ids: List[str]
+    summary_ratio: Optional[float] = DEFAULT_SUMMARY_RATIO
+    max_summary_length: Optional[int] = DEFAULT_MAX_SUMMARY_LENGTH
+
+
+class BatchAccepted(BaseModel):
+    batch_id: str
+    task_ids: List[str]
+    message: str = "Batch queued. Poll /api/summarize/batch/{batch_id} for progress."
+
+
 class TaskAccepted(BaseModel):
     task_id: str
     status: str = "pending"
@@ -74,6 +120,99 @@ class TaskAccepted(BaseModel):
 # Background pipeline
 # ---------------------------------------------------------------------------
 
+def _valid_files(paths: dict) -> bool:
+    """True if every path in a {format: path} artifact still exists on disk."""
+    return bool(paths) and all(os.path.exists(p) for p in paths.values())
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Hard-link `src` to `dst` (same filesystem), else copy it."""
+    if not os.path.exists(dst):
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+    return dst
+
+
+def _adopt_shared_files(artifacts: dict, user_id: str, task_id: str) -> dict:
+    """
+    Give `user_id` its own copies (hard links where possible) of the files in
+    artifacts reused from another user's job, named as this task's stages
+    would name them — deleting one user's outputs must not break another's.
+    A file that is gone by now (deleted by its owner) drops its artifact, so
+    the stage that makes it runs again.
+    """
+    processed_dir = Path(settings.PROCESSED_DIR) / user_id
+    processed_dir.mkdir(parents=True, exist_ok=True)
+    adopted = dict(artifacts)
+    targets = {
+        "summary_video_path": processed_dir / f"summary_{task_id}.mp4",
+        "thumbnail_path": processed_dir / f"thumb_{task_id[:8]}.jpg",
+    }
+    for name, target in targets.items():
+        if not artifacts.get(name):
+            continue
+        try:
+            adopted[name] = _link_or_copy(artifacts[name], str(target))
+        except OSError as e:
+            logger.warning("Task %s: could not reuse %s: %s", task_id, name, e)
+            del adopted[name]
+    if artifacts.get("subtitle_paths"):
+        try:
+            adopted["subtitle_paths"] = {
+                fmt: _link_or_copy(path, str(processed_dir / f"subtitles_{task_id}{Path(path).suffix}"))
+                for fmt, path in artifacts["subtitle_paths"].items()
+            }
+        except OSError as e:
+            logger.warning("Task %s: could not reuse subtitle_paths: %s", task_id, e)
+            del adopted["subtitle_paths"]
+    return adopted
+
+
+def _video_available(video_record: dict) -> bool:
+    """The video is on disk, or is a YouTube video the job can download."""
+    return os.path.exists(video_record.get("file_path", "")) or bool(video_record.get("source_url"))
+
+
+async def _download_source(task_id: str, video_record: dict, cancel: Optional[CancelToken]) -> str:
+    """Download a captioned YouTube video to its recorded path (for rendering)."""
+    video_path = video_record["file_path"]
+    logger.info("Task %s: downloading %s in the background", task_id, video_record["source_url"])
+    await asyncio.to_thread(download_video, video_record["source_url"], video_path, cancel)
+    db = await get_database()
+    await db.videos.update_one(
+        {"file_id": video_record["file_id"]},
+        {"$set": {"file_size": os.path.getsize(video_path)}},
+    )
+    return video_path
+
+
+def _spans(segments) -> list:
+    """(start, end) pairs of `segments` — the compact form sent to the CPU pool."""
+    spans = []
+    for seg in segments or []:
+        start = float(seg.get("start", 0))
+        spans.append((start, float(seg.get("end", start + 2.0))))
+    return spans
+
+
+async def _checkpoint(task_id: str, artifacts: dict, name: str, value) -> None:
+    """Persist one stage's output so a retried/resumed task can skip the stage."""
+    artifacts[name] = value
+    await save_artifact(task_id, name, value)
+
+
+async def _iterate_in_thread(iterator):
+    """Consume a blocking iterator from async code, one `next()` per thread hop."""
+    done = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
 async def _run_summarize_pipeline(
     task_id: str,
     video_path: str,
@@ -82,136 +221,376 @@ async def _run_summarize_pipeline(
     user_id: str,
     whisper,
     summarizer,
+    content_hash: Optional[str] = None,
+    cancel: Optional[CancelToken] = None,
+    priority: int = PRIORITY_INTERACTIVE,
 ):
+    """
+    Run a summarization job as a graph of stages:
+
+        transcribe ─┬─ rank ── llm_input ── analysis ─┬─ summary ──┬─ thumbnail
+                    │                                 └─ key_points┴─ render ───┐
+                    ├─ subtitles ───────────────────────────────────────────────┼─ persist
+                    └─ highlights ──────────────────────────────────────────────┘
+
+    Stages start as soon as their inputs exist, so subtitles, highlights and
+    the thumbnail run alongside the summary video render.  Every stage output
+    is checkpointed; stages with a valid checkpoint are skipped.
+
+    With SUMMARIZE_COMBINED_ANALYSIS the analysis stage gets the summary, key
+    points and description from one structured LLM answer per chunk; the
+    summary and key_points stages then only make their own calls if it failed.
+    llm_input prepares their text once: a transcript over SUMMARIZE_INPUT_TOKENS
+    is pruned to its best-ranked segments, so LLM cost does not grow with the video.
+
+    `cancel` stops the job at the next stage boundary, transcription chunk or
+    LLM call; the task is then marked cancelled.  `priority` orders this job
+    against others waiting for the same stage slot (batch jobs wait longer).
+    """
     await update_task(task_id, status=TASK_STATUS_PROCESSING, progress=5, step="starting")
 
-    try:
-        # ── Step 1: Transcribe (CPU-heavy — run in thread) ────────────
-        logger.info("Task %s: starting transcription", task_id)
-        await update_task(task_id, status=TASK_STATUS_TRANSCRIBING, progress=10, step="transcribing audio")
-        segments = await asyncio.to_thread(whisper.get_segments, video_path)
-        transcript = " ".join(seg.get("text", "") for seg in segments) or "No transcript available."
-        await update_task(task_id, progress=35, step="transcription complete")
-
-        # ── Step 2: PARALLEL — rank + summarize + key points ──────────
-        # These three operations are independent and can run simultaneously
-        logger.info("Task %s: parallel processing (rank + summarize + key points)", task_id)
-        await update_task(task_id, status=TASK_STATUS_SUMMARIZING, progress=40, step="analyzing content (parallel)")
-
-        rank_task = asyncio.to_thread(summarizer.rank_segments, segments)
-        summary_task = asyncio.to_thread(summarizer.summarize_text, transcript, max_summary_length)
-        keypoints_task = asyncio.to_thread(summarizer.extract_key_points, transcript)
-
-        ranked, text_summary, key_points = await asyncio.gather(
-            rank_task, summary_task, keypoints_task
-        )
-
-        await update_task(task_id, progress=65, step="analysis complete")
+    # Map-phase summaries (or combined analyses) started while transcription is still running
+    map_tasks = []
+    combined_analysis = settings.SUMMARIZE_COMBINED_ANALYSIS
+    input_budget = settings.SUMMARIZE_INPUT_TOKENS
+    download_task = None
 
-        # Pass ALL ranked segments to the VideoProcessor — it will internally
-        # select clips totalling 55-60% of the original video duration.
-        # ranked is sorted by relevance_score descending.
-        # segments (all whisper segments) is the full unranked list.
-
-        # ── Step 3: Generate subtitles (fast, parallel with video) ────
-        subtitle_paths = {}
-        try:
+    try:
+        # Outputs of stages that finished on an earlier attempt
+        artifacts = await get_artifacts(task_id)
+        if artifacts:
+            logger.info("Task %s: resuming with checkpoints %s", task_id, sorted(artifacts))
+
+        processed_dir = Path(settings.PROCESSED_DIR) / user_id
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        video_title = Path(video_path).stem.replace("_", " ").replace("-", " ").title()
+
+        # A YouTube video added from its captions is only downloaded now, in
+        # the background — transcription reads the captions, only the
+        # thumbnail and render stages wait for the file
+        db = await get_database()
+        video_record = await db.videos.find_one({"file_path": video_path}) or {}
+        captions = video_record.get("caption_segments")
+        if video_record.get("source_url") and not os.path.exists(video_path):
+            existing = artifacts.get("summary_video_path")
+            if not (existing and os.path.exists(existing)):
+                download_task = asyncio.create_task(_download_source(task_id, video_record, cancel))
+
+        async def source_video() -> str:
+            if download_task is not None:
+                return await download_task
+            return video_path
+
+        # ── Transcribe chunk by chunk (CPU-heavy — run in thread) ─────
+        # Each transcribed audio chunk is handed straight to the summarizer's
+        # map phase, so the LLM works while later chunks are transcribed.
+        async def transcribe(_):
+            if isinstance(artifacts.get("segments"), list):
+                return SegmentTable.from_dicts(artifacts["segments"])
+            if captions:
+                logger.info("Task %s: using %d caption segments, skipping transcription", task_id, len(captions))
+                segments = SegmentTable.from_dicts(captions)
+                await _checkpoint(task_id, artifacts, "segments", segments.to_dicts())
+                return segments
+            await source_video()
+            logger.info("Task %s: starting transcription", task_id)
+            await update_task(task_id, status=TASK_STATUS_TRANSCRIBING, step="transcribing audio")
+            stream_map = not artifacts.get("text_summary") and not getattr(summarizer, "use_mock", True)
+
+            async def _map(text: str):
+                mapper = summarizer.map_analyses if combined_analysis else summarizer.map_chunks
+                async with stage_slot("llm", priority):
+                    return await asyncio.to_thread(mapper, text, max_summary_length, cancel=cancel)
+
+            transcript_cache = BlockingTranscriptCache(asyncio.get_running_loop(), whisper.model_id)
+            tables = []
+            streamed_tokens = 0
+            async with stage_slot("transcribe", priority):
+                chunks = whisper.iter_segment_tables(video_path, cancel=cancel, cache=transcript_cache)
+                async for chunk in _iterate_in_thread(chunks):
+                    tables.append(chunk)
+                    chunk_text = chunk.transcript().strip()
+                    if stream_map and chunk_text:
+                        # Past the input budget the transcript gets pruned — stop mapping all of it
+                        streamed_tokens += count_tokens(chunk_text)
+                        if input_budget <= 0 or streamed_tokens <= input_budget:
+                            map_tasks.append(asyncio.create_task(_map(chunk_text)))
+                    await update_task(task_id, step=f"transcribing audio ({len(tables)} chunks done)")
+            segments = SegmentTable.concat(tables)
+            await _checkpoint(task_id, artifacts, "segments", segments.to_dicts())
+            return segments
+
+        def _transcript(segments: SegmentTable) -> str:
+            return segments.transcript() or "No transcript available."
+
+        # ── Analysis: rank, then summarize + key points ───────────────
+        async def rank(inputs):
+            segments = inputs["transcribe"]
+            if isinstance(artifacts.get("ranked_segments"), list):
+                return segments.with_ranking(artifacts["ranked_segments"])
+            # TF-IDF + TextRank holds the GIL — score in the CPU pool, sort here
+            segments.score = np.asarray(await run_cpu(
+                score_segments, segments.texts(), segments.confidence.tolist()
+            ))
+            await _checkpoint(task_id, artifacts, "ranked_segments", segments.ranking_pairs())
+            return segments.take(segments.ranking())
+
+        async def llm_input(inputs) -> Optional[Tuple[str, bool]]:
+            """
+            The transcript the LLM stages work on, and whether it was pruned
+            to its best-ranked segments (SUMMARIZE_INPUT_TOKENS).
+            """
+            if artifacts.get("text_summary") and isinstance(artifacts.get("key_points"), list):
+                return None
+            ranked = inputs["rank"]
+            if input_budget <= 0 or ranked.score is None:
+                return _transcript(inputs["transcribe"]), False
+            keep = prune_to_budget(ranked.texts(), ranked.score.tolist(), input_budget)
+            if len(keep) == len(ranked):
+                return _transcript(inputs["transcribe"]), False
+            logger.info("Task %s: transcript pruned to %d of %d segments for the LLM", task_id, len(keep), len(ranked))
+            for t in map_tasks:
+                t.cancel()  # they summarize the full transcript
+            kept = ranked.take(keep)
+            return _transcript(kept.take(np.argsort(kept.start, kind="stable"))), True
+
+        async def _streamed_partials():
+            # Collect the streamed map results (they take LLM slots themselves)
+            try:
+                return [part for parts in await asyncio.gather(*map_tasks) for part in parts]
+            except Exception as map_err:
+                logger.warning("Task %s: streamed map phase failed, summarizing in one pass: %s", task_id, map_err)
+                return None
+
+        async def analysis(inputs):
+            if not combined_analysis:
+                return None
+            # A job resumed with one of the two leaves the other to its own stage
+            if artifacts.get("text_summary") or isinstance(artifacts.get("key_points"), list):
+                return None
+            await update_task(task_id, status=TASK_STATUS_SUMMARIZING, step="summarizing")
+            text, pruned = inputs["llm_input"]
+            partials = await _streamed_partials() if map_tasks and not pruned else None
+            async with stage_slot("llm", priority):
+                result = await asyncio.to_thread(
+                    summarizer.analyze_text, text, max_summary_length, partials=partials, cancel=cancel,
+                )
+            await _checkpoint(task_id, artifacts, "description", result.description)
+            await _checkpoint(task_id, artifacts, "key_points", result.key_points)
+            await _checkpoint(task_id, artifacts, "text_summary", result.summary)
+            return result
+
+        async def summary(inputs):
+            if artifacts.get("text_summary"):
+                return artifacts["text_summary"]
+            await update_task(task_id, status=TASK_STATUS_SUMMARIZING, step="summarizing")
+
+            text, pruned = inputs["llm_input"]
+            partials = await _streamed_partials() if map_tasks and not (pruned or combined_analysis) else None
+
+            async with stage_slot("llm", priority):
+                text_summary = await asyncio.to_thread(
+                    summarizer.summarize_text, text, max_summary_length, partials, cancel=cancel,
+                )
+            await _checkpoint(task_id, artifacts, "text_summary", text_summary)
+            return text_summary
+
+        async def key_points(inputs):
+            if isinstance(artifacts.get("key_points"), list):
+                return artifacts["key_points"]
+            async with stage_slot("llm", priority):
+                points = await asyncio.to_thread(
+                    summarizer.extract_key_points, inputs["llm_input"][0], cancel=cancel
+                )
+            await _checkpoint(task_id, artifacts, "key_points", points)
+            return points
+
+        # ── Outputs (all optional — failures are non-fatal) ───────────
+        async def subtitles(inputs):
+            if _valid_files(artifacts.get("subtitle_paths") or {}):
+                return artifacts["subtitle_paths"]
             from ..models.subtitles import generate_subtitles
-            processed_dir = Path(settings.PROCESSED_DIR) / user_id
-            processed_dir.mkdir(parents=True, exist_ok=True)
-            subtitle_paths = await asyncio.to_thread(
-                generate_subtitles, segments, str(processed_dir), f"subtitles_{task_id}"
+            paths = await asyncio.to_thread(
+                generate_subtitles, inputs["transcribe"].to_dicts(words=False), str(processed_dir), f"subtitles_{task_id}"
             )
+            await _checkpoint(task_id, artifacts, "subtitle_paths", paths)
             logger.info("Task %s: subtitles generated", task_id)
-        except Exception as sub_err:
-            logger.warning("Task %s: subtitle generation failed (non-fatal): %s", task_id, sub_err)
+            return paths
+
+        async def highlights(inputs):
+            if isinstance(artifacts.get("highlights"), list):
+                return artifacts["highlights"]
+            from ..models.highlights import detect_highlights
+            found = await asyncio.to_thread(detect_highlights, inputs["transcribe"].to_dicts(words=False), None)
+            await _checkpoint(task_id, artifacts, "highlights", found[:10])
+            return found[:10]
+
+        async def thumbnail(inputs):
+            thumb_path = artifacts.get("thumbnail_path")
+            if thumb_path and os.path.exists(thumb_path):
+                return thumb_path
+            from ..models.thumbnails import generate_thumbnail
+            thumb_path = str(processed_dir / f"thumb_{task_id[:8]}.jpg")
+            await asyncio.to_thread(generate_thumbnail, await source_video(), inputs["summary"], thumb_path, video_title)
+            await _checkpoint(task_id, artifacts, "thumbnail_path", thumb_path)
+            return thumb_path
+
+        # Generate summary video (55-60% of original duration).
+        # Pass ALL ranked segments to the VideoProcessor — it will internally
+        # select clips totalling 55-60% of the original video duration.
+        async def render(inputs):
+            existing = artifacts.get("summary_video_path")
+            if existing and os.path.exists(existing):
+                return existing
+            from ..models.video_processor import render_visual_summary
+            summary_video_output = str(processed_dir / f"summary_{task_id}.mp4")
+            source_path = await source_video()
 
-        # ── Step 4: Generate summary video (55-60% of original duration) ────
-        summary_video_path = None
-        try:
-            from ..models.video_processor import VideoProcessor
-            processor = VideoProcessor()
+            logger.info("Task %s: generating summary video (~55-60%% of original)", task_id)
+            await update_task(task_id, status=TASK_STATUS_GENERATING_VIDEO, step="generating summary video (55-60%)")
+
+            # Pass ranked spans (importance-ordered) AND all spans (fallback pool).
+            # MoviePy encoding is CPU-bound, so it runs in the CPU process pool.
+            async with stage_slot("render", priority):
+                try:
+                    await run_cpu(
+                        render_visual_summary,
+                        source_path,
+                        inputs["summary"],
+                        inputs["key_points"],
+                        summary_video_output,
+                        video_title,
+                        inputs["rank"].spans(),         # importance-ordered for selection
+                        inputs["transcribe"].spans(),   # full pool for gap-filling
+                        cancel.flag_path if cancel else None,
+                    )
+                except BaseException:
+                    # Never leave a partial MP4 behind (cancelled or failed)
+                    if os.path.exists(summary_video_output):
+                        os.unlink(summary_video_output)
+                    raise
+            if not os.path.exists(summary_video_output):
+                raise RuntimeError("summary video file not found after creation")
+            await _checkpoint(task_id, artifacts, "summary_video_path", summary_video_output)
+            logger.info("Task %s: summary video created at %s", task_id, summary_video_output)
+            return summary_video_output
+
+        # ── Persist to DB ─────────────────────────────────────────────
+        async def persist(_):
+            await update_task(task_id, step="saving to database")
+            # Share the reusable outputs with future uploads of the same bytes
+            await save_content_artifacts(content_hash, artifacts, max_summary_length)
+            return await _persist_summary(task_id, user_id, video_path, artifacts)
+
+        graph = StageGraph([
+            Stage("transcribe", transcribe, weight=4),
+            Stage("rank", rank, deps=("transcribe",)),
+            Stage("llm_input", llm_input, deps=("transcribe", "rank"), weight=0.1),
+            Stage("analysis", analysis, deps=("llm_input",), weight=2, required=False),
+            Stage("summary", summary, deps=("llm_input", "analysis")),
+            Stage("key_points", key_points, deps=("llm_input", "analysis")),
+            Stage("subtitles", subtitles, deps=("transcribe",), weight=0.5, required=False),
+            Stage("highlights", highlights, deps=("transcribe",), weight=0.5, required=False),
+            Stage("thumbnail", thumbnail, deps=("summary",), weight=0.5, required=False),
+            Stage("render", render, deps=("rank", "summary", "key_points"), weight=4, required=False),
+            Stage("persist", persist, deps=("subtitles", "highlights", "thumbnail", "render"), weight=0.5),
+        ], cancel=cancel)
+
+        async def report(fraction: float, stage: str):
+            await update_task(task_id, progress=5 + int(fraction * 90), step=f"{stage} complete")
+
+        results = await graph.run(on_progress=report)
+        summary_id = results["persist"]
 
-            processed_dir = Path(settings.PROCESSED_DIR) / user_id
-            processed_dir.mkdir(parents=True, exist_ok=True)
+        await mark_done(task_id, summary_id)
+        logger.info("Task %s: done, summary_id=%s", task_id, summary_id)
 
-            summary_video_filename = f"summary_{task_id}.mp4"
-            summary_video_output = str(processed_dir / summary_video_filename)
+    except TaskCancelled:
+        for t in map_tasks:
+            t.cancel()
+        logger.info("Task %s: cancelled", task_id)
+        await mark_cancelled(task_id)
 
-            video_title = Path(video_path).stem.replace("_", " ").replace("-", " ").title()
+    except Exception as e:
+        for t in map_tasks:
+            t.cancel()
+        logger.exception("Task %s failed: %s", task_id, e)
+        await mark_failed(task_id, str(e))
 
-            logger.info("Task %s: generating summary video (~55-60%% of original)", task_id)
-            await update_task(task_id, status=TASK_STATUS_GENERATING_VIDEO, progress=70, step="generating summary video (55-60%)")
+    finally:
+        # Nothing waits for the background download any more
+        if download_task is not None:
+            download_task.cancel()
+            if download_task.done() and not download_task.cancelled():
+                download_task.exception()
 
-            # Pass ranked segments (importance-ordered) AND all segments (fallback pool)
-            await asyncio.to_thread(
-                processor.create_visual_summary,
-                video_path,
-                text_summary,
-                key_points,
-                summary_video_output,
-                video_title,
-                0,          # num_key_frames (unused now)
-                ranked,     # segments — importance-ordered for selection
-                segments,   # all_segments — full pool for gap-filling
-            )
-            if os.path.exists(summary_video_output):
-                summary_video_path = summary_video_output
-                logger.info("Task %s: summary video created at %s", task_id, summary_video_path)
-            else:
-                logger.warning("Task %s: summary video file not found after creation", task_id)
-        except Exception as vid_err:
-            logger.warning("Task %s: summary video generation failed (non-fatal): %s", task_id, vid_err)
-            import traceback
-            logger.debug(traceback.format_exc())
 
-        await update_task(task_id, progress=90, step="saving to database")
+async def _persist_summary(task_id: str, user_id: str, video_path: str, artifacts: dict) -> str:
+    """
+    Write the summary document built from a task's artifacts and return its id.
 
-        # ── Step 5: Persist to DB ─────────────────────────────────────
+    The summary_id is checkpointed before the insert so a retry after a crash
+    here does not create a duplicate summary.
+    """
+    summary_id = artifacts.get("summary_id")
+    if not summary_id:
         summary_id = str(uuid.uuid4())
+        await _checkpoint(task_id, artifacts, "summary_id", summary_id)
 
-        db = await get_database()
-        video_record = await db.videos.find_one({"file_path": video_path})
-        resolved_file_id = video_record["file_id"] if video_record else Path(video_path).stem
-
-        video_info = {
-            "file_id":  resolved_file_id,
-            "path":     video_path,
-            "filename": Path(video_path).name,
-            "size":     os.path.getsize(video_path),
-        }
+    db = await get_database()
+    if await db.summaries.find_one({"summary_id": summary_id}):
+        logger.info("Task %s: summary %s already persisted", task_id, summary_id)
+        return summary_id
+
+    # One chronological copy of the segments, with their relevance scores
+    segments = SegmentTable.from_dicts(artifacts["segments"])
+    segments.with_ranking(artifacts["ranked_segments"])
+    segments = segments.take(np.argsort(segments.start, kind="stable"))
+    transcript = segments.transcript() or "No transcript available."
+    summary_video_path = artifacts.get("summary_video_path")
+
+    video_record = await db.videos.find_one({"file_path": video_path})
+    resolved_file_id = video_record["file_id"] if video_record else Path(video_path).stem
+
+    video_info = {
+        "file_id":  resolved_file_id,
+        "path":     video_path,
+        "filename": Path(video_path).name,
+        "size":     os.path.getsize(video_path) if os.path.exists(video_path) else 0,
+    }
 
-        summary_doc = {
-            "summary_id": summary_id,
-            "task_id": task_id,
-            "video_id": Path(video_path).stem,
-            "user_id": user_id,
-            "transcript": transcript[:MAX_TRANSCRIPT_STORE_CHARS],
-            "full_transcript": transcript,  # store full transcript for subtitles/TTS
-            "text_summary": text_summary,
-            "key_points": key_points,
-            "segments": sorted(ranked, key=lambda s: s.get("start", 0)),
-            "all_segments": segments,  # store all segments for subtitle export
-            "video_info": video_info,
-            "subtitle_paths": subtitle_paths,
-            "language": "auto",
-            "created_at": datetime.now(timezone.utc),
-        }
+    summary_doc = {
+        "summary_id": summary_id,
+        "task_id": task_id,
+        "video_id": Path(video_path).stem,
+        "user_id": user_id,
+        "transcript": transcript[:MAX_TRANSCRIPT_STORE_CHARS],
+        "full_transcript": transcript,  # store full transcript for subtitles/TTS
+        "text_summary": artifacts["text_summary"],
+        "key_points": artifacts["key_points"],
+        "segments": segments.to_dicts(),  # also read for subtitle export
+        "video_info": video_info,
+        "subtitle_paths": artifacts.get("subtitle_paths") or {},
+        "language": "auto",
+        "created_at": datetime.now(timezone.utc),
+    }
 
+    # Add summary video info if it was generated
+    if summary_video_path and os.path.exists(summary_video_path):
+        summary_doc["summary_video_path"] = summary_video_path
+        summary_doc["summary_video_size"] = os.path.getsize(summary_video_path)
 
-        # Add summary video info if it was generated
-        if summary_video_path:
-            summary_doc["summary_video_path"] = summary_video_path
-            summary_doc["summary_video_size"] = os.path.getsize(summary_video_path)
+    # Outputs of the optional stages, same fields the on-demand endpoints write
+    if artifacts.get("thumbnail_path"):
+        summary_doc["thumbnail_path"] = artifacts["thumbnail_path"]
+    if artifacts.get("highlights"):
+        summary_doc["highlights"] = artifacts["highlights"]
+    if artifacts.get("description"):
+        summary_doc["description"] = artifacts["description"]
 
+    with DB_PERSIST_SECONDS.time():
         await db.summaries.insert_one(summary_doc)
-
-        await mark_done(task_id, summary_id)
-        logger.info("Task %s: done, summary_id=%s", task_id, summary_id)
-
-    except Exception as e:
-        logger.exception("Task %s failed: %s", task_id, e)
-        await mark_failed(task_id, str(e))
+    return summary_id
 
 
 # ---------------------------------------------------------------------------
@@ -223,7 +602,6 @@ async def _run_summarize_pipeline(
 async def summarize_video(
     request: Request,
     body: SummarizeRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
 ):
     """Queue a summarization job. Returns 202 immediately with a task_id."""
@@ -236,42 +614,155 @@ async def summarize_video(
             detail={"code": "VIDEO_NOT_FOUND", "message": "Video file not found or you do not have permission."},
         )
 
-    # Validate path exists on disk
-    if not os.path.exists(video_record["file_path"]):
+    # Validate path exists on disk (or can be downloaded by the job)
+    if not _video_available(video_record):
         raise HTTPException(
             status_code=404,
             detail={"code": "FILE_MISSING", "message": "The actual video file is missing from the server storage."},
         )
 
-    # Get singleton models from app state
-    whisper = getattr(request.app.state, "whisper", None)
-    summarizer = getattr(request.app.state, "summarizer", None)
+    return await _enqueue_summary(
+        str(current_user["_id"]), video_record, body.summary_ratio, body.max_summary_length,
+    )
+
 
-    if whisper is None or summarizer is None:
+async def _enqueue_summary(
+    user_id: str,
+    video_record: dict,
+    summary_ratio: Optional[float],
+    max_summary_length: Optional[int],
+    priority: int = PRIORITY_INTERACTIVE,
+    batch_id: Optional[str] = None,
+) -> TaskAccepted:
+    """Create the task for one video (or finish it at once from shared artifacts)."""
+    task_id = str(uuid.uuid4())
+
+    # Seed the job with artifacts from an earlier upload of the same bytes
+    content_hash = video_record.get("content_hash")
+    artifacts = await get_content_artifacts(content_hash, max_summary_length)
+    if artifacts:
+        artifacts = await asyncio.to_thread(_adopt_shared_files, artifacts, user_id, task_id)
+
+    # Persist the job to the MongoDB queue — a worker process picks it up
+    # (survives API restarts and keeps heavy work out of the API process)
+    await create_task(task_id, user_id, payload={
+        "video_path": video_record["file_path"],
+        "file_id": video_record.get("file_id"),
+        "summary_ratio": summary_ratio,
+        "max_summary_length": max_summary_length,
+        "content_hash": content_hash,
+    }, artifacts=artifacts, priority=priority, batch_id=batch_id)
+
+    if is_complete(artifacts):
+        # Identical video already fully processed — finish without a worker
+        summary_id = await _persist_summary(task_id, user_id, video_record["file_path"], artifacts)
+        await mark_done(task_id, summary_id)
+        logger.info("Task %s: reused artifacts of content %s", task_id, content_hash[:12])
+        return TaskAccepted(task_id=task_id, status="done", message="Identical video already summarized; results reused.")
+
+    if artifacts:
+        logger.info("Task %s: seeded from content %s with %s", task_id, content_hash[:12], sorted(artifacts))
+    return TaskAccepted(task_id=task_id)
+
+
+@router.post("/batch", response_model=BatchAccepted, status_code=202)
+@limiter.limit(RATE_LIMIT_SUMMARIZE)
+async def summarize_batch(
+    request: Request,
+    body: BatchSummarizeRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Queue one summarization job per file_id under a single batch id.
+
+    Batch jobs run at PRIORITY_BATCH: workers take them after interactive
+    jobs, run only WORKER_MAX_BATCH_JOBS of them at a time each, and they
+    queue behind interactive jobs for transcription/LLM/render slots.
+    """
+    file_ids = list(dict.fromkeys(body.file_ids))  # drop duplicates, keep order
+    if not file_ids or len(file_ids) > MAX_BATCH_SIZE:
         raise HTTPException(
-            status_code=503,
-            detail={"code": "MODELS_UNAVAILABLE", "message": "ML models are not loaded. Contact the administrator."},
+            status_code=400,
+            detail={"code": "INVALID_BATCH_SIZE", "message": f"A batch needs 1 to {MAX_BATCH_SIZE} file_ids."},
         )
 
-    task_id = str(uuid.uuid4())
     user_id = str(current_user["_id"])
+    db = await get_database()
+    records = {
+        record["file_id"]: record
+        async for record in db.videos.find({"file_id": {"$in": file_ids}, "user_id": user_id})
+    }
+    missing = [
+        fid for fid in file_ids
+        if fid not in records or not _video_available(records[fid])
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "VIDEO_NOT_FOUND",
+                "message": "Some videos were not found, are missing from storage or are not yours.",
+                "file_ids": missing,
+            },
+        )
 
-    # Persist task to MongoDB (survives restarts)
-    await create_task(task_id, user_id)
-
-    # Pass the actual absolute string path to the pipeline thread
-    background_tasks.add_task(
-        _run_summarize_pipeline,
-        task_id,
-        video_record["file_path"],
-        body.summary_ratio,
-        body.max_summary_length,
-        user_id,
-        whisper,
-        summarizer,
-    )
+    batch_id = str(uuid.uuid4())
+    tasks = [
+        await _enqueue_summary(
+            user_id, records[fid], body.summary_ratio, body.max_summary_length,
+            priority=PRIORITY_BATCH, batch_id=batch_id,
+        )
+        for fid in file_ids
+    ]
+    logger.info("Batch %s: queued %d jobs for user %s", batch_id, len(tasks), user_id)
+    return BatchAccepted(batch_id=batch_id, task_ids=[t.task_id for t in tasks])
 
-    return TaskAccepted(task_id=task_id)
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(
+    batch_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """Aggregate progress of a batch plus the status of every member job."""
+    tasks = await get_batch_tasks(batch_id)
+    if not tasks or tasks[0].get("user_id") != str(current_user["_id"]):
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "BATCH_NOT_FOUND", "message": "Batch ID not found."},
+        )
+
+    counts: dict = {}
+    for task in tasks:
+        counts[task["status"]] = counts.get(task["status"], 0) + 1
+    finished = sum(counts.get(s, 0) for s in TERMINAL_TASK_STATUSES)
+    progress = sum(100 if t["status"] in TERMINAL_TASK_STATUSES else t.get("progress", 0) for t in tasks)
+
+    if finished < len(tasks):
+        status = TASK_STATUS_PENDING if counts.get(TASK_STATUS_PENDING) == len(tasks) else TASK_STATUS_PROCESSING
+    elif counts.get(TASK_STATUS_DONE) == len(tasks):
+        status = TASK_STATUS_DONE
+    else:
+        status = "completed_with_errors"
+
+    return {
+        "batch_id": batch_id,
+        "status":   status,
+        "progress": int(progress / len(tasks)),
+        "total":    len(tasks),
+        "finished": finished,
+        "counts":   counts,
+        "tasks": [
+            {
+                "task_id":    t["task_id"],
+                "file_id":    (t.get("payload") or {}).get("file_id"),
+                "status":     t["status"],
+                "progress":   t.get("progress", 0),
+                "summary_id": t.get("summary_id"),
+                "error":      t.get("error"),
+            }
+            for t in tasks
+        ],
+    }
 
 
 @router.get("/status/{task_id}")
@@ -293,9 +784,73 @@ async def get_task_status(
         "error":      task.get("error"),
         "progress":   task.get("progress", 0),
         "step":       task.get("step", ""),
+        "completed_stages": sorted((task.get("artifacts") or {}).keys()),
     }
 
 
+@router.post("/status/{task_id}", status_code=202)
+async def task_action(
+    task_id: str,
+    body: TaskActionRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Act on an existing task.  `resume` re-queues a failed task; stages that
+    already finished (see `completed_stages`) are not run again.
+    """
+    task = await get_task(task_id)
+    if task is None or task.get("user_id") != str(current_user["_id"]):
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "TASK_NOT_FOUND", "message": "Task ID not found. It may have expired."},
+        )
+
+    if body.action != "resume":
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "UNKNOWN_ACTION", "message": f"Unsupported task action '{body.action}'."},
+        )
+
+    if task["status"] != TASK_STATUS_FAILED or not await requeue_task(task_id):
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "TASK_NOT_RESUMABLE", "message": "Only failed tasks can be resumed."},
+        )
+
+    logger.info("Task %s: resume requested (checkpoints: %s)", task_id, sorted((task.get("artifacts") or {}).keys()))
+    return TaskAccepted(task_id=task_id, message="Task re-queued. Completed stages will be skipped.")
+
+
+@router.delete("/status/{task_id}", status_code=202)
+async def cancel_task(
+    task_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Cancel a queued or running task.  Queued tasks are cancelled at once;
+    running ones stop at their next checkpoint (status `cancelling` until the
+    worker has cleaned up and marked them `cancelled`).
+    """
+    task = await get_task(task_id)
+    if task is None or task.get("user_id") != str(current_user["_id"]):
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "TASK_NOT_FOUND", "message": "Task ID not found. It may have expired."},
+        )
+
+    status = await request_cancel(task_id)
+    if status is None:
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "TASK_NOT_CANCELLABLE", "message": f"Task already finished with status '{task['status']}'."},
+        )
+
+    logger.info("Task %s: cancellation requested (%s)", task_id, status)
+    if status == TASK_STATUS_CANCELLED:
+        return TaskAccepted(task_id=task_id, status=status, message="Task cancelled.")
+    return TaskAccepted(task_id=task_id, status=status, message="Cancellation requested. The task stops at its next checkpoint.")
+
+
 @router.get("/history")
 async def get_summary_history(current_user: dict = Depends(get_current_user)):
     """Return all summaries created by the current user."""
@@ -473,25 +1028,9 @@ async def debug_summary(summary_id: str, current_user: dict = Depends(get_curren
 
 
 # ---------------------------------------------------------------------------
-# YouTube URL parser
+# YouTube (captions only)
 # ---------------------------------------------------------------------------
 
-def extract_youtube_id(url: str) -> str:
-    from urllib.parse import urlparse, parse_qs
-    parsed = urlparse(url)
-    if parsed.hostname == 'youtu.be':
-        return parsed.path[1:]
-    if parsed.hostname in ('www.youtube.com', 'youtube.com'):
-        if parsed.path == '/watch':
-            q = parse_qs(parsed.query)
-            return q['v'][0] if 'v' in q else ""
-        if parsed.path.startswith('/embed/'):
-            return parsed.path[7:]
-        if parsed.path.startswith('/v/'):
-            return parsed.path[3:]
-    return ""
-
-
 @router.post("/summarize-youtube")
 @limiter.limit(RATE_LIMIT_SUMMARIZE)
 async def summarize_youtube_sync(
@@ -505,10 +1044,10 @@ async def summarize_youtube_sync(
         if not video_id:
             raise HTTPException(400, detail="Could not extract YouTube video ID")
 
-        # Use newer instance-based fetch()
-        yt_api = YouTubeTranscriptApi()
-        transcript_list = yt_api.fetch(video_id)
-        full_text = " ".join([t['text'] for t in transcript_list])
+        captions = await asyncio.to_thread(fetch_caption_segments, video_id)
+        if not captions:
+            raise HTTPException(404, detail="No captions available for this video")
+        full_text = " ".join(seg["text"] for seg in captions)
 
         # Reuse pre-loaded summarizer if available
         summarizer = getattr(request.app.state, "summarizer", VideoSummarizer())
@@ -573,8 +1112,7 @@ async def summarize_video_sync(
         # 5. Generate Highlight Video
         summary_video_path = None
         try:
-            from ..models.video_processor import VideoProcessor
-            processor = VideoProcessor()
+            from ..models.video_processor import render_visual_summary
             user_id = str(current_user["_id"])
             processed_dir = Path(settings.PROCESSED_DIR) / user_id
             processed_dir.mkdir(parents=True, exist_ok=True)
@@ -592,14 +1130,15 @@ async def summarize_video_sync(
 
             key_points = await asyncio.to_thread(summarizer.extract_key_points, transcript)
 
-            await asyncio.to_thread(
-                processor.create_visual_summary,
+            await run_cpu(
+                render_visual_summary,
                 temp_video.name,
                 summary,
                 key_points,
                 output_path,
-                video_title=file.filename,
-                segments=selected_segs,
+                file.filename,
+                _spans(selected_segs),
+                [],
             )
             if os.path.exists(output_path):
                 summary_video_path = f"/api/summarize/video/direct/{output_filename}"
@@ -666,7 +1205,7 @@ async def stream_progress(task_id: str):
             }
             yield f"data: {json_mod.dumps(payload)}\n\n"
 
-            if task["status"] in ("done", "failed"):
+            if task["status"] in (TASK_STATUS_DONE, TASK_STATUS_FAILED, TASK_STATUS_CANCELLED):
                 break
 
             await asyncio.sleep(1)  # 1-second updates (vs 5s polling)
@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import logging
 import uuid
 from datetime import datetime, timezone
@@ -6,7 +7,6 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 import aiofiles
-import yt_dlp
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
@@ -17,6 +17,7 @@ from ..core.config import settings
 from ..core.database import get_database
 from ..core.security import get_current_user
 from ..core.constants import RATE_LIMIT_UPLOAD
+from ..core.youtube import download_video, extract_youtube_id, fetch_caption_segments, fetch_video_info
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -80,23 +81,18 @@ async def _save_upload(file: UploadFile, dest: Path) -> None:
             await out.write(chunk)
 
 
+def _hash_file(path: Path) -> str:
+    """SHA-256 of a file on disk, read in 1 MB blocks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
 async def _yt_download(url: str, output_template: str) -> dict:
     """Run yt_dlp download in a thread to avoid blocking the event loop."""
-    ydl_opts = {
-        "format": "best[ext=mp4]/best",
-        "outtmpl": output_template,
-        "quiet": True,
-    }
-
-    def _download():
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            return {
-                "filepath": ydl.prepare_filename(info),
-                "title": info.get("title", "YouTube Video"),
-            }
-
-    return await asyncio.to_thread(_download)
+    return await asyncio.to_thread(download_video, url, output_template)
 
 
 # ---------------------------------------------------------------------------
@@ -142,13 +138,16 @@ async def upload_video(
     filepath = upload_dir / filename
 
     try:
-        # 2. Stream-write via aiofiles (non-blocking)
+        # 2. Stream-write via aiofiles (non-blocking), hashing as we go so
+        #    identical uploads can share pipeline artifacts
         bytes_written = 0
+        hasher = hashlib.sha256()
         async with aiofiles.open(filepath, "wb") as out:
             while True:
                 chunk = await file.read(1024 * 256)
                 if not chunk:
                     break
+                hasher.update(chunk)
                 bytes_written += len(chunk)
                 if bytes_written > MAX_UPLOAD_BYTES:
                     await out.close()
@@ -173,6 +172,7 @@ async def upload_video(
             "original_name": file.filename,
             "file_path": str(filepath),
             "file_size": file_size,
+            "content_hash": hasher.hexdigest(),
             "status": "uploaded",
             "created_at": datetime.now(timezone.utc),
         }
@@ -208,7 +208,11 @@ async def upload_youtube(
     background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
 ):
-    """Download and process a YouTube video (runs in a thread pool)."""
+    """
+    Add a YouTube video.  If it has captions, only they are fetched now —
+    the summarization job transcribes from them and downloads the video in
+    the background for the summary render.  Otherwise it is downloaded here.
+    """
     _validate_youtube_url(body.url)
 
     user_id = str(current_user["_id"])
@@ -217,11 +221,44 @@ async def upload_youtube(
     output_template = str(upload_dir / f"{file_id}.%(ext)s")
 
     try:
+        youtube_id = extract_youtube_id(body.url)
+        captions = await asyncio.to_thread(fetch_caption_segments, youtube_id)
+        if captions:
+            info = await asyncio.to_thread(fetch_video_info, body.url)
+            filename = f"{file_id}.mp4"
+            db = await get_database()
+            await db.videos.insert_one({
+                "file_id": file_id,
+                "user_id": user_id,
+                "filename": filename,
+                "original_name": f"{info['title']}.mp4",
+                "file_path": str(upload_dir / filename),
+                "file_size": 0,
+                # Same video, same captions: share pipeline artifacts by video id
+                "content_hash": f"youtube:{youtube_id}",
+                "source_url": body.url,
+                "caption_segments": captions,
+                "status": "uploaded",
+                "created_at": datetime.now(timezone.utc),
+            })
+            logger.info("YouTube video added from captions: file_id=%s user=%s segments=%d",
+                        file_id, user_id, len(captions))
+            return {
+                "success": True,
+                "file_id": file_id,
+                "filename": filename,
+                "original_name": f"{info['title']}.mp4",
+                "size_mb": 0.0,
+                "captions": True,
+                "message": "YouTube captions fetched; the video is downloaded when its summary video is made",
+            }
+
         result = await _yt_download(body.url, output_template)
         filepath = Path(result["filepath"])
         original_title = result["title"]
         filename = filepath.name
         file_size = filepath.stat().st_size
+        content_hash = await asyncio.to_thread(_hash_file, filepath)
 
         db = await get_database()
         video_data = {
@@ -231,6 +268,7 @@ async def upload_youtube(
             "original_name": f"{original_title}.mp4",
             "file_path": str(filepath),
             "file_size": file_size,
+            "content_hash": content_hash,
             "status": "uploaded",
             "created_at": datetime.now(timezone.utc),
         }
@@ -244,6 +282,7 @@ async def upload_youtube(
             "filename": filename,
             "original_name": f"{original_title}.mp4",
             "size_mb": round(file_size / 1_048_576, 2),
+            "captions": False,
             "message": "YouTube video processed successfully",
         }
 
@@ -0,0 +1,92 @@
+"""
+audio.py — Audio track extraction for transcription.
+
+`extract_audio_fast` shells out to ffmpeg to write 16 kHz mono PCM WAV
+(what Whisper expects) without decoding any video frames.  If the ffmpeg
+binary is not available it falls back to MoviePy, which is much slower.
+"""
+import logging
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+from .cancellation import CancelToken
+from .constants import AUDIO_CHANNELS, AUDIO_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+
+def ffmpeg_binary() -> str:
+    """Path of the ffmpeg executable (system install first, then imageio-ffmpeg)."""
+    found = shutil.which("ffmpeg")
+    if found:
+        return found
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        raise FileNotFoundError("ffmpeg not found — install it or `pip install imageio-ffmpeg`")
+
+
+def _extract_with_moviepy(video_path: str, output_path: str) -> str:
+    try:
+        from moviepy import VideoFileClip
+    except ImportError:
+        from moviepy.editor import VideoFileClip
+
+    clip = VideoFileClip(video_path)
+    try:
+        if clip.audio is None:
+            raise ValueError(f"No audio track in {video_path}")
+        clip.audio.write_audiofile(
+            output_path,
+            fps=AUDIO_SAMPLE_RATE,
+            nbytes=2,
+            codec="pcm_s16le",
+            ffmpeg_params=["-ac", str(AUDIO_CHANNELS)],
+            logger=None,
+        )
+    finally:
+        clip.close()
+    return output_path
+
+
+def extract_audio_fast(video_path: str, output_path: str, cancel: Optional[CancelToken] = None) -> str:
+    """
+    Write the audio track of `video_path` to `output_path` as 16 kHz mono WAV.
+    If `cancel` fires while ffmpeg runs, ffmpeg is killed, the partial WAV is
+    removed and TaskCancelled is raised.
+    """
+    try:
+        ffmpeg = ffmpeg_binary()
+    except FileNotFoundError as e:
+        logger.warning("%s; extracting audio with MoviePy", e)
+        return _extract_with_moviepy(video_path, output_path)
+
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-i", video_path,
+        "-vn",
+        "-ac", str(AUDIO_CHANNELS),
+        "-ar", str(AUDIO_SAMPLE_RATE),
+        "-acodec", "pcm_s16le",
+        output_path,
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if cancel is not None:
+        cancel.attach_process(proc)
+    try:
+        _, stderr = proc.communicate()
+    finally:
+        if cancel is not None:
+            cancel.detach_process(proc)
+
+    if cancel is not None and cancel.cancelled:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        cancel.check()
+    if proc.returncode != 0:
+        message = stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg audio extraction failed: {message[-500:]}")
+    return output_path
@@ -0,0 +1,92 @@
+"""
+cancellation.py — Cooperative cancellation of running summarization jobs.
+
+`DELETE /api/summarize/status/{task_id}` only sets `cancel_requested` on the
+task document; the worker that holds the job notices it (see worker.py) and
+calls `CancelToken.cancel()`.  The pipeline and the model wrappers then stop
+at their next checkpoint:
+
+  * between transcription chunks and between LLM calls (`token.check()`),
+  * by killing an attached ffmpeg child process,
+  * inside MoviePy renders running in the CPU pool, which cannot share the
+    token object — they watch `token.flag_path` instead.
+
+Whatever stops raises `TaskCancelled`; the pipeline cleans up its partial
+outputs and marks the task cancelled.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """Raised at a cancellation checkpoint once the job has been cancelled."""
+
+
+class CancelToken:
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.flag_path = os.path.join(tempfile.gettempdir(), f"vsum-cancel-{task_id}")
+        self._event = threading.Event()
+        self._processes: Set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if the job has been cancelled."""
+        if self._event.is_set():
+            raise TaskCancelled(f"Task {self.task_id} was cancelled")
+
+    def cancel(self):
+        """Stop the job: flag it, tell pool processes, kill attached subprocesses."""
+        if self._event.is_set():
+            return
+        self._event.set()
+        try:
+            with open(self.flag_path, "w"):
+                pass
+        except OSError as e:
+            logger.warning("Task %s: could not write cancel flag: %s", self.task_id, e)
+        with self._lock:
+            processes = list(self._processes)
+        for proc in processes:
+            if proc.poll() is None:
+                logger.info("Task %s: killing child process %d", self.task_id, proc.pid)
+                proc.kill()
+
+    def attach_process(self, proc: subprocess.Popen):
+        """Kill `proc` if the job is cancelled while it runs."""
+        with self._lock:
+            self._processes.add(proc)
+        if self._event.is_set() and proc.poll() is None:
+            proc.kill()
+
+    def detach_process(self, proc: subprocess.Popen):
+        with self._lock:
+            self._processes.discard(proc)
+
+    def cleanup(self):
+        """Remove the cancel flag file (call when the job is over)."""
+        try:
+            os.unlink(self.flag_path)
+        except FileNotFoundError:
+            pass
+
+
+def check_cancelled(cancel: Optional[CancelToken]):
+    """`cancel.check()` that accepts None (no cancellation support)."""
+    if cancel is not None:
+        cancel.check()
+
+
+def cancel_flag_set(flag_path: Optional[str]) -> bool:
+    """For code in other processes: has the job owning `flag_path` been cancelled?"""
+    return bool(flag_path) and os.path.exists(flag_path)
@@ -27,9 +27,52 @@ class Settings(BaseSettings):
     PROCESSED_DIR: str = "processed"
 
     # Model Settings
-    WHISPER_MODEL: str = "tiny"
+    WHISPER_MODEL: str = "tiny"                    # local engine model size (tiny … large-v3)
+    TRANSCRIBE_ENGINE: str = "groq"                # groq (API) or local (faster-whisper on CPU)
+    LOCAL_WHISPER_COMPUTE_TYPE: str = "int8"       # CTranslate2 quantisation for the local engine
+    LOCAL_WHISPER_BATCH_SIZE: int = 8              # 30 s windows decoded together by the local engine
+    LOCAL_WHISPER_CPU_THREADS: int = 0             # 0 = CTranslate2 default
     SUMMARY_RATIO: float = 0.3
 
+    # Job queue / workers (see app/worker.py)
+    WORKER_MAX_JOBS: int = 2                       # jobs one worker process runs at once
+    WORKER_POLL_SECONDS: float = 2.0               # idle wait between queue polls
+    TASK_LEASE_SECONDS: int = 120                  # a job is re-queued if its lease is not renewed
+    TASK_MAX_ATTEMPTS: int = 3                     # give up after this many claims
+    WORKER_MAX_BATCH_JOBS: int = 1                 # batch jobs per worker; other slots stay free for interactive jobs
+
+    # Per-stage concurrency limits (per worker process)
+    STAGE_CONCURRENCY_TRANSCRIBE: int = 1
+    STAGE_CONCURRENCY_LLM: int = 2
+    STAGE_CONCURRENCY_RENDER: int = 1
+    TRANSCRIBE_CONCURRENCY: int = 4                # audio chunks of one job sent to the API at once
+    TRANSCRIBE_CHUNK_FORMAT: str = "flac"          # audio uploads: flac (lossless), opus or wav
+    TRANSCRIBE_VAD: bool = True                    # skip long silences, cut chunks in pauses
+    TRANSCRIPT_CACHE_MAX_ENTRIES: int = 1000       # transcripts cached by audio fingerprint (LRU); 0 = off
+    LLM_CACHE_PATH: str = "cache/llm.sqlite3"      # on-disk LLM completion cache (SQLite)
+    LLM_CACHE_MAX_MB: float = 64                   # least recently used entries evicted beyond this; 0 = off
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600     # cached completions expire after a week
+    SUMMARIZE_CONCURRENCY: int = 4                 # LLM calls of one summary's map/reduce at once
+    SUMMARIZE_COMBINED_ANALYSIS: bool = True       # summary, key points, description in one JSON call
+    SUMMARIZE_CHUNK_TOKENS: int = 0                # transcript tokens per LLM call; 0 = fit the backend
+    SUMMARIZE_INPUT_TOKENS: int = 24000            # longer transcripts are cut to their top-ranked segments; 0 = off
+    CPU_POOL_WORKERS: int = 2                      # processes for ranking/rendering; 0 = use threads
+    WORKER_METRICS_PORT: int = 9101                # Prometheus scrape port per worker; 0 = off
+
+    # Provider rate limits (per worker process; corrected from response headers)
+    GROQ_LLM_REQUESTS_PER_MINUTE: int = 30         # 0 = no client-side request limit
+    GROQ_LLM_TOKENS_PER_MINUTE: int = 6000         # prompt + completion tokens; 0 = learn from headers
+    GROQ_STT_REQUESTS_PER_MINUTE: int = 20         # transcription uploads
+    GROQ_STT_AUDIO_SECONDS_PER_MINUTE: int = 0     # audio seconds sent; 0 = no limit
+    RATE_LIMIT_MAX_RETRIES: int = 6                # retries of 429/5xx/connection errors, with backoff
+
+    # Provider HTTP clients (see app/core/llm_client.py)
+    LLM_MAX_CONNECTIONS: int = 20                  # pooled provider connections per process
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10        # idle connections kept open for reuse
+    LLM_KEEPALIVE_SECONDS: float = 30.0            # close idle connections after this long
+    LLM_TIMEOUT_SECONDS: float = 60.0              # read/write timeout of one provider request
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
@@ -46,6 +89,22 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator("TRANSCRIBE_ENGINE")
+    @classmethod
+    def engine_must_be_known(cls, v: str) -> str:
+        v = v.lower()
+        if v not in ("groq", "local"):
+            raise ValueError("TRANSCRIBE_ENGINE must be one of: groq, local")
+        return v
+
+    @field_validator("TRANSCRIBE_CHUNK_FORMAT")
+    @classmethod
+    def chunk_format_must_be_known(cls, v: str) -> str:
+        v = v.lower()
+        if v not in ("flac", "opus", "wav"):
+            raise ValueError("TRANSCRIBE_CHUNK_FORMAT must be one of: flac, opus, wav")
+        return v
+
     class Config:
         case_sensitive = True
         extra = "ignore"          # silently ignore unknown env vars (e.g. legacy keys)
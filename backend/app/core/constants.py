@@ -10,10 +10,15 @@ WHISPER_MODEL_NAME = "whisper-large-v3"
 # ─── LLM (Summarization & Chat) ──────────────────────────────────────────────
 # Groq cloud models — LLaMA 3.3 70B for much better summary quality
 GROQ_SUMMARIZATION_MODEL = "llama-3.3-70b-versatile"
+GROQ_SUMMARIZATION_TEMPERATURE = 0.2
 GROQ_CHAT_MODEL = "llama-3.3-70b-versatile"
+LLM_COMPLETION_TOKEN_ESTIMATE = 600  # completion tokens budgeted per call by the rate limiter
+LLM_PROMPT_TOKEN_OVERHEAD = 400  # instructions around a transcript chunk
+GROQ_CONTEXT_TOKENS = 131072  # llama-3.3-70b-versatile context window
 
 # Ollama local models
 OLLAMA_MODEL = "llama3"
+OLLAMA_CONTEXT_TOKENS = 8192  # llama3 context window (sent as num_ctx; Ollama defaults to 2048)
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_GENERATE_URL = f"{OLLAMA_BASE_URL}/api/generate"
 OLLAMA_TAGS_URL = f"{OLLAMA_BASE_URL}/api/tags"
@@ -27,18 +32,27 @@ OUTPUT_VIDEO_HEIGHT = 720
 OUTPUT_VIDEO_FPS = 24
 MAX_CLIPS_PER_SUMMARY = 12
 MAX_SEGMENTS_FOR_VIDEO = 10
+YOUTUBE_CAPTION_LANGUAGES = ("en",)  # preferred caption tracks (others are used if these are missing)
+YOUTUBE_RENDER_FORMAT = "best[ext=mp4][height<=720]/best[height<=720]/best"  # single file, enough for the 720p render
 
 # ─── Audio ────────────────────────────────────────────────────────────────────
 AUDIO_SAMPLE_RATE = 16000      # 16kHz for Whisper
 AUDIO_CHANNELS = 1             # Mono
-AUDIO_CHUNK_SECONDS = 600      # 10 min chunks for Groq API size limits
+GROQ_MAX_UPLOAD_BYTES = 25 * 1024 * 1024  # Groq transcription upload cap
+AUDIO_CHUNK_HEADROOM = 0.95    # aim chunks at 95% of the upload cap
+LOCAL_AUDIO_CHUNK_SECONDS = 300  # local engine: no upload cap, chunk for progress
+VAD_FRAME_SECONDS = 0.03       # energy frame length for voice activity detection
+VAD_MARGIN_DB = 12.0           # speech must be this far above the noise floor
+VAD_SILENCE_DB = -60.0         # anything quieter is never speech
+VAD_MIN_SILENCE_SECONDS = 1.0  # shorter pauses are kept, longer ones dropped
+VAD_PAD_SECONDS = 0.25         # kept around each speech region
+FINGERPRINT_MAX_BER = 0.2      # shifted re-encodes differ in ~10-15% of bits, other audio ~50%
 
 # ─── Summarization Defaults ──────────────────────────────────────────────────
 DEFAULT_SUMMARY_RATIO = 0.3
 DEFAULT_MAX_SUMMARY_LENGTH = 800
 MAX_TRANSCRIPT_STORE_CHARS = 5000
 MAX_CHAT_TRANSCRIPT_CHARS = 2000
-TEXT_CHUNK_MAX_CHARS = 15000   # Safe for 8K token context LLMs
 
 # ─── Task Status ──────────────────────────────────────────────────────────────
 TASK_STATUS_PENDING = "pending"
@@ -50,6 +64,12 @@ TASK_STATUS_GENERATING_SUBTITLES = "generating_subtitles"
 TASK_STATUS_GENERATING_TTS = "generating_tts"
 TASK_STATUS_DONE = "done"
 TASK_STATUS_FAILED = "failed"
+TASK_STATUS_CANCELLED = "cancelled"
+
+# ─── Job Priority (lower runs first) ──────────────────────────────────────────
+PRIORITY_INTERACTIVE = 0      # single POST /api/summarize/ requests
+PRIORITY_BATCH = 10           # members of a POST /api/summarize/batch
+MAX_BATCH_SIZE = 100          # file_ids per batch request
 
 # ─── Rate Limiting ───────────────────────────────────────────────────────────
 RATE_LIMIT_AUTH = "5/minute"          # Login/register attempts
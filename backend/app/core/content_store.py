@@ -0,0 +1,99 @@
+"""
+content_store.py — Pipeline artifacts shared by content hash.
+
+Uploads are hashed (SHA-256 of the raw bytes) while they are written.  When a
+job finishes, its transcript, ranked segments, key points, highlights,
+summary text, description, subtitles, thumbnail and summary video are stored
+in the `content_artifacts` collection under that hash, so a byte-identical
+upload — from any user — reuses them instead of going through Whisper, the
+LLM and MoviePy again.  The summary text and everything derived from it (the
+description, thumbnail and the summary video, which shows the summary on
+screen) are stored per summary length.  Stored file paths point at the first
+job's files; callers copy them into the new owner's directory.
+"""
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Artifacts that depend only on the video bytes
+_SHARED_LIST_ARTIFACTS = ("segments", "ranked_segments", "key_points", "highlights")
+
+# Artifacts that also depend on the summary length, stored per length
+_PER_LENGTH_ARTIFACTS = {
+    "text_summary": "summaries",
+    "description": "descriptions",
+    "thumbnail_path": "thumbnails",
+    "summary_video_path": "summary_videos",
+}
+_FILE_ARTIFACTS = ("thumbnail_path", "summary_video_path")
+
+# Artifacts a job needs before it can be finished without running a stage
+COMPLETE_ARTIFACTS = (
+    "segments", "ranked_segments", "key_points", "highlights", "text_summary",
+    "subtitle_paths", "thumbnail_path", "summary_video_path",
+)
+
+
+async def get_content_artifacts(content_hash: str, max_summary_length: Optional[int]) -> Dict:
+    """
+    Return the reusable artifacts for `content_hash` in the same shape as a
+    task's checkpoints (see task_store.save_artifact), or {} on a miss.
+    The text summary and its per-length artifacts are only reused if they
+    were made with the same length.
+    """
+    if not content_hash:
+        return {}
+    db = await get_database()
+    doc = await db.content_artifacts.find_one({"content_hash": content_hash})
+    if not doc:
+        return {}
+
+    artifacts = {k: doc[k] for k in _SHARED_LIST_ARTIFACTS if isinstance(doc.get(k), list)}
+    for name, field in _PER_LENGTH_ARTIFACTS.items():
+        value = (doc.get(field) or {}).get(str(max_summary_length))
+        if value:
+            artifacts[name] = value
+    for name in _FILE_ARTIFACTS:
+        if name in artifacts and not os.path.exists(artifacts[name]):
+            del artifacts[name]
+    subtitle_paths = doc.get("subtitle_paths") or {}
+    if subtitle_paths and all(os.path.exists(p) for p in subtitle_paths.values()):
+        artifacts["subtitle_paths"] = subtitle_paths
+    return artifacts
+
+
+async def save_content_artifacts(
+    content_hash: str,
+    artifacts: Dict,
+    max_summary_length: Optional[int],
+) -> None:
+    """Publish a finished job's artifacts under its content hash."""
+    if not content_hash:
+        return
+    fields = {k: artifacts[k] for k in _SHARED_LIST_ARTIFACTS if isinstance(artifacts.get(k), list)}
+    for name, field in _PER_LENGTH_ARTIFACTS.items():
+        if artifacts.get(name):
+            fields[f"{field}.{max_summary_length}"] = artifacts[name]
+    if artifacts.get("subtitle_paths"):
+        fields["subtitle_paths"] = artifacts["subtitle_paths"]
+    if not fields:
+        return
+
+    db = await get_database()
+    fields["updated_at"] = datetime.now(timezone.utc)
+    await db.content_artifacts.update_one(
+        {"content_hash": content_hash},
+        {"$set": fields, "$setOnInsert": {"created_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    logger.debug("Stored artifacts for content %s: %s", content_hash[:12], sorted(fields))
+
+
+def is_complete(artifacts: Dict) -> bool:
+    """True if a job could be finished from `artifacts` alone."""
+    return all(k in artifacts for k in COMPLETE_ARTIFACTS)
@@ -0,0 +1,83 @@
+"""
+cpu_pool.py — Managed process pool for CPU-bound pipeline stages.
+
+Segment ranking (TF-IDF + TextRank) and MoviePy rendering hold the GIL for
+long stretches; run on the default thread pool they slow down everything
+else in the process.  Stages that are CPU-bound go through `run_cpu`, which
+executes them in a small pool of worker processes whose interpreters have
+NumPy, scikit-learn and MoviePy imported up front.
+
+Functions sent to the pool must be module-level (picklable) and should take
+compact arguments — tuples/lists of primitives rather than segment dicts.
+Metrics they record are written to the shared multiprocess directory (see
+metrics.py) and show up in the parent's scrape.
+Set CPU_POOL_WORKERS=0 to run these stages in threads instead.
+"""
+import asyncio
+import atexit
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from .config import settings
+from . import metrics  # noqa: F401  sets PROMETHEUS_MULTIPROC_DIR before the children start
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_imports():
+    """Pool initializer: pay the heavy import cost once per worker process."""
+    import numpy  # noqa: F401
+    for module in ("sklearn.feature_extraction.text", "sklearn.metrics.pairwise", "moviepy"):
+        try:
+            __import__(module)
+        except Exception:
+            pass  # optional — the stage that needs it will report the error
+
+
+def get_cpu_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the process-wide pool, creating it on first use (None if disabled)."""
+    global _pool
+    if _pool is None and settings.CPU_POOL_WORKERS > 0:
+        # "spawn" keeps the children free of the parent's event loop and DB client threads
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.CPU_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_imports,
+        )
+        logger.info("CPU process pool started (%d workers)", settings.CPU_POOL_WORKERS)
+    return _pool
+
+
+def _ready() -> bool:
+    return True
+
+
+def start_cpu_pool():
+    """Start every pool worker now so the first job does not pay the import cost."""
+    pool = get_cpu_pool()
+    if pool is not None:
+        for future in [pool.submit(_ready) for _ in range(settings.CPU_POOL_WORKERS)]:
+            future.result()
+
+
+async def run_cpu(func: Callable, *args):
+    """Run `func(*args)` in the CPU pool without blocking the event loop."""
+    pool = get_cpu_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+def shutdown_cpu_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        logger.info("CPU process pool stopped")
+
+
+atexit.register(shutdown_cpu_pool)
@@ -34,11 +34,18 @@ class Database:
         await self.db.users.create_index("email",          unique=True)
         await self.db.videos.create_index("file_id",       unique=True)
         await self.db.videos.create_index("user_id")
+        await self.db.videos.create_index("content_hash")
+        await self.db.content_artifacts.create_index("content_hash", unique=True)
         await self.db.summaries.create_index("summary_id", unique=True)
         await self.db.summaries.create_index("user_id")
         await self.db.chat_sessions.create_index("session_id", unique=True)
         await self.db.tasks.create_index("task_id",        unique=True)
         await self.db.tasks.create_index("user_id")
+        await self.db.tasks.create_index([("status", 1), ("priority", 1), ("created_at", 1)])
+        await self.db.tasks.create_index("batch_id")
+        await self.db.transcript_cache.create_index([("key", 1), ("model", 1)], unique=True)
+        await self.db.transcript_cache.create_index([("model", 1), ("frames", 1)])
+        await self.db.transcript_cache.create_index("last_used_at")
         logger.debug("MongoDB indexes verified")
 
     async def close(self):
@@ -0,0 +1,131 @@
+"""
+llm_cache.py — On-disk cache of LLM completions.
+
+Re-running a summary, or summarizing the same transcript for another user,
+sends the exact same prompts again.  Completions are cached in a SQLite file
+(shared by the API and worker processes on one host) keyed by
+(backend, model, temperature, SHA-256 of the prompt).
+
+Eviction:
+  * entries older than LLM_CACHE_TTL_SECONDS are never returned and are
+    purged on the next write;
+  * when the stored responses exceed LLM_CACHE_MAX_MB, the least recently
+    used entries are deleted (hits refresh `last_used`).
+
+The cache never fails a call: SQLite errors are logged and treated as misses.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .config import settings
+from .metrics import LLM_CACHE_TOTAL
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def cache_key(backend: str, model: str, temperature: Optional[float], prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{backend}:{model}:{temperature}:{digest}"
+
+
+class LLMResponseCache:
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created > ?",
+                    (key, now - self.ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning("LLM cache lookup failed: %s", e)
+            row = None
+        LLM_CACHE_TOTAL.labels(result="hit" if row is not None else "miss").inc()
+        return row[0] if row is not None else None
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, response, size, now, now),
+                )
+                self._evict(now)
+        except sqlite3.Error as e:
+            logger.warning("LLM cache store failed: %s", e)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl_seconds,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until the rest fits
+        excess, doomed = total - self.max_bytes, []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        logger.info("LLM cache: evicted %d least recently used entries", len(doomed))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """The process-wide cache, or None if it is turned off (LLM_CACHE_MAX_MB = 0)."""
+    global _cache
+    if settings.LLM_CACHE_MAX_MB <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMResponseCache(
+                    settings.LLM_CACHE_PATH,
+                    int(settings.LLM_CACHE_MAX_MB * 1024 * 1024),
+                    settings.LLM_CACHE_TTL_SECONDS,
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("LLM cache unavailable at %s: %s", settings.LLM_CACHE_PATH, e)
+                return None
+        return _cache
@@ -0,0 +1,175 @@
+"""
+llm_client.py — Process-wide HTTP clients for the model providers.
+
+Every model wrapper used to build its own `httpx.Client` / `Groq` client and
+call Ollama with one-off `httpx.post`s, so each request could pay a new TCP
+and TLS handshake.  This module owns one keep-alive connection pool per
+process instead, sized and timed by the LLM_* settings:
+
+  * `get_groq_client()` / `get_http_client()` — synchronous, for code that
+    already runs in worker threads (transcription, the summarizer's
+    map/reduce);
+  * `get_async_groq_client()` / `get_async_http_client()` — for coroutines
+    (chat), so a provider call no longer blocks the event loop or a thread;
+  * `ollama_available()`, `ollama_generate()`, `aollama_generate()` — the
+    local Ollama backend over the same pools, with the availability probe
+    cached instead of repeated for every wrapper instance.
+
+Provider retries are disabled on the Groq clients: the rate limiter
+(rate_limiter.py) retries and paces calls.  `close_clients()` runs at
+shutdown.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .config import settings
+from .constants import OLLAMA_CONTEXT_TOKENS, OLLAMA_GENERATE_URL, OLLAMA_MODEL, OLLAMA_TAGS_URL
+
+try:
+    from groq import AsyncGroq, Groq
+    _HAS_GROQ = True
+except ImportError:
+    _HAS_GROQ = False
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_PROBE_TTL_SECONDS = 60.0
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_groq_client = None
+# Async clients belong to the event loop they were created on
+_async_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, object]] = {}
+_ollama_probe: Tuple[float, bool] = (0.0, False)
+
+
+def _client_options() -> Dict:
+    return {
+        "proxy": os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY"),
+        "verify": os.environ.get("DISABLE_SSL_VERIFY", "").lower() != "true",
+        "limits": httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+        ),
+        "timeout": _timeout(),
+    }
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Synchronous clients (worker threads)
+# ---------------------------------------------------------------------------
+def get_http_client() -> httpx.Client:
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(**_client_options())
+        return _http_client
+
+
+def groq_available() -> bool:
+    """Whether the groq SDK is installed."""
+    return _HAS_GROQ
+
+
+def get_groq_client():
+    """The shared synchronous Groq client (None if groq is not installed or no key is set)."""
+    global _groq_client
+    if not _HAS_GROQ or not settings.GROQ_API_KEY:
+        return None
+    http_client = get_http_client()
+    with _lock:
+        if _groq_client is None:
+            _groq_client = Groq(
+                api_key=settings.GROQ_API_KEY, http_client=http_client, max_retries=0, timeout=_timeout()
+            )
+        return _groq_client
+
+
+# ---------------------------------------------------------------------------
+# Async clients (coroutines)
+# ---------------------------------------------------------------------------
+def _for_running_loop(name: str, factory):
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.get(name)
+        if entry is None or entry[0] is not loop:
+            entry = _async_clients[name] = (loop, factory())
+        return entry[1]
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """The shared async HTTP client of the running event loop."""
+    return _for_running_loop("http", lambda: httpx.AsyncClient(**_client_options()))
+
+
+def get_async_groq_client():
+    """The shared AsyncGroq client of the running event loop (None without groq or a key)."""
+    if not _HAS_GROQ or not settings.GROQ_API_KEY:
+        return None
+    http_client = get_async_http_client()
+    return _for_running_loop("groq", lambda: AsyncGroq(
+        api_key=settings.GROQ_API_KEY, http_client=http_client, max_retries=0, timeout=_timeout()
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Ollama
+# ---------------------------------------------------------------------------
+def ollama_available() -> bool:
+    """Whether a local Ollama server answers (probed at most once a minute)."""
+    global _ollama_probe
+    checked_at, available = _ollama_probe
+    if time.monotonic() - checked_at < OLLAMA_PROBE_TTL_SECONDS:
+        return available
+    try:
+        available = get_http_client().get(OLLAMA_TAGS_URL, timeout=1.0).status_code == 200
+    except Exception:
+        available = False
+    _ollama_probe = (time.monotonic(), available)
+    if available:
+        logger.info("Ollama detected at %s", OLLAMA_TAGS_URL)
+    return available
+
+
+def _ollama_payload(prompt: str, json_mode: bool = False) -> Dict:
+    payload = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False, "options": {"num_ctx": OLLAMA_CONTEXT_TOKENS}}
+    if json_mode:
+        payload["format"] = "json"
+    return payload
+
+
+def ollama_generate(prompt: str, timeout: float, json_mode: bool = False) -> str:
+    resp = get_http_client().post(OLLAMA_GENERATE_URL, json=_ollama_payload(prompt, json_mode), timeout=timeout)
+    return resp.json().get("response", "").strip()
+
+
+async def aollama_generate(prompt: str, timeout: float) -> str:
+    resp = await get_async_http_client().post(OLLAMA_GENERATE_URL, json=_ollama_payload(prompt), timeout=timeout)
+    return resp.json().get("response", "").strip()
+
+
+# ---------------------------------------------------------------------------
+async def close_clients() -> None:
+    """Close the pooled connections (application / worker shutdown)."""
+    global _http_client, _groq_client
+    with _lock:
+        http_client, _http_client, _groq_client = _http_client, None, None
+        async_clients = list(_async_clients.values())
+        _async_clients.clear()
+    if http_client is not None:
+        http_client.close()
+    loop = asyncio.get_running_loop()
+    for client_loop, client in async_clients:
+        if client_loop is loop and isinstance(client, httpx.AsyncClient):
+            await client.aclose()
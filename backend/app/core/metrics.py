@@ -0,0 +1,193 @@
+"""
+metrics.py — Prometheus metrics, backed by `prometheus_client`.
+
+Metrics are rendered by `render()` for the `/metrics` endpoint (API) or
+served on the worker's metrics port (see worker.py).
+
+    with STAGE_SECONDS.labels(stage="rank").time():
+        ...
+    ENCODED_BYTES.labels(kind="summary_video").inc(os.path.getsize(path))
+
+The client runs in multiprocess mode so that work done in the CPU process
+pool (cpu_pool.py) is counted: each process writes its samples to files in
+PROMETHEUS_MULTIPROC_DIR and a scrape aggregates them.  If the variable is
+not set, a private directory is created for this process — pool children
+inherit it through the environment — and removed at exit.  Several server
+processes sharing one directory must be started with it set to an empty
+directory.
+"""
+import asyncio
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    # Read once when prometheus_client is imported
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="summarizer-metrics-")
+    atexit.register(shutil.rmtree, os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds — from a fast DB write up to a long render
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def collector_registry() -> CollectorRegistry:
+    """A registry holding the samples of this process and its pool children."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render() -> bytes:
+    return generate_latest(collector_registry())
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+STAGE_SECONDS = Histogram(
+    "summarizer_stage_duration_seconds",
+    "Wall time of each summarization pipeline stage (including waits for stage slots).",
+    ["stage"],
+    buckets=DEFAULT_BUCKETS,
+)
+AUDIO_EXTRACT_SECONDS = Histogram(
+    "summarizer_audio_extract_seconds",
+    "Time spent extracting the audio track from a video.",
+    buckets=DEFAULT_BUCKETS,
+)
+TRANSCRIBE_CHUNK_SECONDS = Histogram(
+    "summarizer_transcribe_chunk_seconds",
+    "Time to transcribe one audio chunk.",
+    ["engine"],
+    buckets=DEFAULT_BUCKETS,
+)
+LLM_CALL_SECONDS = Histogram(
+    "summarizer_llm_call_seconds",
+    "Latency of one LLM completion.",
+    ["backend", "outcome"],
+    buckets=DEFAULT_BUCKETS,
+)
+RANK_SECONDS = Histogram(
+    "summarizer_rank_seconds",
+    "Time spent scoring transcript segments (TF-IDF + TextRank).",
+    buckets=DEFAULT_BUCKETS,
+)
+RENDER_SECONDS = Histogram(
+    "summarizer_render_seconds",
+    "Time spent compositing and encoding a summary video.",
+    buckets=DEFAULT_BUCKETS,
+)
+DB_PERSIST_SECONDS = Histogram(
+    "summarizer_db_persist_seconds",
+    "Time spent writing a finished summary to MongoDB.",
+    buckets=DEFAULT_BUCKETS,
+)
+ENCODED_BYTES = Counter(
+    "summarizer_encoded_bytes_total",
+    "Bytes of encoded media written (audio chunks, summary videos).",
+    ["kind"],
+)
+TRANSCRIPT_CACHE_TOTAL = Counter(
+    "summarizer_transcript_cache_total",
+    "Transcript cache lookups by audio fingerprint.",
+    ["result"],
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "summarizer_rate_limit_wait_seconds",
+    "Time a provider call was held back by the client-side rate limiter.",
+    ["scheduler"],
+    buckets=DEFAULT_BUCKETS,
+)
+RATE_LIMIT_RETRIES_TOTAL = Counter(
+    "summarizer_rate_limit_retries_total",
+    "Provider calls retried after a rate limit, server or connection error.",
+    ["scheduler", "reason"],
+)
+LLM_CACHE_TOTAL = Counter(
+    "summarizer_llm_cache_total",
+    "LLM completion cache lookups.",
+    ["result"],
+)
+JOBS_TOTAL = Counter(
+    "summarizer_jobs_total",
+    "Summarization jobs finished by this process.",
+    ["outcome"],
+)
+# Every process reads the same task collection: report the latest reading
+QUEUE_DEPTH = Gauge(
+    "summarizer_queue_depth",
+    "Jobs waiting in the queue.",
+    multiprocess_mode="livemostrecent",
+)
+JOBS_IN_FLIGHT = Gauge(
+    "summarizer_jobs_in_flight",
+    "Jobs currently being processed.",
+    multiprocess_mode="livemostrecent",
+)
+
+
+async def refresh_queue_gauges():
+    """Update the queue gauges from the task collection (call before rendering)."""
+    from .constants import TASK_STATUS_PENDING
+    from .task_store import ACTIVE_TASK_STATUSES, count_tasks
+
+    QUEUE_DEPTH.set(await count_tasks(TASK_STATUS_PENDING))
+    JOBS_IN_FLIGHT.set(await count_tasks(*ACTIVE_TASK_STATUSES))
+
+
+# ---------------------------------------------------------------------------
+# Standalone exporter (worker processes have no HTTP app)
+# ---------------------------------------------------------------------------
+class _QueueGaugeRefresher:
+    """Collector that refreshes the queue gauges on the worker's event loop at scrape time."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        try:
+            asyncio.run_coroutine_threadsafe(refresh_queue_gauges(), self.loop).result(timeout=5)
+        except Exception as e:
+            logger.debug("Could not refresh queue metrics: %s", e)
+        return []
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """
+    Serve the metrics over HTTP on `port` from a background thread; returns
+    the server (stop it with `shutdown()`), or None if port is 0.
+    """
+    if not port:
+        return None
+    registry = CollectorRegistry()
+    # Registered first, so the gauges are written before the files are read
+    registry.register(_QueueGaugeRefresher(asyncio.get_running_loop()))
+    multiprocess.MultiProcessCollector(registry)
+    try:
+        server, _thread = start_http_server(port, host, registry=registry)
+    except OSError as e:
+        # e.g. a second worker on the same host — run without an exporter
+        logger.warning("Metrics exporter could not bind port %d: %s", port, e)
+        return None
+    logger.info("Metrics exporter listening on %s:%d", host, port)
+    return server
@@ -0,0 +1,333 @@
+"""
+rate_limiter.py — Client-side rate limiting and retries for provider APIs.
+
+Every Groq call (transcription chunks, LLM completions) goes through a
+`RateLimitScheduler` shared by all jobs in the process:
+
+  * token buckets for requests and tokens per minute hold callers back
+    *before* the provider would reject them; callers queue in order;
+  * the provider's `x-ratelimit-*` response headers correct the buckets —
+    the real token limit replaces the configured guess, and when the
+    provider reports nothing left the scheduler pauses until its reset time;
+  * 429s, 5xx and connection errors are retried with jittered exponential
+    backoff (honouring `retry-after`), so heavy load slows jobs down instead
+    of failing them.
+
+Usage (`acreate` is the same for async SDK clients):
+    response = get_scheduler("groq-llm").create(client.chat.completions, tokens=n, model=..., messages=...)
+"""
+import asyncio
+import inspect
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import httpx
+
+from .cancellation import CancelToken, check_cancelled
+from .config import settings
+from .metrics import RATE_LIMIT_RETRIES_TOTAL, RATE_LIMIT_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 429}
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds in a reset header: "7.66s", "2m59.56s", "120ms" or a bare number."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute / 60` per second up to `capacity`.  Reservations
+    may overdraw the bucket; the caller then waits until it is back at zero,
+    so a single request larger than the capacity is delayed, not refused.
+    """
+
+    def __init__(self, per_minute: float, now: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = now
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.per_minute / 60.0)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount`; returns how many seconds to wait before using it."""
+        self._refill(now)
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level * 60.0 / self.per_minute
+
+    def set_limit(self, per_minute: float, now: float):
+        self._refill(now)
+        self.per_minute = self.capacity = per_minute
+        self.level = min(self.level, self.capacity)
+
+    def cap(self, remaining: float, now: float):
+        """Never believe we have more than the provider says is left."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _headers(obj: Any) -> Mapping[str, str]:
+    headers = getattr(obj, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(obj, "response", None), "headers", None)
+    return headers if isinstance(headers, Mapping) or hasattr(headers, "get") else {}
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name) if headers else None
+    return value if isinstance(value, str) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    # SDK wrappers (groq.APIConnectionError, groq.APITimeoutError, ...)
+    name = type(error).__name__
+    return "Connection" in name or "Timeout" in name
+
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: float = 0,
+        learn_token_limit: bool = True,
+        max_retries: int = 6,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        # Whether x-ratelimit-*-tokens headers describe this bucket's unit (not audio seconds)
+        self.learn_token_limit = learn_token_limit
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._clock = clock
+        now = clock()
+        self.requests = TokenBucket(requests_per_minute, now) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, now) if tokens_per_minute > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = self._clock()
+            wait = max(0.0, self._paused_until - now)
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.reserve(tokens, now))
+            return wait
+
+    def _wait(self, seconds: float, cancel: Optional[CancelToken]):
+        deadline = self._clock() + seconds
+        while True:
+            check_cancelled(cancel)
+            left = deadline - self._clock()
+            if left <= 0:
+                return
+            self._sleep(min(left, 0.5))
+
+    async def _async_wait(self, seconds: float, cancel: Optional[CancelToken]):
+        deadline = self._clock() + seconds
+        while True:
+            check_cancelled(cancel)
+            left = deadline - self._clock()
+            if left <= 0:
+                return
+            await asyncio.sleep(min(left, 0.5))
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds` (the provider said to)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def observe_headers(self, headers: Mapping[str, str]):
+        """Correct the buckets from the provider's x-ratelimit-* headers."""
+        if not headers:
+            return
+        now = self._clock()
+        with self._lock:
+            limit_tokens = remaining_tokens = None
+            if self.learn_token_limit:
+                limit_tokens = _header(headers, "x-ratelimit-limit-tokens")
+                remaining_tokens = _header(headers, "x-ratelimit-remaining-tokens")
+            if limit_tokens and limit_tokens.isdigit():
+                if self.tokens is None:
+                    self.tokens = TokenBucket(float(limit_tokens), now)
+                elif float(limit_tokens) != self.tokens.per_minute:
+                    logger.info("%s: provider token limit is %s/min", self.name, limit_tokens)
+                    self.tokens.set_limit(float(limit_tokens), now)
+            if remaining_tokens and remaining_tokens.isdigit() and self.tokens is not None:
+                self.tokens.cap(float(remaining_tokens), now)
+
+            # Groq's request limit is per day: only pause when it runs out
+            if _header(headers, "x-ratelimit-remaining-requests") == "0":
+                reset = parse_reset(_header(headers, "x-ratelimit-reset-requests"))
+                if reset:
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        headers = _headers(error)
+        retry_after = parse_reset(_header(headers, "retry-after"))
+        if retry_after is None:
+            retry_after = parse_reset(_header(headers, "x-ratelimit-reset-tokens"))
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1.0)
+        # Full jitter: spread retries of concurrent callers apart
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def _admit(self, tokens: float) -> float:
+        """Reserve capacity for one call; seconds to wait before making it."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            RATE_LIMIT_WAIT_SECONDS.labels(scheduler=self.name).observe(wait)
+        return wait
+
+    def _backoff(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to sleep before retrying after `error`, or None to give up.
+        A 429 pauses every caller instead (the next `_admit` waits).
+        """
+        if not is_retryable(error) or attempt >= self.max_retries:
+            return None
+        delay = self._retry_delay(error, attempt)
+        status = _status_code(error)
+        RATE_LIMIT_RETRIES_TOTAL.labels(scheduler=self.name, reason=str(status or "connection")).inc()
+        logger.warning("%s: %s (attempt %d), retrying in %.1fs", self.name, error, attempt + 1, delay)
+        if status == 429:
+            self.pause(delay)
+            self.observe_headers(_headers(error))
+            return 0.0
+        return delay
+
+    # ------------------------------------------------------------------
+    def call(self, fn: Callable[[], Any], tokens: float = 0, cancel: Optional[CancelToken] = None) -> Any:
+        """Run `fn()` within the limits, retrying transient failures."""
+        attempt = 0
+        while True:
+            self._wait(self._admit(tokens), cancel)
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                self._wait(delay, cancel)
+                attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], tokens: float = 0,
+                    cancel: Optional[CancelToken] = None) -> Any:
+        """`call` for coroutines: waits with asyncio.sleep instead of blocking."""
+        attempt = 0
+        while True:
+            await self._async_wait(self._admit(tokens), cancel)
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                await self._async_wait(delay, cancel)
+                attempt += 1
+
+    def create(self, resource: Any, tokens: float = 0, cancel: Optional[CancelToken] = None, **kwargs) -> Any:
+        """
+        `resource.create(**kwargs)` through `call`, reading the rate-limit
+        headers when the SDK exposes the raw response.
+        """
+        raw_api = getattr(resource, "with_raw_response", None)
+        if raw_api is None:
+            return self.call(lambda: resource.create(**kwargs), tokens, cancel)
+
+        def _create():
+            raw = raw_api.create(**kwargs)
+            self.observe_headers(_headers(raw))
+            return raw.parse()
+
+        return self.call(_create, tokens, cancel)
+
+    async def acreate(self, resource: Any, tokens: float = 0, cancel: Optional[CancelToken] = None, **kwargs) -> Any:
+        """`create` for async SDK clients.  Streams are returned unparsed."""
+        raw_api = getattr(resource, "with_raw_response", None)
+        if raw_api is None or kwargs.get("stream"):
+            return await self.acall(lambda: resource.create(**kwargs), tokens, cancel)
+
+        async def _create():
+            raw = await raw_api.create(**kwargs)
+            self.observe_headers(_headers(raw))
+            parsed = raw.parse()
+            return await parsed if inspect.isawaitable(parsed) else parsed
+
+        return await self.acall(_create, tokens, cancel)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide schedulers
+# ---------------------------------------------------------------------------
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _limits(name: str) -> Dict[str, Any]:
+    limits = {
+        "groq-llm": {
+            "requests_per_minute": settings.GROQ_LLM_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": settings.GROQ_LLM_TOKENS_PER_MINUTE,
+        },
+        "groq-stt": {
+            "requests_per_minute": settings.GROQ_STT_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": settings.GROQ_STT_AUDIO_SECONDS_PER_MINUTE,
+            # Its "tokens" are audio seconds; the provider's token headers are not
+            "learn_token_limit": False,
+        },
+    }
+    if name not in limits:
+        raise ValueError(f"Unknown rate limit scheduler: {name}")
+    return limits[name]
+
+
+def get_scheduler(name: str) -> RateLimitScheduler:
+    """The shared scheduler for `name` ("groq-llm" or "groq-stt")."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = _schedulers[name] = RateLimitScheduler(
+                name, max_retries=settings.RATE_LIMIT_MAX_RETRIES, **_limits(name)
+            )
+        return scheduler
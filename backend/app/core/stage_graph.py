@@ -0,0 +1,116 @@
+"""
+stage_graph.py — Minimal dependency-graph executor for pipeline stages.
+
+Each Stage names the stages it depends on.  StageGraph.run() starts every
+stage as soon as all of its dependencies have finished, so independent
+stages (e.g. subtitles, thumbnail and the summary video) run at the same
+time.  Progress is reported as the finished fraction of the total stage
+weight rather than as hard-coded percentages, and each stage's wall time is
+recorded in the `summarizer_stage_duration_seconds` histogram.
+
+Usage:
+    graph = StageGraph([
+        Stage("transcribe", transcribe, weight=4),
+        Stage("summary", summarize, deps=("transcribe",)),
+        Stage("subtitles", subtitles, deps=("transcribe",), required=False),
+    ])
+    results = await graph.run(on_progress=report)
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .cancellation import CancelToken, TaskCancelled, check_cancelled
+from .metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# A stage receives {dep_name: dep_result} and returns its own result
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+ProgressCallback = Callable[[float, str], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    name: str
+    run: StageFunc
+    deps: Tuple[str, ...] = ()
+    weight: float = 1.0
+    required: bool = True   # an optional stage's failure yields None instead of aborting
+
+
+class StageGraph:
+    def __init__(self, stages: Iterable[Stage], cancel: Optional[CancelToken] = None):
+        self.cancel = cancel  # checked before each stage starts
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm — every stage must be reachable in topological order
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    @property
+    def total_weight(self) -> float:
+        return sum(stage.weight for stage in self.stages.values()) or 1.0
+
+    async def _run_timed(self, stage: Stage, inputs: Dict[str, Any]) -> Any:
+        check_cancelled(self.cancel)
+        with STAGE_SECONDS.labels(stage=stage.name).time():
+            return await stage.run(inputs)
+
+    async def run(self, on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Run all stages; returns {stage_name: result}."""
+        results: Dict[str, Any] = {}
+        waiting = dict(self.stages)
+        running: Dict[asyncio.Task, str] = {}
+        done_weight = 0.0
+
+        try:
+            while waiting or running:
+                for name, stage in list(waiting.items()):
+                    if all(dep in results for dep in stage.deps):
+                        inputs = {dep: results[dep] for dep in stage.deps}
+                        running[asyncio.create_task(self._run_timed(stage, inputs))] = name
+                        del waiting[name]
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    stage = self.stages[name]
+                    try:
+                        results[name] = task.result()
+                    except Exception as e:
+                        # Cancellation stops the whole graph, even from an optional stage
+                        if stage.required or isinstance(e, TaskCancelled):
+                            raise
+                        logger.warning("Optional stage '%s' failed (non-fatal): %s", name, e)
+                        results[name] = None
+
+                    done_weight += stage.weight
+                    if on_progress:
+                        await on_progress(done_weight / self.total_weight, name)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
@@ -0,0 +1,89 @@
+"""
+stage_limits.py — Per-stage concurrency limits for the summarization pipeline.
+
+A worker runs several jobs at once, but the heavy stages must not all run
+together: transcription and rendering are CPU/bandwidth-bound and LLM calls
+are rate-limited by the provider.  Each stage gets its own limit, sized from
+settings, shared by every job running in this process.
+
+Waiters are served by job priority (lower first, FIFO within a priority), so
+jobs from a large batch queue behind interactive jobs for every slot instead
+of holding the stage until the whole batch is through.
+
+Usage:
+    async with stage_slot("render"):
+        await asyncio.to_thread(processor.create_visual_summary, ...)
+
+    async with stage_slot("llm", priority=PRIORITY_BATCH):
+        ...
+"""
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+from .config import settings
+from .constants import PRIORITY_INTERACTIVE
+
+
+class PrioritySlots:
+    """A semaphore whose waiters are woken lowest `priority` first."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: List[list] = []   # heap of [priority, seq, future]
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), future])
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot was handed over as we were cancelled
+            raise
+
+    def release(self):
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_use < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():  # skip waiters that were cancelled
+                self.in_use += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_slots: Dict[str, PrioritySlots] = {}
+
+
+def _stage_limit(stage: str) -> int:
+    limits = {
+        "transcribe": settings.STAGE_CONCURRENCY_TRANSCRIBE,
+        "llm":        settings.STAGE_CONCURRENCY_LLM,
+        "render":     settings.STAGE_CONCURRENCY_RENDER,
+    }
+    if stage not in limits:
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+    return max(1, limits[stage])
+
+
+def stage_slot(stage: str, priority: int = PRIORITY_INTERACTIVE):
+    """Async context manager holding one of the process-wide slots for `stage`."""
+    slots = _slots.get(stage)
+    if slots is None:
+        slots = _slots[stage] = PrioritySlots(_stage_limit(stage))
+    return slots.slot(priority)
@@ -0,0 +1,328 @@
+"""
+task_store.py — Persistent task store and job queue for summarization jobs.
+
+Every summarization job is one document in the `tasks` collection.  The API
+process only enqueues jobs (`create_task`) and reads their status; worker
+processes (see app/worker.py) claim pending jobs with an atomic
+find-and-modify and hold a lease on them while they run.  If a worker dies
+its lease expires and `requeue_expired_tasks` puts the job back in the queue.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from .database import get_database
+from .constants import (
+    TASK_STATUS_PENDING,
+    TASK_STATUS_PROCESSING,
+    TASK_STATUS_TRANSCRIBING,
+    TASK_STATUS_SUMMARIZING,
+    TASK_STATUS_GENERATING_VIDEO,
+    TASK_STATUS_GENERATING_SUBTITLES,
+    TASK_STATUS_GENERATING_TTS,
+    TASK_STATUS_DONE,
+    TASK_STATUS_FAILED,
+    TASK_STATUS_CANCELLED,
+    PRIORITY_INTERACTIVE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses a task can be in while a worker holds it
+ACTIVE_TASK_STATUSES = (
+    TASK_STATUS_PROCESSING,
+    TASK_STATUS_TRANSCRIBING,
+    TASK_STATUS_SUMMARIZING,
+    TASK_STATUS_GENERATING_VIDEO,
+    TASK_STATUS_GENERATING_SUBTITLES,
+    TASK_STATUS_GENERATING_TTS,
+)
+
+# Statuses a task never leaves
+TERMINAL_TASK_STATUSES = (TASK_STATUS_DONE, TASK_STATUS_FAILED, TASK_STATUS_CANCELLED)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Task CRUD
+# ---------------------------------------------------------------------------
+
+async def create_task(
+    task_id: str,
+    user_id: str,
+    payload: Optional[Dict] = None,
+    artifacts: Optional[Dict] = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    batch_id: Optional[str] = None,
+) -> Dict:
+    """
+    Insert a new pending task. `payload` holds the pipeline arguments and
+    `artifacts` optionally pre-seeds stage checkpoints.  Lower `priority`
+    tasks are claimed first; `batch_id` groups the members of a batch.
+    """
+    db = await get_database()
+    doc = {
+        "task_id": task_id,
+        "user_id": user_id,
+        "status": TASK_STATUS_PENDING,
+        "progress": 0,
+        "step": "queued",
+        "payload": payload or {},
+        "artifacts": artifacts or {},
+        "priority": priority,
+        "batch_id": batch_id,
+        "attempts": 0,
+        "locked_by": None,
+        "lease_expires_at": None,
+        "created_at": _now(),
+        "updated_at": _now(),
+    }
+    await db.tasks.insert_one(doc)
+    return doc
+
+
+async def get_task(task_id: str) -> Optional[Dict]:
+    db = await get_database()
+    return await db.tasks.find_one({"task_id": task_id})
+
+
+async def update_task(task_id: str, **fields) -> None:
+    """Set arbitrary fields on a task (status, progress, step, ...)."""
+    db = await get_database()
+    fields["updated_at"] = _now()
+    await db.tasks.update_one({"task_id": task_id}, {"$set": fields})
+
+
+async def mark_done(task_id: str, summary_id: str) -> None:
+    await update_task(
+        task_id,
+        status=TASK_STATUS_DONE,
+        summary_id=summary_id,
+        progress=100,
+        step="done",
+        locked_by=None,
+        lease_expires_at=None,
+        finished_at=_now(),
+    )
+
+
+async def mark_failed(task_id: str, error: str) -> None:
+    await update_task(
+        task_id,
+        status=TASK_STATUS_FAILED,
+        error=error,
+        step="failed",
+        locked_by=None,
+        lease_expires_at=None,
+        finished_at=_now(),
+    )
+
+
+async def mark_cancelled(task_id: str) -> None:
+    await update_task(
+        task_id,
+        status=TASK_STATUS_CANCELLED,
+        step="cancelled",
+        locked_by=None,
+        lease_expires_at=None,
+        finished_at=_now(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cancellation
+# ---------------------------------------------------------------------------
+
+async def request_cancel(task_id: str) -> Optional[str]:
+    """
+    Cancel a task.  A pending task is cancelled at once; a running one gets
+    `cancel_requested` and is stopped by its worker.  Returns the resulting
+    status ("cancelled" or "cancelling"), or None if the task already ended.
+    """
+    db = await get_database()
+    result = await db.tasks.update_one(
+        {"task_id": task_id, "status": TASK_STATUS_PENDING},
+        {"$set": {
+            "status": TASK_STATUS_CANCELLED,
+            "step": "cancelled",
+            "cancel_requested": True,
+            "finished_at": _now(),
+            "updated_at": _now(),
+        }},
+    )
+    if result.modified_count == 1:
+        return TASK_STATUS_CANCELLED
+
+    result = await db.tasks.update_one(
+        {"task_id": task_id, "status": {"$in": list(ACTIVE_TASK_STATUSES)}},
+        {"$set": {"cancel_requested": True, "step": "cancelling", "updated_at": _now()}},
+    )
+    return "cancelling" if result.matched_count == 1 else None
+
+
+async def cancel_requested_ids(task_ids) -> set:
+    """The subset of `task_ids` whose cancellation has been requested."""
+    if not task_ids:
+        return set()
+    db = await get_database()
+    cursor = db.tasks.find(
+        {"task_id": {"$in": list(task_ids)}, "cancel_requested": True},
+        {"task_id": 1},
+    )
+    return {doc["task_id"] async for doc in cursor}
+
+
+# ---------------------------------------------------------------------------
+# Stage checkpoints
+# ---------------------------------------------------------------------------
+
+async def save_artifact(task_id: str, name: str, value) -> None:
+    """Store one pipeline stage's output under `artifacts.<name>`."""
+    db = await get_database()
+    await db.tasks.update_one(
+        {"task_id": task_id},
+        {"$set": {f"artifacts.{name}": value, "updated_at": _now()}},
+    )
+
+
+async def get_artifacts(task_id: str) -> Dict:
+    """Return the stage outputs checkpointed so far ({} if none)."""
+    db = await get_database()
+    task = await db.tasks.find_one({"task_id": task_id}, {"artifacts": 1})
+    return dict((task or {}).get("artifacts") or {})
+
+
+async def requeue_task(task_id: str) -> bool:
+    """
+    Put a failed task back in the queue, keeping its checkpoints so the
+    pipeline resumes after the last completed stage.
+    """
+    db = await get_database()
+    result = await db.tasks.update_one(
+        {"task_id": task_id, "status": TASK_STATUS_FAILED},
+        {"$set": {
+            "status": TASK_STATUS_PENDING,
+            "step": "resume queued",
+            "error": None,
+            "attempts": 0,
+            "updated_at": _now(),
+        }},
+    )
+    return result.modified_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Queue operations (used by worker processes)
+# ---------------------------------------------------------------------------
+
+async def claim_next_task(
+    worker_id: str,
+    lease_seconds: int,
+    max_priority: Optional[int] = None,
+) -> Optional[Dict]:
+    """
+    Atomically take the most urgent pending task (lowest priority, then
+    oldest) and lease it to `worker_id`.  With `max_priority` only tasks at
+    or below that priority are considered.  Returns the claimed task
+    document, or None if there is nothing to claim.
+    """
+    db = await get_database()
+    now = _now()
+    query = {"status": TASK_STATUS_PENDING}
+    if max_priority is not None:
+        query["priority"] = {"$not": {"$gt": max_priority}}  # also matches tasks without a priority
+    return await db.tasks.find_one_and_update(
+        query,
+        {
+            "$set": {
+                "status": TASK_STATUS_PROCESSING,
+                "step": "starting",
+                "locked_by": worker_id,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "started_at": now,
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("priority", 1), ("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def renew_lease(task_id: str, worker_id: str, lease_seconds: int) -> bool:
+    """Extend the lease on a running task. Returns False if the lease was lost."""
+    db = await get_database()
+    result = await db.tasks.update_one(
+        {"task_id": task_id, "locked_by": worker_id},
+        {"$set": {"lease_expires_at": _now() + timedelta(seconds=lease_seconds)}},
+    )
+    return result.matched_count == 1
+
+
+async def requeue_expired_tasks(max_attempts: int) -> int:
+    """
+    Return tasks whose worker stopped renewing its lease to the queue.
+    Tasks that already used `max_attempts` claims are marked failed instead.
+    Returns the number of tasks re-queued.
+    """
+    db = await get_database()
+    expired = {
+        "status": {"$in": list(ACTIVE_TASK_STATUSES)},
+        "lease_expires_at": {"$lt": _now()},
+    }
+
+    # A job cancelled while its worker was dying is not worth resuming
+    await db.tasks.update_many(
+        {**expired, "cancel_requested": True},
+        {"$set": {
+            "status": TASK_STATUS_CANCELLED,
+            "step": "cancelled",
+            "locked_by": None,
+            "lease_expires_at": None,
+            "updated_at": _now(),
+            "finished_at": _now(),
+        }},
+    )
+    await db.tasks.update_many(
+        {**expired, "attempts": {"$gte": max_attempts}},
+        {"$set": {
+            "status": TASK_STATUS_FAILED,
+            "error": "Worker lost the job too many times",
+            "step": "failed",
+            "locked_by": None,
+            "lease_expires_at": None,
+            "updated_at": _now(),
+            "finished_at": _now(),
+        }},
+    )
+    result = await db.tasks.update_many(
+        expired,
+        {"$set": {
+            "status": TASK_STATUS_PENDING,
+            "step": "re-queued",
+            "locked_by": None,
+            "lease_expires_at": None,
+            "updated_at": _now(),
+        }},
+    )
+    if result.modified_count:
+        logger.warning("Re-queued %d task(s) with expired leases", result.modified_count)
+    return result.modified_count
+
+
+async def get_batch_tasks(batch_id: str) -> List[Dict]:
+    """All member tasks of a batch, in submission order."""
+    db = await get_database()
+    cursor = db.tasks.find({"batch_id": batch_id}, {"artifacts": 0}).sort("created_at", 1)
+    return [task async for task in cursor]
+
+
+async def count_tasks(*statuses: str) -> int:
+    """Count tasks in any of the given statuses (e.g. queue depth)."""
+    db = await get_database()
+    return await db.tasks.count_documents({"status": {"$in": list(statuses)}})
@@ -0,0 +1,145 @@
+"""
+tokens.py — Token counting and token-budgeted text chunking for LLM prompts.
+
+Transcripts used to be cut into fixed 15 000-character chunks.  How many
+tokens that is depends on the language (English ≈ 4 characters per token,
+Cyrillic ≈ 2, CJK ≈ 1), so chunks either wasted most of the context window
+or overflowed it.  Chunks are now sized in tokens against a per-backend
+budget (`chunk_token_budget`):
+
+  * `count_tokens()` uses tiktoken's cl100k_base encoding when tiktoken is
+    installed (close to the Llama 3 tokenizer), otherwise a byte-based
+    estimate calibrated per script;
+  * `split_to_budget()` packs whole sentences up to the budget, falls back
+    to word boundaries for a run-on "sentence" (transcripts without
+    punctuation) and to a hard character split as a last resort.
+"""
+import logging
+import re
+from typing import Callable, List, Optional, Pattern
+
+from .config import settings
+from .constants import (
+    GROQ_CONTEXT_TOKENS,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
+    LLM_PROMPT_TOKEN_OVERHEAD,
+    OLLAMA_CONTEXT_TOKENS,
+)
+
+try:
+    import tiktoken
+    _HAS_TIKTOKEN = True
+except ImportError:
+    _HAS_TIKTOKEN = False
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_TOKENS = 256
+
+_encoding = None
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+# A sentence ends after . ! ? … followed by whitespace, or right after CJK punctuation
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？])")
+_WORD_END = re.compile(r"\s+")
+
+
+def _get_encoding():
+    global _encoding, _HAS_TIKTOKEN
+    if _encoding is None and _HAS_TIKTOKEN:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:  # the encoding is downloaded on first use
+            logger.warning("tiktoken encoding unavailable, estimating token counts: %s", e)
+            _HAS_TIKTOKEN = False
+    return _encoding
+
+
+def estimate_token_count(text: str) -> int:
+    """
+    Tokenizer-free estimate: ~4 ASCII characters per token; other characters
+    count one token per two UTF-8 continuation bytes (≈ 0.5 per Cyrillic or
+    accented letter, ≈ 1 per CJK character).
+    """
+    if text.isascii():
+        return (len(text) + 3) // 4
+    non_ascii = "".join(_NON_ASCII.findall(text))
+    continuation_bytes = len(non_ascii.encode("utf-8")) - len(non_ascii)
+    return (len(text) - len(non_ascii) + 3) // 4 + (continuation_bytes + 1) // 2
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return estimate_token_count(text)
+
+
+def chunk_token_budget(backend: str) -> int:
+    """
+    Transcript tokens to send in one call to `backend` ("groq" or "ollama"):
+    SUMMARIZE_CHUNK_TOKENS if set, else the model's context window minus the
+    prompt instructions and the completion.  On Groq a call is also kept
+    within one minute of the token quota, so it never stalls the limiter.
+    """
+    if settings.SUMMARIZE_CHUNK_TOKENS > 0:
+        return settings.SUMMARIZE_CHUNK_TOKENS
+    reserved = LLM_PROMPT_TOKEN_OVERHEAD + LLM_COMPLETION_TOKEN_ESTIMATE
+    if backend == "ollama":
+        return max(OLLAMA_CONTEXT_TOKENS - reserved, MIN_CHUNK_TOKENS)
+    budget = GROQ_CONTEXT_TOKENS - reserved
+    if settings.GROQ_LLM_TOKENS_PER_MINUTE > 0:
+        budget = min(budget, settings.GROQ_LLM_TOKENS_PER_MINUTE - reserved)
+    return max(budget, MIN_CHUNK_TOKENS)
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+# ---------------------------------------------------------------------------
+def split_to_budget(text: str, budget: int, count: Optional[Callable[[str], int]] = None) -> List[str]:
+    """
+    Split `text` into consecutive chunks of at most `budget` tokens (as
+    measured by `count`, default `count_tokens`), packing as many whole
+    sentences into each chunk as fit.
+    """
+    count = count or count_tokens
+    chunks: List[str] = []
+    for run in _pack(text, _SENTENCE_END, budget, count):
+        if count(run) <= budget:
+            chunks.append(run)
+            continue
+        # A single sentence over the budget: words, then characters
+        for part in _pack(run, _WORD_END, budget, count):
+            chunks.extend([part] if count(part) <= budget else _split_chars(part, budget, count))
+    return [c.strip() for c in chunks if c.strip()]
+
+
+def _pack(text: str, boundary: Pattern, budget: int, count: Callable[[str], int]) -> List[str]:
+    """Greedily join the pieces of `text` between `boundary` matches into runs within `budget`."""
+    runs: List[str] = []
+    start = prev = used = 0
+    for cut in [m.end() for m in boundary.finditer(text)] + [len(text)]:
+        if cut <= prev:
+            continue
+        size = count(text[prev:cut])
+        if used and used + size > budget:
+            runs.append(text[start:prev])
+            start, used = prev, 0
+        used += size
+        prev = cut
+    if prev > start:
+        runs.append(text[start:prev])
+    return runs
+
+
+def _split_chars(text: str, budget: int, count: Callable[[str], int]) -> List[str]:
+    """Hard split of text without usable boundaries (e.g. unpunctuated CJK)."""
+    parts: List[str] = []
+    step = max(1, len(text) * budget // max(count(text), 1))
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + step)
+        while end - start > 1 and count(text[start:end]) > budget:
+            end = start + (end - start) * 9 // 10
+        parts.append(text[start:end])
+        start = end
+    return parts
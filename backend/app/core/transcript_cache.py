@@ -0,0 +1,126 @@
+"""
+transcript_cache.py — Transcripts shared by audio fingerprint.
+
+The content-hash store (content_store.py) only helps for byte-identical
+uploads.  This cache is keyed by the fingerprint of the decoded audio (see
+fingerprint.py), so the same recording re-uploaded in another container or
+at another bitrate skips transcription entirely.
+
+Entries hold the raw transcript (text, segments with word timings) and the
+fingerprint, and are scoped to the transcription model that produced them.
+A lookup tries the exact fingerprint first, then compares fingerprints of
+about the same length at their best alignment and accepts the closest one
+within FINGERPRINT_MAX_BER.  The collection is an LRU: hits refresh
+`last_used_at`, and inserts beyond TRANSCRIPT_CACHE_MAX_ENTRIES evict the
+least recently used entries.
+
+The transcriber runs in a worker thread; `BlockingTranscriptCache` gives it
+a synchronous view of this module that runs on the job's event loop.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+
+from .config import settings
+from .constants import FINGERPRINT_MAX_BER
+from .database import get_database
+from .fingerprint import WORDS_PER_FRAME, bit_error_rate, fingerprint_key
+from .metrics import TRANSCRIPT_CACHE_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints within this many words (2 s) of each other's length are compared
+_LENGTH_TOLERANCE = 4 * WORDS_PER_FRAME
+
+
+async def lookup_transcript(fingerprint: np.ndarray, model: str) -> Optional[Dict]:
+    """The cached transcript of a recording matching `fingerprint`, or None."""
+    if settings.TRANSCRIPT_CACHE_MAX_ENTRIES <= 0 or len(fingerprint) == 0:
+        return None
+    db = await get_database()
+
+    doc = await db.transcript_cache.find_one({"key": fingerprint_key(fingerprint), "model": model})
+    if doc is None:
+        best_ber, best_key = FINGERPRINT_MAX_BER, None
+        candidates = db.transcript_cache.find(
+            {
+                "model": model,
+                "frames": {"$gte": len(fingerprint) - _LENGTH_TOLERANCE, "$lte": len(fingerprint) + _LENGTH_TOLERANCE},
+            },
+            {"key": 1, "fingerprint": 1},
+        )
+        async for candidate in candidates:
+            ber = bit_error_rate(fingerprint, np.frombuffer(candidate["fingerprint"], dtype="<u4"))
+            if ber <= best_ber:
+                best_ber, best_key = ber, candidate["key"]
+        if best_key is not None:
+            logger.info("Transcript cache: fingerprint match at %.1f%% bit errors", best_ber * 100)
+            doc = await db.transcript_cache.find_one({"key": best_key, "model": model})
+
+    if doc is None:
+        TRANSCRIPT_CACHE_TOTAL.labels(result="miss").inc()
+        return None
+
+    TRANSCRIPT_CACHE_TOTAL.labels(result="hit").inc()
+    await db.transcript_cache.update_one(
+        {"_id": doc["_id"]},
+        {"$set": {"last_used_at": datetime.now(timezone.utc)}, "$inc": {"hits": 1}},
+    )
+    return doc["transcript"]
+
+
+async def store_transcript(fingerprint: np.ndarray, model: str, transcript: Dict) -> None:
+    """Cache `transcript` under `fingerprint`, evicting least recently used entries."""
+    max_entries = settings.TRANSCRIPT_CACHE_MAX_ENTRIES
+    if max_entries <= 0 or len(fingerprint) == 0:
+        return
+    db = await get_database()
+    now = datetime.now(timezone.utc)
+    try:
+        await db.transcript_cache.update_one(
+            {"key": fingerprint_key(fingerprint), "model": model},
+            {
+                "$set": {
+                    "frames": len(fingerprint),
+                    "fingerprint": fingerprint.astype("<u4").tobytes(),
+                    "transcript": transcript,
+                    "last_used_at": now,
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0},
+            },
+            upsert=True,
+        )
+    except Exception as e:  # e.g. a transcript over MongoDB's 16 MB document limit
+        logger.warning("Transcript cache: could not store transcript: %s", e)
+        return
+
+    excess = await db.transcript_cache.count_documents({}) - max_entries
+    if excess > 0:
+        oldest = db.transcript_cache.find({}, {"_id": 1}).sort("last_used_at", 1).limit(excess)
+        ids = [doc["_id"] async for doc in oldest]
+        await db.transcript_cache.delete_many({"_id": {"$in": ids}})
+        logger.info("Transcript cache: evicted %d least recently used entries", len(ids))
+
+
+class BlockingTranscriptCache:
+    """Synchronous access to the cache from a thread, run on `loop`."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, model: str):
+        self.loop = loop
+        self.model = model
+
+    def get(self, fingerprint: np.ndarray) -> Optional[Dict]:
+        try:
+            return asyncio.run_coroutine_threadsafe(lookup_transcript(fingerprint, self.model), self.loop).result()
+        except Exception as e:
+            logger.warning("Transcript cache lookup failed: %s", e)
+            return None
+
+    def put(self, fingerprint: np.ndarray, transcript: Dict) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(store_transcript(fingerprint, self.model, transcript), self.loop).result()
+        except Exception as e:
+            logger.warning("Transcript cache store failed: %s", e)
@@ -0,0 +1,120 @@
+"""
+vad.py — Energy-based voice activity detection for transcription chunking.
+
+Lectures and meetings often have long silences or quiet intros that cost
+transcription time but carry no words.  `speech_regions` finds the parts of
+a 16 kHz mono WAV worth sending:
+
+  1. `frame_levels` streams the file and computes the RMS level (dBFS) of
+     every 30 ms frame — a few hundred KB of floats even for hours of audio.
+  2. Frames above an adaptive threshold (between the noise floor and the
+     loud frames) count as speech; pauses shorter than
+     VAD_MIN_SILENCE_SECONDS are kept, longer ones are dropped, and every
+     region is padded by VAD_PAD_SECONDS so word edges are not clipped.
+
+Chunks are then built from these regions and cut in the dropped pauses
+(or, inside a long region, at its quietest frame).  `TimelineMap` records
+where each stretch of a chunk came from, so transcript timestamps can be
+mapped back onto the original video's timeline.
+"""
+import bisect
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from .constants import (
+    VAD_FRAME_SECONDS,
+    VAD_MARGIN_DB,
+    VAD_MIN_SILENCE_SECONDS,
+    VAD_PAD_SECONDS,
+    VAD_SILENCE_DB,
+)
+
+
+class TimelineMap:
+    """Maps times inside a chunk back to times in the original audio."""
+
+    def __init__(self, pieces: List[Tuple[float, float]]):
+        """`pieces`: (start in chunk, start in original) per contiguous stretch, in order."""
+        self._chunk_starts = [p[0] for p in pieces]
+        self._original_starts = [p[1] for p in pieces]
+
+    @classmethod
+    def shifted(cls, offset: float) -> "TimelineMap":
+        """A chunk that is one contiguous stretch starting at `offset`."""
+        return cls([(0.0, offset)])
+
+    @property
+    def start(self) -> float:
+        return self._original_starts[0]
+
+    def to_original(self, t: float) -> float:
+        i = max(0, bisect.bisect_right(self._chunk_starts, t) - 1)
+        return self._original_starts[i] + (t - self._chunk_starts[i])
+
+
+def frame_levels(audio_path: str, frame_seconds: float = VAD_FRAME_SECONDS) -> Tuple[np.ndarray, int]:
+    """
+    RMS level in dBFS of every `frame_seconds` frame of `audio_path`, read
+    block by block.  Returns (levels, frame length in samples).
+    """
+    samplerate = sf.info(audio_path).samplerate
+    frame_len = max(1, int(round(frame_seconds * samplerate)))
+    levels = []
+    # Blocks are a whole number of frames, so no frame straddles two blocks
+    for block in sf.blocks(audio_path, blocksize=frame_len * 2000, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1)
+        pad = -len(mono) % frame_len
+        if pad:
+            mono = np.concatenate([mono, np.zeros(pad, dtype=mono.dtype)])
+        rms = np.sqrt(np.mean(mono.reshape(-1, frame_len) ** 2, axis=1))
+        levels.append(20 * np.log10(np.maximum(rms, 1e-6)))
+    return (np.concatenate(levels) if levels else np.zeros(0)), frame_len
+
+
+def speech_threshold(levels: np.ndarray) -> float:
+    """Level separating speech from background, adapted to the recording."""
+    floor, loud = np.percentile(levels, [10, 99])
+    # Stays below the loud frames even when the recording has no quiet part
+    return max(VAD_SILENCE_DB, min(floor + VAD_MARGIN_DB, loud - VAD_MARGIN_DB))
+
+
+def speech_regions(
+    levels: np.ndarray,
+    frame_len: int,
+    total_samples: int,
+    samplerate: int,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    (start, end) sample ranges of speech, or None if none was found (the
+    caller should then send the whole file).
+    """
+    if len(levels) == 0:
+        return None
+    mask = levels >= speech_threshold(levels)
+    if not mask.any():
+        return None
+
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+    starts, ends = edges[0::2], edges[1::2]
+
+    # Bridge pauses too short to be worth dropping
+    min_gap = int(np.ceil(VAD_MIN_SILENCE_SECONDS * samplerate / frame_len))
+    keep = (starts[1:] - ends[:-1]) >= min_gap
+    starts = np.concatenate([starts[:1], starts[1:][keep]])
+    ends = np.concatenate([ends[:-1][keep], ends[-1:]])
+
+    pad = int(VAD_PAD_SECONDS * samplerate)
+    starts = np.maximum(starts * frame_len - pad, 0)
+    ends = np.minimum(ends * frame_len + pad, total_samples)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def quietest_cut(levels: np.ndarray, frame_len: int, lo: int, hi: int) -> int:
+    """Sample position of the quietest frame in [lo, hi), to split a long region."""
+    first, last = lo // frame_len, max(lo // frame_len + 1, hi // frame_len)
+    window = levels[first:last]
+    if len(window) == 0:
+        return hi
+    return min(hi, max(lo + 1, (first + int(np.argmin(window))) * frame_len))
@@ -0,0 +1,100 @@
+"""
+youtube.py — YouTube captions and downloads.
+
+A YouTube video with captions does not need Whisper: `fetch_caption_segments`
+turns its caption track into transcript segments, so the pipeline can skip
+the download, audio extraction and transcription and only fetch the video
+(in the background, at the resolution the summary render uses) for the
+summary video.  Videos without captions are downloaded up front as before.
+"""
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import yt_dlp
+from youtube_transcript_api import YouTubeTranscriptApi
+
+from .cancellation import CancelToken, check_cancelled
+from .constants import YOUTUBE_CAPTION_LANGUAGES, YOUTUBE_RENDER_FORMAT
+
+logger = logging.getLogger(__name__)
+
+
+def extract_youtube_id(url: str) -> str:
+    parsed = urlparse(url)
+    if parsed.hostname == 'youtu.be':
+        return parsed.path[1:]
+    if parsed.hostname in ('www.youtube.com', 'youtube.com'):
+        if parsed.path == '/watch':
+            q = parse_qs(parsed.query)
+            return q['v'][0] if 'v' in q else ""
+        if parsed.path.startswith('/embed/'):
+            return parsed.path[7:]
+        if parsed.path.startswith('/v/'):
+            return parsed.path[3:]
+    return ""
+
+
+def fetch_caption_segments(video_id: str) -> Optional[List[Dict]]:
+    """
+    Transcript segments ({start, end, text}) from the video's best caption
+    track — manual before auto-generated, preferred languages first — or
+    None if it has no usable captions.
+    """
+    if not video_id:
+        return None
+    try:
+        if hasattr(YouTubeTranscriptApi, "list_transcripts"):
+            tracks = list(YouTubeTranscriptApi.list_transcripts(video_id))
+        else:  # youtube-transcript-api >= 1.0
+            tracks = list(YouTubeTranscriptApi().list(video_id))
+        if not tracks:
+            return None
+        track = min(tracks, key=lambda t: (t.is_generated, t.language_code not in YOUTUBE_CAPTION_LANGUAGES))
+        fetched = track.fetch()
+        rows = fetched.to_raw_data() if hasattr(fetched, "to_raw_data") else fetched
+    except Exception as e:
+        logger.info("No captions for YouTube video %s: %s", video_id, e)
+        return None
+
+    segments = []
+    for row in rows:
+        text = " ".join(row.get("text", "").split())
+        if not text:
+            continue
+        start = float(row.get("start", 0.0))
+        segments.append({"start": start, "end": start + float(row.get("duration", 0.0)), "text": text})
+    if not segments:
+        return None
+    logger.info("YouTube video %s: %d caption segments (%s%s)", video_id, len(segments), track.language_code,
+                ", auto-generated" if track.is_generated else "")
+    return segments
+
+
+def fetch_video_info(url: str) -> Dict:
+    """Title and duration of a YouTube video, without downloading it."""
+    with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    return {"title": info.get("title", "YouTube Video"), "duration": info.get("duration")}
+
+
+def download_video(url: str, output_template: str, cancel: Optional[CancelToken] = None) -> Dict:
+    """
+    Download a single-file (audio + video) rendition of `url` good enough
+    for the summary render.  `cancel` is checked as data arrives.
+    """
+    def _check_cancel(_progress):
+        check_cancelled(cancel)
+
+    ydl_opts = {
+        "format": YOUTUBE_RENDER_FORMAT,
+        "outtmpl": output_template,
+        "quiet": True,
+        "progress_hooks": [_check_cancel],
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        return {
+            "filepath": ydl.prepare_filename(info),
+            "title": info.get("title", "YouTube Video"),
+        }
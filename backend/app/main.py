@@ -7,14 +7,17 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from .api import auth, videos, chat
 from .core.config import settings
+from .core.cpu_pool import shutdown_cpu_pool
 from .core.database import database
+from .core.llm_client import close_clients
+from .core import metrics
 
 # ─── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -112,6 +115,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # ── shutdown ──
+    shutdown_cpu_pool()
+    await close_clients()
     await database.close()
 
 
@@ -168,6 +173,16 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape target: pipeline timings, queue depth, in-flight jobs."""
+    try:
+        await metrics.refresh_queue_gauges()
+    except Exception as e:
+        logger.warning("Could not refresh queue metrics: %s", e)
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/api/health")
 async def health_check():
     """Production health check — used by Docker HEALTHCHECK and monitoring."""
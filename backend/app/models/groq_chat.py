@@ -1,48 +1,32 @@
 import logging
-import os
-import httpx
-from typing import AsyncGenerator, Dict, List, Optional
-from groq import Groq
+from typing import AsyncGenerator, Dict, List
 
 from app.core.constants import (
     GROQ_CHAT_MODEL,
-    OLLAMA_MODEL,
-    OLLAMA_GENERATE_URL,
-    OLLAMA_TAGS_URL,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
     MAX_CHAT_TRANSCRIPT_CHARS,
 )
+from app.core.llm_client import aollama_generate, get_async_groq_client, ollama_available
+from app.core.rate_limiter import get_scheduler
+from app.core.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
 class GroqChat:
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.client: Optional[Groq] = None
+        self.client = None  # AsyncGroq, shared per process (see llm_client.py)
         self.history: List[Dict] = []
         self.use_mock = False
         self.use_ollama = False
-        self.ollama_url = OLLAMA_GENERATE_URL
 
         try:
-            http_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
-            _disable_ssl = os.environ.get("DISABLE_SSL_VERIFY", "").lower() == "true"
-            http_client = httpx.Client(
-                proxy=http_proxy,
-                verify=not _disable_ssl,
-            )
-            
             # Check for Ollama
-            try:
-                ollama_check = httpx.get(OLLAMA_TAGS_URL, timeout=1.0)
-                if ollama_check.status_code == 200:
-                    self.use_ollama = True
-                    logger.info("Chat: Ollama detected")
-            except Exception:
-                pass
+            self.use_ollama = ollama_available()
 
             if not self.use_ollama:
                 if api_key:
-                    self.client = Groq(api_key=api_key, http_client=http_client)
+                    self.client = get_async_groq_client()
                     logger.info("Groq client initialized")
                 else:
                     logger.warning("No GROQ_API_KEY set and Ollama not detected — running in mock mode")
@@ -81,12 +65,7 @@ class GroqChat:
             prompt += f"\nuser: {question}\nassistant:"
             
             try:
-                resp = httpx.post(self.ollama_url, json={
-                "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False
-                }, timeout=60.0)
-                answer = resp.json().get("response", "").strip()
+                answer = await aollama_generate(prompt, timeout=60.0)
                 self.history.append({"role": "user", "content": question})
                 self.history.append({"role": "assistant", "content": answer})
                 return answer
@@ -99,7 +78,9 @@ class GroqChat:
 
         self.history.append({"role": "user", "content": question})
         try:
-            resp = self.client.chat.completions.create(
+            resp = await get_scheduler("groq-llm").acreate(
+                self.client.chat.completions,
+                tokens=self._token_estimate(),
                 messages=self.history,
                 model=GROQ_CHAT_MODEL,
             )
@@ -125,12 +106,14 @@ class GroqChat:
         self.history.append({"role": "user", "content": question})
         full_answer = ""
         try:
-            stream = self.client.chat.completions.create(
+            stream = await get_scheduler("groq-llm").acreate(
+                self.client.chat.completions,
+                tokens=self._token_estimate(),
                 messages=self.history,
                 model=GROQ_CHAT_MODEL,
                 stream=True,
             )
-            for chunk in stream:
+            async for chunk in stream:
                 token = chunk.choices[0].delta.content or ""
                 if token:
                     full_answer += token
@@ -142,6 +125,9 @@ class GroqChat:
             logger.warning("Groq streaming error: %s", e)
             yield f"[Error: {e}]"
 
+    def _token_estimate(self) -> int:
+        return count_tokens(" ".join(m["content"] for m in self.history)) + LLM_COMPLETION_TOKEN_ESTIMATE
+
     def _mock_response(self, question: str) -> str:
         q = question.lower()
         if any(w in q for w in ("summary", "about", "what is")):
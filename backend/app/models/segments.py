@@ -0,0 +1,213 @@
+"""
+segments.py — Columnar transcript segments.
+
+A long video has thousands of transcript segments (and tens of thousands of
+words).  As lists of dicts every segment costs a dict, several boxed floats
+and a str, and each pipeline step used to copy or mutate them.
+`SegmentTable` keeps them in columns instead:
+
+  * `start`, `end`, `confidence` and `score` float64 arrays,
+  * all texts in one string buffer, sliced through an `offsets` array,
+  * optionally the word timings the same way, grouped per segment by
+    `word_offsets`.
+
+Stages pass tables to each other; the dict format (`to_dicts` /
+`from_dicts`) is only used at the edges — MongoDB documents, API responses
+and the older helpers (subtitles, highlights) that still take dicts.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CONFIDENCE = 0.99
+
+
+def _pack(texts: Sequence[str]) -> Tuple[str, np.ndarray]:
+    """One string buffer plus n+1 offsets for `texts`."""
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+    return "".join(texts), offsets
+
+
+class SegmentTable:
+    """Transcript segments as NumPy columns (see module docstring)."""
+
+    __slots__ = (
+        "start", "end", "confidence", "score", "_text", "_offsets",
+        "word_start", "word_end", "word_probability", "_word_text", "_word_text_offsets", "word_offsets",
+    )
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        texts: Sequence[str],
+        confidence: Optional[np.ndarray] = None,
+        score: Optional[np.ndarray] = None,
+        words: Optional[Sequence[Sequence[Dict]]] = None,
+    ):
+        n = len(texts)
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+        self.confidence = (np.full(n, DEFAULT_CONFIDENCE, dtype=np.float64) if confidence is None
+                           else np.asarray(confidence, dtype=np.float64))
+        self.score = None if score is None else np.asarray(score, dtype=np.float64)
+        self._text, self._offsets = _pack(texts)
+
+        self.word_offsets = None
+        if words is not None and any(words):
+            flat = [w for seg_words in words for w in seg_words]
+            self.word_offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum([len(seg_words) for seg_words in words], out=self.word_offsets[1:])
+            self.word_start = np.array([w.get("start", 0.0) for w in flat], dtype=np.float64)
+            self.word_end = np.array([w.get("end", 0.0) for w in flat], dtype=np.float64)
+            self.word_probability = np.array(
+                [w.get("probability", DEFAULT_CONFIDENCE) for w in flat], dtype=np.float64
+            )
+            self._word_text, self._word_text_offsets = _pack([w.get("word", "") for w in flat])
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls) -> "SegmentTable":
+        return cls(np.zeros(0), np.zeros(0), [])
+
+    @classmethod
+    def from_dicts(cls, segments: Iterable[Dict]) -> "SegmentTable":
+        """Build from the dict format ({start, end, text, confidence, relevance_score, words})."""
+        segments = list(segments)
+        scores = [seg.get("relevance_score") for seg in segments]
+        words = [[w for w in seg.get("words") or [] if isinstance(w, dict)] for seg in segments]
+        return cls(
+            start=np.array([float(seg.get("start", 0)) for seg in segments]),
+            end=np.array([float(seg.get("end", 0)) for seg in segments]),
+            texts=[seg.get("text", "") for seg in segments],
+            confidence=np.array([seg.get("confidence", DEFAULT_CONFIDENCE) for seg in segments]),
+            score=np.array(scores) if segments and all(s is not None for s in scores) else None,
+            words=words,
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence["SegmentTable"]) -> "SegmentTable":
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+        has_scores = all(t.score is not None for t in tables)
+        return cls(
+            start=np.concatenate([t.start for t in tables]),
+            end=np.concatenate([t.end for t in tables]),
+            texts=[text for t in tables for text in t.texts()],
+            confidence=np.concatenate([t.confidence for t in tables]),
+            score=np.concatenate([t.score for t in tables]) if has_scores else None,
+            words=[w for t in tables for w in t.words()] if any(t.has_words for t in tables) else None,
+        )
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def has_words(self) -> bool:
+        return self.word_offsets is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and text buffers."""
+        total = sum(a.nbytes for a in (self.start, self.end, self.confidence, self._offsets))
+        total += len(self._text) + (self.score.nbytes if self.score is not None else 0)
+        if self.has_words:
+            total += sum(a.nbytes for a in (self.word_start, self.word_end, self.word_probability,
+                                            self._word_text_offsets, self.word_offsets))
+            total += len(self._word_text)
+        return total
+
+    def text(self, i: int) -> str:
+        return self._text[self._offsets[i]:self._offsets[i + 1]]
+
+    def texts(self) -> List[str]:
+        offsets = self._offsets.tolist()
+        return [self._text[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def transcript(self) -> str:
+        return " ".join(self.texts())
+
+    def words(self) -> List[List[Dict]]:
+        """Word timings per segment, as dicts ([] for every segment if none)."""
+        if not self.has_words:
+            return [[] for _ in range(len(self))]
+        offsets = self._word_text_offsets.tolist()
+        flat = [
+            {"word": self._word_text[a:b], "start": s, "end": e, "probability": p}
+            for a, b, s, e, p in zip(offsets[:-1], offsets[1:], self.word_start.tolist(),
+                                     self.word_end.tolist(), self.word_probability.tolist())
+        ]
+        bounds = self.word_offsets.tolist()
+        return [flat[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def spans(self) -> List[Tuple[float, float]]:
+        """(start, end) pairs — the compact form sent to the CPU pool."""
+        return list(zip(self.start.tolist(), self.end.tolist()))
+
+    # ------------------------------------------------------------------
+    def take(self, indices: Sequence[int]) -> "SegmentTable":
+        """A new table with the rows at `indices`, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        texts = self.texts()
+        words = self.words() if self.has_words else None
+        return SegmentTable(
+            start=self.start[indices],
+            end=self.end[indices],
+            texts=[texts[i] for i in indices.tolist()],
+            confidence=self.confidence[indices],
+            score=self.score[indices] if self.score is not None else None,
+            words=[words[i] for i in indices.tolist()] if words is not None else None,
+        )
+
+    def ranking(self) -> np.ndarray:
+        """Row indices by descending score; ties keep their original order."""
+        if self.score is None:
+            return np.arange(len(self))
+        return np.argsort(-self.score, kind="stable")
+
+    def ranking_pairs(self) -> List[List]:
+        """
+        The ranking as [row index, score] pairs, best first — how it is
+        checkpointed, instead of a second full copy of the segments.
+        """
+        order = self.ranking().tolist()
+        scores = self.score.tolist() if self.score is not None else [None] * len(self)
+        return [[i, scores[i]] for i in order]
+
+    def with_ranking(self, ranked: Sequence) -> "SegmentTable":
+        """
+        Set `score` from a checkpointed ranking and return the rows best
+        first.  Accepts `ranking_pairs()` output or the older format, full
+        segment dicts in rank order (matched to rows by start time).
+        """
+        if ranked and isinstance(ranked[0], dict):
+            row_by_start = {start: i for i, start in enumerate(self.start.tolist())}
+            pairs = [
+                [row_by_start[float(seg.get("start", 0))], seg.get("relevance_score", 0.0)]
+                for seg in ranked if float(seg.get("start", 0)) in row_by_start
+            ]
+        else:
+            pairs = [[int(i), score] for i, score in ranked]
+        self.score = np.zeros(len(self))
+        for i, score in pairs:
+            self.score[i] = score or 0.0
+        return self.take([i for i, _ in pairs])
+
+    def to_dicts(self, words: bool = True) -> List[Dict]:
+        """The dict format used in MongoDB documents and API responses."""
+        rows = [
+            {"start": s, "end": e, "text": t, "confidence": c}
+            for s, e, t, c in zip(self.start.tolist(), self.end.tolist(), self.texts(), self.confidence.tolist())
+        ]
+        if self.score is not None:
+            for row, score in zip(rows, self.score.tolist()):
+                row["relevance_score"] = score
+        if words and self.has_words:
+            for row, seg_words in zip(rows, self.words()):
+                row["words"] = seg_words
+        return rows
@@ -1,58 +1,49 @@
 import logging
-import os
 import json
-from typing import List, Dict
-import httpx
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Optional
+from pydantic import BaseModel, Field, ValidationError
 from app.core.config import settings
 from app.core.constants import (
     GROQ_SUMMARIZATION_MODEL,
+    GROQ_SUMMARIZATION_TEMPERATURE,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
     OLLAMA_MODEL,
-    OLLAMA_GENERATE_URL,
-    OLLAMA_TAGS_URL,
     HF_SUMMARIZATION_MODEL,
-    TEXT_CHUNK_MAX_CHARS,
 )
-
-try:
-    from groq import Groq
-    _HAS_GROQ = True
-except ImportError:
-    _HAS_GROQ = False
+from app.core.cancellation import CancelToken, TaskCancelled, check_cancelled
+from app.core.metrics import LLM_CALL_SECONDS, RANK_SECONDS
+from app.core.llm_cache import cache_key, get_llm_cache
+from app.core.llm_client import get_groq_client, groq_available, ollama_available, ollama_generate
+from app.core.rate_limiter import get_scheduler
+from app.core.tokens import chunk_token_budget, count_tokens, split_to_budget
 
 logger = logging.getLogger(__name__)
 
+
+class ChunkAnalysis(BaseModel):
+    """Schema of one combined-analysis answer (see `VideoSummarizer.analyze_text`)."""
+    summary: str
+    key_points: List[str] = Field(default_factory=list)
+    description: str = ""
+
+
 class VideoSummarizer:
     _hf_summarizer = None
 
     def __init__(self):
         self.api_key = settings.GROQ_API_KEY
         self.client = None
-        self.use_mock = not _HAS_GROQ or not self.api_key
+        self.use_mock = not groq_available() or not self.api_key
         
         if not self.use_mock:
             try:
-                _disable_ssl = os.environ.get("DISABLE_SSL_VERIFY", "").lower() == "true"
-                http_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
-                http_client = httpx.Client(
-                    proxy=http_proxy,
-                    verify=not _disable_ssl,
-                )
-                
                 # Try Ollama first if it's running, else fallback to Groq
-                try:
-                    ollama_check = httpx.get(OLLAMA_TAGS_URL, timeout=1.0)
-                    if ollama_check.status_code == 200:
-                        self.use_ollama = True
-                        self.ollama_url = OLLAMA_GENERATE_URL
-                    else:
-                        self.use_ollama = False
-                except Exception:
-                    self.use_ollama = False
-
+                self.use_ollama = ollama_available()
                 if not self.use_ollama:
-                    self.client = Groq(api_key=self.api_key, http_client=http_client)
+                    self.client = get_groq_client()
                     logger.info("Groq Summarizer loaded")
-                
             except Exception as e:
                 logger.warning("Error initializing AI backend: %s", e)
                 self.use_mock = True
@@ -87,129 +78,311 @@ class VideoSummarizer:
     # -------------------------------
     # TEXT CHUNKING
     # -------------------------------
-    def _chunk_text(self, text: str, max_chunk_chars: int = TEXT_CHUNK_MAX_CHARS) -> List[str]:
-        # Groq llama3 supports 8k tokens (~32k chars), 15k chars is very safe
-        sentences = text.split(". ")
-        chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < max_chunk_chars:
-                current_chunk += sentence + ". "
-            else:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
+    def _chunk_budget(self) -> int:
+        """Transcript tokens per LLM call on the active backend (see tokens.py)."""
+        return chunk_token_budget("ollama" if getattr(self, "use_ollama", False) else "groq")
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        return chunks
+    def _chunk_text(self, text: str, max_chunk_chars: Optional[int] = None) -> List[str]:
+        """
+        Split `text` at sentence boundaries into chunks that fill the
+        backend's token budget (or at most `max_chunk_chars` characters).
+        """
+        if max_chunk_chars:
+            return split_to_budget(text, max_chunk_chars, count=len)
+        return split_to_budget(text, self._chunk_budget())
 
     # -------------------------------
-    # SUMMARIZATION
+    # SUMMARIZATION (map → reduce)
     # -------------------------------
-    def summarize_text(self, text: str, max_length: int = 400) -> str:
+    def _generate(self, prompt: str, timeout: float = 90.0, json_mode: bool = False) -> str:
+        """
+        Run one completion on the active backend (Ollama or Groq), answering
+        repeated prompts from the LLM response cache (see llm_cache.py).
+        `json_mode` asks the backend for a JSON object; answers that do not
+        parse as JSON are then not cached.
+        """
+        backend = "ollama" if self.use_ollama else "groq"
+        cache = get_llm_cache()
+        key = None
+        if cache is not None:
+            if self.use_ollama:
+                key = cache_key(backend, OLLAMA_MODEL, None, prompt)
+            else:
+                key = cache_key(backend, GROQ_SUMMARIZATION_MODEL, GROQ_SUMMARIZATION_TEMPERATURE, prompt)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            text = self._complete(prompt, timeout, json_mode)
+            outcome = "ok"
+        finally:
+            LLM_CALL_SECONDS.labels(backend=backend, outcome=outcome).observe(time.perf_counter() - started)
+        if key is not None and text and (not json_mode or _is_json(text)):
+            cache.put(key, text)
+        return text
+
+    def _complete(self, prompt: str, timeout: float, json_mode: bool = False) -> str:
+        if self.use_ollama:
+            return ollama_generate(prompt, timeout, json_mode=json_mode)
+
+        options = {"response_format": {"type": "json_object"}} if json_mode else {}
+        resp = get_scheduler("groq-llm").create(
+            self.client.chat.completions,
+            tokens=count_tokens(prompt) + LLM_COMPLETION_TOKEN_ESTIMATE,
+            model=GROQ_SUMMARIZATION_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=GROQ_SUMMARIZATION_TEMPERATURE,
+            **options,
+        )
+        return resp.choices[0].message.content.strip()
+
+    def _generate_all(self, prompts: List[str], cancel: Optional[CancelToken] = None,
+                      timeout: float = 90.0, json_mode: bool = False) -> List[str]:
+        """
+        Run independent completions, up to SUMMARIZE_CONCURRENCY at once
+        (the provider rate limiter paces them); results keep prompt order.
+        `cancel` is checked before every call.
+        """
+        def _one(prompt: str) -> str:
+            check_cancelled(cancel)
+            return self._generate(prompt, timeout=timeout, json_mode=json_mode)
+
+        workers = min(settings.SUMMARIZE_CONCURRENCY, len(prompts))
+        if workers <= 1:
+            return [_one(p) for p in prompts]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+            futures = [pool.submit(_one, p) for p in prompts]
+            try:
+                return [f.result() for f in futures]
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    def map_chunks(self, text: str, max_length: int = 400, cancel: Optional[CancelToken] = None) -> List[str]:
+        """
+        Map phase: summarize each `_chunk_text` chunk of `text` independently
+        (concurrently, see `_generate_all`).  Can be called on pieces of a
+        transcript as they are produced.
+        """
+        prompts = []
+        for chunk in self._chunk_text(text):
+            prompts.append(
+                f"You are an expert video content summarizer. Provide a comprehensive, "
+                f"accurate, and detailed summary of the following video transcript. "
+                f"Requirements:\n"
+                f"1. Cover ALL major topics, arguments, and conclusions discussed.\n"
+                f"2. Preserve important names, numbers, dates, and technical terms exactly as stated.\n"
+                f"3. Maintain the logical flow and structure of the content.\n"
+                f"4. The summary should be approximately {max_length} words long.\n"
+                f"5. Write in clear, professional language that is easy to understand.\n"
+                f"6. Do NOT add information that is not in the transcript.\n\n"
+                f"Transcript:\n{chunk}"
+            )
+        return self._generate_all(prompts, cancel)
+
+    def reduce_summaries(self, summaries: List[str], max_length: int = 400,
+                         cancel: Optional[CancelToken] = None) -> str:
+        """
+        Reduce phase: merge the chunk summaries into one summary, as a tree.
+
+        Consecutive summaries are grouped so each combine prompt stays within
+        the token budget of a map chunk (`_chunk_budget`); the groups of
+        one level are combined concurrently, and levels repeat until one
+        summary is left — log(chunks) rounds instead of one oversized prompt.
+        """
+        level = [s for s in summaries if s.strip()]
+        if len(level) <= 1:
+            return " ".join(level)
+        return self._reduce_tree(
+            level, count_tokens, self._combine_prompt, self._generate_all,
+            lambda text, limit: (split_to_budget(text, limit, count=count_tokens) or [""])[0],
+            max_length, cancel,
+        )
+
+    def _reduce_tree(self, level: List[Any], size: Callable[[Any], int],
+                     make_prompt: Callable[[List[Any], int], str],
+                     run: Callable[[List[str], Optional[CancelToken]], List[Any]],
+                     trim: Callable[[Any, int], Any], max_length: int,
+                     cancel: Optional[CancelToken] = None) -> Any:
+        """
+        The tree behind `reduce_summaries` and `reduce_analyses`; no prompt
+        holds more than `_chunk_budget()` tokens of input.
+
+        An item over half the budget cannot share a prompt with a neighbour,
+        so it is condensed on its own (to a length that can), alongside the
+        combines of its level; if the model ignores the length it is cut.
+        """
+        budget = self._chunk_budget()
+        half = max((budget - 1) // 2, 1)
+        condensed_length = max(min(max_length, half * 3 // 5), 1)  # words, ~0.75 per token
+        level = [trim(item, budget) if size(item) > budget else item for item in level]
+
+        while len(level) > 1:
+            groups = _group_by_size(level, budget, size=size)
+            combine = [i for i, group in enumerate(groups) if len(group) > 1]
+            condense = [i for i, group in enumerate(groups) if len(group) == 1 and size(group[0]) > half]
+            prompts = ([make_prompt(groups[i], max_length) for i in combine] +
+                       [make_prompt(groups[i], condensed_length) for i in condense])
+            results = dict(zip(combine + condense, run(prompts, cancel)))
+            for i in condense:
+                if size(results[i]) > half:
+                    results[i] = trim(results[i], half)
+            level = [results.get(i, group[0]) for i, group in enumerate(groups)]
+        return level[0]
+
+    @staticmethod
+    def _combine_prompt(summaries: List[str], max_length: int) -> str:
+        return (
+            f"Combine the following summary sections into one unified, coherent, "
+            f"and comprehensive summary (approximately {max_length} words). "
+            f"Remove any redundancy, ensure smooth transitions between topics, "
+            f"and preserve all key information accurately:\n\n{' '.join(summaries)}"
+        )
+
+    def summarize_text(self, text: str, max_length: int = 400, partials: Optional[List[str]] = None,
+                       cancel: Optional[CancelToken] = None) -> str:
+        """
+        Summarize `text`. `partials` are map-phase summaries already produced
+        for it (e.g. while it was being transcribed); only the reduce runs then.
+        """
         if self.use_mock or not text.strip():
             return text[:500] + "..."
 
         try:
-            chunks = self._chunk_text(text)
-            summaries = []
-
-            for chunk in chunks:
-                prompt = (
-                    f"You are an expert video content summarizer. Provide a comprehensive, "
-                    f"accurate, and detailed summary of the following video transcript. "
-                    f"Requirements:\n"
-                    f"1. Cover ALL major topics, arguments, and conclusions discussed.\n"
-                    f"2. Preserve important names, numbers, dates, and technical terms exactly as stated.\n"
-                    f"3. Maintain the logical flow and structure of the content.\n"
-                    f"4. The summary should be approximately {max_length} words long.\n"
-                    f"5. Write in clear, professional language that is easy to understand.\n"
-                    f"6. Do NOT add information that is not in the transcript.\n\n"
-                    f"Transcript:\n{chunk}"
-                )
-                
-                if self.use_ollama:
-                    resp = httpx.post(self.ollama_url, json={
-                        "model": OLLAMA_MODEL,
-                        "prompt": prompt,
-                        "stream": False
-                    }, timeout=90.0)
-                    summaries.append(resp.json().get("response", "").strip())
-                else:
-                    resp = self.client.chat.completions.create(
-                        model=GROQ_SUMMARIZATION_MODEL,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.2,
-                    )
-                    summaries.append(resp.choices[0].message.content.strip())
-
-            combined = " ".join(summaries)
-            
-            if len(summaries) > 1:
-                final_req = (
-                    f"Combine the following summary sections into one unified, coherent, "
-                    f"and comprehensive summary (approximately {max_length} words). "
-                    f"Remove any redundancy, ensure smooth transitions between topics, "
-                    f"and preserve all key information accurately:\n\n{combined}"
-                )
-                if self.use_ollama:
-                    resp = httpx.post(self.ollama_url, json={
-                        "model": OLLAMA_MODEL,
-                        "prompt": final_req,
-                        "stream": False
-                    }, timeout=90.0)
-                    return resp.json().get("response", "").strip()
-                else:
-                    final = self.client.chat.completions.create(
-                        model=GROQ_SUMMARIZATION_MODEL,
-                        messages=[{"role": "user", "content": final_req}],
-                        temperature=0.2,
-                    )
-                    return final.choices[0].message.content.strip()
-
-            return combined
-
+            if not partials:
+                partials = self.map_chunks(text, max_length, cancel)
+            check_cancelled(cancel)
+            return self.reduce_summaries(partials, max_length, cancel)
+        except TaskCancelled:
+            raise
         except Exception as e:
             logger.warning("Groq Summarization failed: %s", e)
             return text[:500] + "..."
 
+    # -------------------------------
+    # COMBINED ANALYSIS (summary + key points + description)
+    # -------------------------------
+    @staticmethod
+    def _analysis_prompt(chunk: str, max_length: int, num_points: int) -> str:
+        return (
+            f"You are an expert video content summarizer. Analyze the following video transcript "
+            f"and answer with ONLY a JSON object with exactly these fields:\n"
+            f'  "summary": an accurate, comprehensive summary of approximately {max_length} words that '
+            f"covers all major topics and conclusions and preserves names, numbers and technical terms,\n"
+            f'  "key_points": an array of the {num_points} most important key points, as clear sentences,\n'
+            f'  "description": a single-line description of the video (at most 25 words).\n'
+            f"Do NOT add information that is not in the transcript.\n\n"
+            f"Transcript:\n{chunk}"
+        )
+
+    @staticmethod
+    def _combine_analyses_prompt(analyses: List[ChunkAnalysis], max_length: int, num_points: int) -> str:
+        sections = "\n".join(a.model_dump_json() for a in analyses)
+        return (
+            f"The following JSON objects analyze consecutive sections of one video transcript. "
+            f"Merge them into ONE JSON object with the same fields:\n"
+            f'  "summary": one unified, coherent summary of approximately {max_length} words, '
+            f"without redundancy and preserving all key information,\n"
+            f'  "key_points": the {num_points} most important key points of the whole video,\n'
+            f'  "description": a single-line description of the whole video (at most 25 words).\n'
+            f"Answer with ONLY the JSON object.\n\n{sections}"
+        )
+
+    def _analyze_all(self, prompts: List[str], cancel: Optional[CancelToken] = None) -> List[ChunkAnalysis]:
+        """
+        Run analysis prompts in JSON mode and validate every answer against
+        `ChunkAnalysis`; an invalid answer is asked for once more, with the
+        validation error, before giving up (ValueError).
+        """
+        answers = self._generate_all(prompts, cancel, json_mode=True)
+        results: List[Optional[ChunkAnalysis]] = [None] * len(prompts)
+        retries = []
+        for i, raw in enumerate(answers):
+            try:
+                results[i] = _parse_analysis(raw)
+            except ValueError as e:
+                retries.append((i, f"{prompts[i]}\n\nYour previous answer was rejected ({e}). "
+                                   f"Answer with ONLY a valid JSON object with the fields above."))
+        if retries:
+            logger.info("Combined analysis: retrying %d invalid JSON answer(s)", len(retries))
+            answers = self._generate_all([prompt for _, prompt in retries], cancel, json_mode=True)
+            for (i, _), raw in zip(retries, answers):
+                results[i] = _parse_analysis(raw)
+        return results
+
+    def map_analyses(self, text: str, max_length: int = 400, num_points: int = 5,
+                     cancel: Optional[CancelToken] = None) -> List[ChunkAnalysis]:
+        """Map phase of `analyze_text`: one structured answer per `_chunk_text` chunk."""
+        prompts = [self._analysis_prompt(chunk, max_length, num_points) for chunk in self._chunk_text(text)]
+        return self._analyze_all(prompts, cancel)
+
+    def reduce_analyses(self, analyses: List[ChunkAnalysis], max_length: int = 400, num_points: int = 5,
+                        cancel: Optional[CancelToken] = None) -> ChunkAnalysis:
+        """Reduce phase of `analyze_text`, the same tree as `reduce_summaries`."""
+        level = [a for a in analyses if a.summary.strip()]
+        if not level:
+            return ChunkAnalysis(summary="")
+        if len(level) == 1:
+            return level[0]
+        return self._reduce_tree(
+            level, _analysis_size,
+            lambda group, length: self._combine_analyses_prompt(group, length, num_points),
+            self._analyze_all, _trim_analysis, max_length, cancel,
+        )
+
+    def analyze_text(self, text: str, max_length: int = 400, num_points: int = 5,
+                     partials: Optional[List[ChunkAnalysis]] = None,
+                     cancel: Optional[CancelToken] = None) -> ChunkAnalysis:
+        """
+        Summary, key points and a one-line description of `text` from one
+        structured (JSON) answer per chunk plus the reduce, instead of
+        separate summary and key-point calls.  `partials` are map-phase
+        answers already produced (see `map_analyses`).
+
+        Falls back to `summarize_text` / `extract_key_points` if the model
+        keeps answering with invalid JSON.
+        """
+        if not self.use_mock and text.strip():
+            try:
+                if not partials:
+                    partials = self.map_analyses(text, max_length, num_points, cancel)
+                check_cancelled(cancel)
+                result = self.reduce_analyses(partials, max_length, num_points, cancel)
+                if result.summary.strip():
+                    result.key_points = [p.strip() for p in result.key_points if p.strip()][:num_points]
+                    result.description = " ".join(result.description.split())
+                    return result
+            except TaskCancelled:
+                raise
+            except Exception as e:
+                logger.warning("Combined analysis failed, using separate calls: %s", e)
+
+        summary = self.summarize_text(text, max_length, cancel=cancel)
+        return ChunkAnalysis(
+            summary=summary,
+            key_points=self.extract_key_points(text, num_points, cancel=cancel),
+            description=" ".join(summary.split(". ")[0].split())[:200],
+        )
+
     # -------------------------------
     # KEY POINT EXTRACTION
     # -------------------------------
-    def extract_key_points(self, text: str, num_points: int = 5) -> List[str]:
+    def extract_key_points(self, text: str, num_points: int = 5, cancel: Optional[CancelToken] = None) -> List[str]:
         if self.use_mock or not text.strip():
             return [s.strip() + "." for s in text.split(".") if len(s.strip()) > 30][:num_points]
+        check_cancelled(cancel)
 
         try:
             # We only need the first big chunk to extract decent high-level points
-            chunk = text[:TEXT_CHUNK_MAX_CHARS] 
+            chunk = self._chunk_text(text)[0]
             prompt = f"Extract the {num_points} most important key points from the following video transcript. These should be detailed but clear bullet points that represent the core value of the content. Return ONLY a valid JSON array of strings, with no other formatting or markdown.\n\nTranscript: {chunk}"
             
-            if self.use_ollama:
-                resp = httpx.post(self.ollama_url, json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False
-                }, timeout=60.0)
-                raw = resp.json().get("response", "").strip()
-            else:
-                resp = self.client.chat.completions.create(
-                    model=GROQ_SUMMARIZATION_MODEL,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.2
-                )
-                raw = resp.choices[0].message.content.strip()
-            
-            # Clean up potential markdown formatting 
-            if raw.startswith("```json"):
-                raw = raw[7:]
-            if raw.startswith("```"):
-                raw = raw[3:]
-            if raw.endswith("```"):
-                raw = raw[:-3]
-            
-            points = json.loads(raw.strip())
+            raw = self._generate(prompt, timeout=60.0)
+            points = json.loads(_strip_code_fence(raw))
             return points[:num_points]
         except Exception as e:
             logger.warning("Groq Key point extraction failed: %s", e)
@@ -218,7 +391,7 @@ class VideoSummarizer:
     # -------------------------------
     # SEGMENT RANKING (TF-IDF + TextRank)
     # -------------------------------
-    def rank_segments(self, segments: List[Dict]) -> List[Dict]:
+    def rank_segments(self, segments: List[Dict], scores: Optional[List[float]] = None) -> List[Dict]:
         """
         Rank transcript segments by importance using TF-IDF + TextRank.
 
@@ -226,82 +399,181 @@ class VideoSummarizer:
           - TextRank centrality (how similar a segment is to others)
           - Text density (longer, more content-rich segments score higher)
           - Transcription confidence (higher confidence = more trustworthy)
+
+        `scores` may be precomputed with `score_segments` (e.g. in a worker
+        process); otherwise they are computed here.
         """
         if not segments:
             return []
 
-        texts = [seg.get("text", "").strip() for seg in segments]
-
-        # Filter out empty segments
-        valid_indices = [i for i, t in enumerate(texts) if len(t) > 10]
-        if len(valid_indices) < 2:
-            for seg in segments:
-                seg["relevance_score"] = 1.0
-            return segments
-
-        valid_texts = [texts[i] for i in valid_indices]
-
-        try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-            import numpy as np
-
-            # Build TF-IDF matrix
-            vectorizer = TfidfVectorizer(
-                stop_words="english",
-                max_features=500,
-                min_df=1,
-                max_df=0.95,
+        if scores is None:
+            scores = score_segments(
+                [seg.get("text", "") for seg in segments],
+                [seg.get("confidence", 1.0) for seg in segments],
             )
-            tfidf_matrix = vectorizer.fit_transform(valid_texts)
-
-            # TextRank: cosine similarity graph → sum of edge weights
-            sim_matrix = cosine_similarity(tfidf_matrix)
-            np.fill_diagonal(sim_matrix, 0)
-
-            # Iterative TextRank (simplified PageRank)
-            n = len(valid_texts)
-            scores = np.ones(n) / n
-            damping = 0.85
-            for _ in range(10):  # 10 iterations is sufficient for convergence
-                row_sums = sim_matrix.sum(axis=1, keepdims=True)
-                row_sums[row_sums == 0] = 1  # avoid division by zero
-                norm_matrix = sim_matrix / row_sums
-                scores = (1 - damping) / n + damping * norm_matrix.T @ scores
-
-            # Normalize to 0-1
-            if scores.max() > scores.min():
-                scores = (scores - scores.min()) / (scores.max() - scores.min())
-            else:
-                scores = np.ones(n)
-
-            # Apply scores back to original segments
-            for seg in segments:
-                seg["relevance_score"] = 0.1  # default low score for invalid segments
 
-            for idx_in_valid, orig_idx in enumerate(valid_indices):
-                seg = segments[orig_idx]
-                textrank_score = float(scores[idx_in_valid])
+        for seg, score in zip(segments, scores):
+            seg["relevance_score"] = score
+
+        # Sort by relevance (highest first) — stable, so equal weights keep their order
+        return sorted(segments, key=lambda s: s["relevance_score"], reverse=True)
+
+
+def _group_by_size(items: List[Any], max_size: int, size: Callable[[Any], int] = len) -> List[List[Any]]:
+    """
+    Split `items` into runs of consecutive items totalling at most
+    `max_size` (as measured by `size`); an item that fits with neither
+    neighbour is a run of its own.
+    """
+    groups: List[List[Any]] = []
+    current: List[Any] = []
+    total = 0
+    for item in items:
+        item_size = size(item)
+        if current and total + item_size > max_size:
+            groups.append(current)
+            current, total = [], 0
+        current.append(item)
+        total += item_size + 1
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _analysis_size(analysis: ChunkAnalysis) -> int:
+    return count_tokens(analysis.model_dump_json())
+
+
+def _trim_analysis(analysis: ChunkAnalysis, limit: int) -> ChunkAnalysis:
+    """Cut the summary (then drop key points) of `analysis` until it fits `limit` tokens."""
+    trimmed = analysis.model_copy(update={"key_points": list(analysis.key_points)})
+    room = max(limit - (_analysis_size(trimmed) - count_tokens(trimmed.summary)), 1)
+    trimmed.summary = (split_to_budget(trimmed.summary, room, count=count_tokens) or [""])[0]
+    while trimmed.key_points and _analysis_size(trimmed) > limit:
+        trimmed.key_points.pop()
+    return trimmed
+
+
+def _strip_code_fence(raw: str) -> str:
+    """Remove a markdown code fence the model may wrap JSON in."""
+    raw = raw.strip()
+    if raw.startswith("```json"):
+        raw = raw[7:]
+    if raw.startswith("```"):
+        raw = raw[3:]
+    if raw.endswith("```"):
+        raw = raw[:-3]
+    return raw.strip()
+
+
+def _is_json(raw: str) -> bool:
+    try:
+        json.loads(_strip_code_fence(raw))
+        return True
+    except ValueError:
+        return False
+
+
+def _parse_analysis(raw: str) -> ChunkAnalysis:
+    """Validate a combined-analysis answer (ValueError if it does not fit the schema)."""
+    try:
+        return ChunkAnalysis.model_validate_json(_strip_code_fence(raw))
+    except ValidationError as e:
+        raise ValueError(f"{e.error_count()} schema error(s): {e.errors()[0]['msg']}") from e
+
+
+def prune_to_budget(texts: List[str], scores: List[float], budget: int,
+                    count: Optional[Callable[[str], int]] = None) -> List[int]:
+    """
+    Extractive pre-compression: indices of the highest-scoring texts whose
+    tokens fit `budget`, in their original (chronological) order.  Lets a
+    multi-hour transcript reach the LLM as its most central segments
+    instead of every word.
+    """
+    count = count or count_tokens
+    keep: List[int] = []
+    used = 0
+    for i in sorted(range(len(texts)), key=lambda i: -scores[i]):
+        size = count(texts[i]) + 1
+        if used + size <= budget:
+            keep.append(i)
+            used += size
+    return sorted(keep)
+
+
+def score_segments(texts: List[str], confidences: List[float]) -> List[float]:
+    """
+    Relevance score for each segment text (TF-IDF + TextRank).
+
+    Module-level and argument-light so it can run in the CPU process pool
+    (see app/core/cpu_pool.py) without shipping whole segment dicts.
+    """
+    with RANK_SECONDS.time():
+        return _score_segments(texts, confidences)
+
+
+def _score_segments(texts: List[str], confidences: List[float]) -> List[float]:
+    texts = [t.strip() for t in texts]
+
+    # Filter out empty segments
+    valid_indices = [i for i, t in enumerate(texts) if len(t) > 10]
+    if len(valid_indices) < 2:
+        return [1.0] * len(texts)
+
+    valid_texts = [texts[i] for i in valid_indices]
+
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        import numpy as np
+
+        # Build TF-IDF matrix
+        vectorizer = TfidfVectorizer(
+            stop_words="english",
+            max_features=500,
+            min_df=1,
+            max_df=0.95,
+        )
+        tfidf_matrix = vectorizer.fit_transform(valid_texts)
+
+        # TextRank: cosine similarity graph → sum of edge weights
+        sim_matrix = cosine_similarity(tfidf_matrix)
+        np.fill_diagonal(sim_matrix, 0)
+
+        # Iterative TextRank (simplified PageRank)
+        n = len(valid_texts)
+        scores = np.ones(n) / n
+        damping = 0.85
+        for _ in range(10):  # 10 iterations is sufficient for convergence
+            row_sums = sim_matrix.sum(axis=1, keepdims=True)
+            row_sums[row_sums == 0] = 1  # avoid division by zero
+            norm_matrix = sim_matrix / row_sums
+            scores = (1 - damping) / n + damping * norm_matrix.T @ scores
+
+        # Normalize to 0-1
+        if scores.max() > scores.min():
+            scores = (scores - scores.min()) / (scores.max() - scores.min())
+        else:
+            scores = np.ones(n)
 
-                # Text density bonus (longer segments likely contain more info)
-                text_len = len(seg.get("text", ""))
-                density_bonus = min(text_len / 200.0, 1.0)  # cap at 1.0
+        relevance = [0.1] * len(texts)  # default low score for invalid segments
+        for idx_in_valid, orig_idx in enumerate(valid_indices):
+            textrank_score = float(scores[idx_in_valid])
 
-                # Confidence bonus from transcription
-                confidence = seg.get("confidence", 1.0)
+            # Text density bonus (longer segments likely contain more info)
+            density_bonus = min(len(texts[orig_idx]) / 200.0, 1.0)  # cap at 1.0
 
-                # Weighted combination
-                seg["relevance_score"] = (
-                    0.60 * textrank_score +
-                    0.25 * density_bonus +
-                    0.15 * confidence
-                )
+            # Confidence bonus from transcription
+            confidence = confidences[orig_idx]
 
-            # Sort by relevance (highest first)
-            return sorted(segments, key=lambda s: s["relevance_score"], reverse=True)
+            # Weighted combination
+            relevance[orig_idx] = (
+                0.60 * textrank_score +
+                0.25 * density_bonus +
+                0.15 * confidence
+            )
+        return relevance
 
-        except Exception as e:
-            logger.warning("TF-IDF ranking failed, falling back to equal weight: %s", e)
-            for seg in segments:
-                seg["relevance_score"] = 1.0
-            return segments
\ No newline at end of file
+    except Exception as e:
+        logger.warning("TF-IDF ranking failed, falling back to equal weight: %s", e)
+        return [1.0] * len(texts)
\ No newline at end of file
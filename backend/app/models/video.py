@@ -19,6 +19,7 @@ class VideoCreate(BaseModel):
     original_name: str
     file_path: str
     file_size: int
+    content_hash: Optional[str] = None           # SHA-256 of the uploaded bytes
     duration: Optional[float] = 0
     width: Optional[int] = 0
     height: Optional[int] = 0
@@ -16,6 +16,9 @@ from typing import Dict, List, Optional, Tuple
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from app.core.cancellation import TaskCancelled, cancel_flag_set
+from app.core.metrics import ENCODED_BYTES, RENDER_SECONDS
+
 try:
     # MoviePy 2.x
     from moviepy import (
@@ -426,14 +429,18 @@ class VideoProcessor:
         num_key_frames: int = 0,
         segments: Optional[List[Dict]] = None,
         all_segments: Optional[List[Dict]] = None,
+        cancel_flag: Optional[str] = None,
     ) -> str:
         """
         Create a summary video that is ~55-60% of the original video's duration.
 
         Uses actual video clips from the source (preserving original audio),
-        stitched together with a title slide and closing slide.
+        stitched together with a title slide and closing slide.  Encoding
+        stops with TaskCancelled once the file `cancel_flag` appears.
         """
         logger.info("Creating summary video for %s", video_path)
+        if cancel_flag_set(cancel_flag):
+            raise TaskCancelled("Render cancelled before it started")
 
         # 1. Load source
         source = VideoFileClip(video_path)
@@ -527,7 +534,7 @@ class VideoProcessor:
             "preset": "ultrafast",
             "threads": 4,
             "bitrate": "1800k",
-            "logger": None,
+            "logger": _cancel_logger(cancel_flag) if cancel_flag else None,
             "ffmpeg_params": ["-pix_fmt", "yuv420p", "-crf", "26"],
         }
         if has_audio:
@@ -537,6 +544,10 @@ class VideoProcessor:
 
         try:
             self._write_video(final, output_path, **write_kwargs)
+        except TaskCancelled:
+            final.close()
+            source.close()
+            raise
         except Exception as write_err:
             logger.error("write_videofile failed: %s — retrying without audio", write_err)
             write_kwargs["audio"] = False
@@ -566,6 +577,8 @@ class VideoProcessor:
 
         # MoviePy 2.x uses write_videofile the same way as 1.x
         clip.write_videofile(output_path, **defaults)
+        if os.path.exists(output_path):
+            ENCODED_BYTES.labels(kind="summary_video").inc(os.path.getsize(output_path))
 
     # ------------------------------------------------------------------
     # Utility
@@ -604,6 +617,58 @@ class VideoProcessor:
         return chunks or [text[:max_chars_per_slide]]
 
 
+def _cancel_logger(flag_path: str):
+    """proglog logger for write_videofile that aborts once `flag_path` exists."""
+    import proglog
+
+    class _CancelOnFlag(proglog.ProgressBarLogger):
+        def __init__(self):
+            super().__init__()
+            self._updates = 0
+
+        def bars_callback(self, bar, attr, value, old_value=None):
+            self._updates += 1
+            if self._updates % FPS == 0 and cancel_flag_set(flag_path):
+                raise TaskCancelled("Render cancelled")
+
+    return _CancelOnFlag()
+
+
+# ---------------------------------------------------------------------------
+# Process-pool entry point
+# ---------------------------------------------------------------------------
+Span = Tuple[float, float]
+
+
+def render_visual_summary(
+    video_path: str,
+    text_summary: str,
+    key_points: List[str],
+    output_path: str,
+    video_title: str,
+    ranked_spans: List[Span],
+    all_spans: List[Span],
+    cancel_flag: Optional[str] = None,
+) -> str:
+    """
+    Picklable wrapper around VideoProcessor.create_visual_summary for the CPU
+    pool (app/core/cpu_pool.py).  Segments travel as (start, end) tuples in
+    importance order — the renderer only needs their timing.  `cancel_flag`
+    is the job's CancelToken.flag_path.
+    """
+    with RENDER_SECONDS.time():
+        return VideoProcessor().create_visual_summary(
+            video_path,
+            text_summary,
+            key_points,
+            output_path,
+            video_title,
+            segments=[{"start": s, "end": e} for s, e in ranked_spans],
+            all_segments=[{"start": s, "end": e} for s, e in all_spans],
+            cancel_flag=cancel_flag,
+        )
+
+
 # Test
 if __name__ == "__main__":
     processor = VideoProcessor()
@@ -1,51 +1,135 @@
 """
 whisper_model.py — Groq API transcription with chunked audio processing
 to reduce peak memory usage and fit within Groq API constraints.
+
+With TRANSCRIBE_ENGINE=local, chunks are transcribed on the CPU by
+faster-whisper (CTranslate2, int8 by default) instead, with word timestamps
+and batched decoding; the model is loaded once per process.
 """
+import itertools
 import logging
+import math
 import os
 import tempfile
-from typing import Dict, List
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import soundfile as sf
 
-from app.core.constants import WHISPER_MODEL_NAME, AUDIO_CHUNK_SECONDS
+from app.core.cancellation import CancelToken, check_cancelled
+from app.core.constants import (
+    AUDIO_CHUNK_HEADROOM,
+    GROQ_MAX_UPLOAD_BYTES,
+    LOCAL_AUDIO_CHUNK_SECONDS,
+    WHISPER_MODEL_NAME,
+)
+from app.core.fingerprint import audio_fingerprint
+from app.core.metrics import AUDIO_EXTRACT_SECONDS, ENCODED_BYTES, TRANSCRIBE_CHUNK_SECONDS
+from app.core.llm_client import get_groq_client, groq_available
+from app.core.rate_limiter import get_scheduler
+from app.core.vad import TimelineMap, frame_levels, quietest_cut, speech_regions
+from app.models.segments import SegmentTable
+
+if TYPE_CHECKING:
+    from app.core.transcript_cache import BlockingTranscriptCache
 
 logger = logging.getLogger(__name__)
 
 try:
-    from groq import Groq
-    _HAS_GROQ = True
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+    _HAS_FASTER_WHISPER = True
 except ImportError:
-    _HAS_GROQ = False
-    logger.warning("groq not installed; WhisperTranscriber unavailable")
+    _HAS_FASTER_WHISPER = False
+
+# Upload encodings: soundfile format, subtype, file suffix (Groq infers the
+# codec from the name) and an upper-bound guess of bytes per second of
+# 16-bit PCM input, used to size the first chunk before any is measured.
+CHUNK_FORMATS = {
+    "flac": ("FLAC", "PCM_16", ".flac", 1.0),  # never much larger than raw PCM
+    "opus": ("OGG",  "OPUS",   ".ogg",  0.25),  # ~30 kbit/s VBR at 16 kHz mono
+    "wav":  ("WAV",  "PCM_16", ".wav",  1.0),
+}
+
+# Local models are loaded once per process and shared by every transcriber
+_local_models: Dict[Tuple[str, str, int], "BatchedInferencePipeline"] = {}
+_local_models_lock = threading.Lock()
+
+
+def _load_local_model(model_size: str, compute_type: str, cpu_threads: int) -> "BatchedInferencePipeline":
+    """faster-whisper model on CPU, wrapped for batched decoding; cached per process."""
+    key = (model_size, compute_type, cpu_threads)
+    with _local_models_lock:
+        if key not in _local_models:
+            logger.info("Loading local Whisper model %s (%s)", model_size, compute_type)
+            model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+            _local_models[key] = BatchedInferencePipeline(model=model)
+        return _local_models[key]
 
 
 class WhisperTranscriber:
-    def __init__(self, model_size: str = WHISPER_MODEL_NAME, chunk_seconds: int = AUDIO_CHUNK_SECONDS):
+    def __init__(
+        self,
+        model_size: str = WHISPER_MODEL_NAME,
+        chunk_seconds: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        chunk_format: Optional[str] = None,
+        max_upload_bytes: int = GROQ_MAX_UPLOAD_BYTES,
+        vad: Optional[bool] = None,
+    ):
         """
         Args:
-            model_size:    Ignored locally, maps directly to Groq's whisper-large-v3
-            chunk_seconds: audio chunk length in seconds (Groq max is ~25mb)
+            model_size:       local engine model (tiny … large-v3); Groq always
+                              uses whisper-large-v3
+            chunk_seconds:    optional cap on chunk length; by default chunks are
+                              sized only by `max_upload_bytes`
+            concurrency:      chunks transcribed at once (default TRANSCRIBE_CONCURRENCY)
+            chunk_format:     flac, opus or wav (default TRANSCRIBE_CHUNK_FORMAT)
+            max_upload_bytes: largest file the API accepts (Groq: 25 MB)
+            vad:              drop long silences before upload (default TRANSCRIBE_VAD)
         """
         self.chunk_seconds = chunk_seconds
-        
+        self.max_upload_bytes = max_upload_bytes
+        self.model_size = model_size.removeprefix("whisper-")
+
         from app.core.config import settings
+        self.concurrency = max(1, concurrency or settings.TRANSCRIBE_CONCURRENCY)
+        self.vad = settings.TRANSCRIBE_VAD if vad is None else vad
+        self.chunk_format = (chunk_format or settings.TRANSCRIBE_CHUNK_FORMAT).lower()
+        if self.chunk_format not in CHUNK_FORMATS:
+            raise ValueError(f"Unknown chunk format: {self.chunk_format}")
+        self.batch_size = settings.LOCAL_WHISPER_BATCH_SIZE
         self.api_key = settings.GROQ_API_KEY
         self.client = None
-        self.use_mock = not _HAS_GROQ or not self.api_key
+        self.local_model = None
+
+        if settings.TRANSCRIBE_ENGINE == "local":
+            if _HAS_FASTER_WHISPER:
+                try:
+                    self.local_model = _load_local_model(
+                        self.model_size, settings.LOCAL_WHISPER_COMPUTE_TYPE, settings.LOCAL_WHISPER_CPU_THREADS
+                    )
+                except Exception as e:
+                    logger.warning("Error loading local Whisper model: %s", e)
+            else:
+                logger.warning("faster-whisper not installed; local transcription unavailable")
+
+        if self.local_model is not None:
+            # No upload to size for: send uncompressed audio, chunked for progress
+            self.use_mock = False
+            self.chunk_format = "wav"
+            self.chunk_seconds = chunk_seconds or LOCAL_AUDIO_CHUNK_SECONDS
+            logger.info("Local Whisper Transcriber loaded (%s)", model_size)
+            return
+
+        self.use_mock = not groq_available() or not self.api_key
         
         if not self.use_mock:
             try:
-                import httpx
-                _disable_ssl = os.environ.get("DISABLE_SSL_VERIFY", "").lower() == "true"
-                http_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
-                http_client = httpx.Client(
-                    proxy=http_proxy,
-                    verify=not _disable_ssl,
-                )
-                self.client = Groq(api_key=self.api_key, http_client=http_client)
+                # Pooled client shared with the other model wrappers (see llm_client.py)
+                self.client = get_groq_client()
                 logger.info("Groq Whisper Transcriber loaded")
             except Exception as e:
                 logger.warning("Error initializing Groq Whisper: %s", e)
@@ -53,24 +137,43 @@ class WhisperTranscriber:
         else:
             logger.warning("GROQ_API_KEY missing or groq not installed. Falling back to mock transcription.")
 
+    @property
+    def model_id(self) -> str:
+        """Identifies the model behind `transcribe`; cached transcripts are per model."""
+        if self.local_model is not None:
+            return f"local:{self.model_size}"
+        return f"groq:{WHISPER_MODEL_NAME}"
+
+    @property
+    def engine(self) -> str:
+        """Which backend `transcribe` uses: mock, local or groq."""
+        if self.use_mock:
+            return "mock"
+        return "local" if self.local_model is not None else "groq"
 
     # ------------------------------------------------------------------
     def transcribe(self, audio_path: str) -> Dict:
-        """Transcribe a single audio file via Groq."""
+        """Transcribe a single audio file via Groq or the local model."""
         if self.use_mock:
             return {
                 "text": "This is a mock transcription because Groq wasn't configured.",
                 "segments": [{"text": "Mock.", "start": 0, "end": 2, "words": []}],
                 "duration": 2
             }
+        if self.local_model is not None:
+            return self._transcribe_local(audio_path)
             
         try:
             with open(audio_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
-                    file=(os.path.basename(audio_path), audio_file.read()),
-                    model=WHISPER_MODEL_NAME,
-                    response_format="verbose_json",
-                )
+                data = audio_file.read()
+            # Budgeted in audio seconds against the provider's audio limit
+            transcription = get_scheduler("groq-stt").create(
+                self.client.audio.transcriptions,
+                tokens=sf.info(audio_path).duration,
+                file=(os.path.basename(audio_path), data),
+                model=WHISPER_MODEL_NAME,
+                response_format="verbose_json",
+            )
             
             # Groq 'verbose_json' sometimes returns a dict vs object depending on sdk ver
             segments_raw = getattr(transcription, "segments", [])
@@ -86,7 +189,15 @@ class WhisperTranscriber:
                         "start": getattr(seg, "start", 0),
                         "end": getattr(seg, "end", 0),
                         "text": getattr(seg, "text", ""),
-                        "words": getattr(seg, "words", []) or []
+                        "words": [
+                            w if isinstance(w, dict) else {
+                                "word": getattr(w, "word", ""),
+                                "start": getattr(w, "start", 0),
+                                "end": getattr(w, "end", 0),
+                                "probability": getattr(w, "probability", 0.99),
+                            }
+                            for w in (getattr(seg, "words", []) or [])
+                        ],
                     })
                     
             text = getattr(transcription, "text", "")
@@ -104,68 +215,274 @@ class WhisperTranscriber:
         except Exception as e:
             raise RuntimeError(f"Groq Transcription failed: {e}") from e
 
+    def _transcribe_local(self, audio_path: str) -> Dict:
+        """Transcribe with faster-whisper, decoding `batch_size` 30 s windows at a time."""
+        try:
+            segments_iter, info = self.local_model.transcribe(
+                audio_path,
+                batch_size=self.batch_size,
+                word_timestamps=True,
+            )
+            segments = []
+            for seg in segments_iter:
+                segments.append({
+                    "start": seg.start,
+                    "end": seg.end,
+                    "text": seg.text,
+                    "words": [
+                        {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                        for w in (seg.words or [])
+                    ],
+                })
+        except Exception as e:
+            raise RuntimeError(f"Local transcription failed: {e}") from e
+
+        return {
+            "text": "".join(seg["text"] for seg in segments).strip(),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration,
+        }
+
     # ------------------------------------------------------------------
-    def _extract_audio(self, video_path: str) -> str:
+    def _extract_audio(self, video_path: str, cancel: Optional[CancelToken] = None) -> str:
         """Extract audio to a temporary WAV file using fast ffmpeg. Caller must delete it."""
         from app.core.audio import extract_audio_fast
         tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
         audio_path = tmp.name
         tmp.close()
-        return extract_audio_fast(video_path, audio_path)
+        try:
+            with AUDIO_EXTRACT_SECONDS.time():
+                return extract_audio_fast(video_path, audio_path, cancel=cancel)
+        except BaseException:
+            if os.path.exists(audio_path):
+                os.unlink(audio_path)
+            raise
 
     # ------------------------------------------------------------------
-    def _chunk_audio(self, audio_path: str) -> List[str]:
+    def _encode_chunk(self, block: np.ndarray, samplerate: int) -> Tuple[str, int]:
+        """Write one chunk in the upload format; returns (temp path, size in bytes)."""
+        fmt, subtype, suffix, _ = CHUNK_FORMATS[self.chunk_format]
+        tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        tmp.close()
+        try:
+            sf.write(tmp.name, block, samplerate, format=fmt, subtype=subtype)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+        return tmp.name, os.path.getsize(tmp.name)
+
+    def _chunk_frames(self, bytes_per_second: float, samplerate: int) -> int:
+        """Frames that should encode to just under the upload limit."""
+        seconds = self.max_upload_bytes * AUDIO_CHUNK_HEADROOM / bytes_per_second
+        if self.chunk_seconds:
+            seconds = min(seconds, self.chunk_seconds)
+        return max(samplerate, int(seconds * samplerate))
+
+    def _speech_regions(self, audio_path: str, total_samples: int, samplerate: int) -> Tuple[List[Tuple[int, int]], Optional[np.ndarray], int]:
+        """Sample ranges worth transcribing, plus frame levels for cutting inside them."""
+        if self.vad:
+            levels, frame_len = frame_levels(audio_path)
+            regions = speech_regions(levels, frame_len, total_samples, samplerate)
+            if regions:
+                kept = sum(end - start for start, end in regions)
+                logger.info("VAD: sending %.0f of %.0f s of audio in %d speech regions",
+                            kept / samplerate, total_samples / samplerate, len(regions))
+                return regions, levels, frame_len
+            logger.info("VAD found no speech; sending all audio")
+        return [(0, total_samples)], None, 1
+
+    @staticmethod
+    def _next_pieces(
+        regions: List[Tuple[int, int]],
+        position: Tuple[int, int],
+        frames: int,
+        levels: Optional[np.ndarray],
+        frame_len: int,
+    ) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+        """
+        Take up to `frames` samples of speech starting at `position` (region
+        index, sample).  Whole regions are preferred, so cuts fall in the
+        dropped pauses between them; a region longer than `frames` is cut at
+        its quietest frame in the last quarter of the budget.  Returns the
+        (start, end) pieces and the position after them.
+        """
+        i, cursor = position
+        pieces: List[Tuple[int, int]] = []
+        budget = frames
+        while i < len(regions) and budget > 0:
+            start, end = max(regions[i][0], cursor), regions[i][1]
+            if end - start <= budget:
+                pieces.append((start, end))
+                budget -= end - start
+                i, cursor = i + 1, end
+                continue
+            if not pieces:
+                cut = start + budget
+                if levels is not None:
+                    cut = quietest_cut(levels, frame_len, start + budget * 3 // 4, cut)
+                pieces.append((start, cut))
+                cursor = cut
+            break
+        return pieces, (i, cursor)
+
+    def _iter_chunks(self, audio_path: str, created: List[str]) -> Iterator[Tuple[str, TimelineMap, int]]:
         """
-        Split an audio file into fixed-length chunks to limit API size caps.
-        Returns a list of temporary WAV file paths.
+        Split an audio file into chunks that each fit the API's upload limit.
+        Yields (temporary chunk path, TimelineMap back to the original audio,
+        estimated total chunk count); offsets come from sample positions, not
+        from transcripts.
+
+        With VAD on, only speech regions are sent: long pauses are left out
+        and chunk boundaries fall in them (see app/core/vad.py).
+
+        Chunks are encoded in `self.chunk_format`.  The first is sized from a
+        conservative bytes-per-second guess and each later one from the rate
+        measured on the chunk before it; a chunk that still comes out too big
+        is cut again, shorter.  The file is read one chunk at a time as int16
+        (the extracted WAV is 16-bit PCM), so memory stays at one chunk
+        whatever the video length.  Chunk paths are appended to `created`
+        for the caller to delete.
         """
         try:
-            data, samplerate = sf.read(audio_path)
+            f = sf.SoundFile(audio_path)
         except Exception:
-            return [audio_path]
+            yield audio_path, TimelineMap.shifted(0.0), 1
+            return
+
+        with f:
+            samplerate = f.samplerate
+            regions, levels, frame_len = self._speech_regions(audio_path, f.frames, samplerate)
+            remaining = sum(end - start for start, end in regions)
+            guess = CHUNK_FORMATS[self.chunk_format][3]
+            bytes_per_second = 2 * f.channels * samplerate * guess
+            position, index = (0, 0), 0
+            while remaining > 0:
+                frames = self._chunk_frames(bytes_per_second, samplerate)
+                pieces, next_position = self._next_pieces(regions, position, frames, levels, frame_len)
+                parts, timeline, length = [], [], 0
+                for start, end in pieces:
+                    f.seek(start)
+                    parts.append(f.read(end - start, dtype="int16"))
+                    timeline.append((length / samplerate, start / samplerate))
+                    length += end - start
+                block = np.concatenate(parts)
+                path, size = self._encode_chunk(block, samplerate)
+                bytes_per_second = size / (length / samplerate)
 
-        chunk_samples = self.chunk_seconds * samplerate
-        total_samples = len(data)
-        chunk_paths = []
+                if size > self.max_upload_bytes and length > samplerate:
+                    logger.info("Audio chunk of %d bytes exceeds the upload limit; re-cutting", size)
+                    os.unlink(path)
+                    continue
 
-        for start in range(0, total_samples, chunk_samples):
-            chunk = data[start : start + chunk_samples]
-            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            tmp.close()
-            sf.write(tmp.name, chunk, samplerate)
-            chunk_paths.append(tmp.name)
+                created.append(path)
+                ENCODED_BYTES.labels(kind="audio_chunk").inc(size)
+                remaining -= length
+                position, index = next_position, index + 1
+                estimate = index + math.ceil(remaining / self._chunk_frames(bytes_per_second, samplerate))
+                yield path, TimelineMap(timeline), estimate
 
-        return chunk_paths if chunk_paths else [audio_path]
+        if index == 0:
+            yield audio_path, TimelineMap.shifted(0.0), 1
+
+    def _transcribe_chunk(self, chunk_path: str, timeline: TimelineMap, cancel: Optional[CancelToken]) -> Dict:
+        """Transcribe one chunk and map its timestamps onto the video timeline."""
+        check_cancelled(cancel)
+        with TRANSCRIBE_CHUNK_SECONDS.labels(engine=self.engine).time():
+            result = self.transcribe(chunk_path)
+
+        segments = []
+        for seg in result["segments"]:
+            seg_copy = dict(seg)
+            seg_copy["start"] = timeline.to_original(seg["start"])
+            seg_copy["end"]   = timeline.to_original(seg["end"])
+            if seg.get("words"):
+                seg_copy["words"] = [
+                    {**w, "start": timeline.to_original(w["start"]), "end": timeline.to_original(w["end"])}
+                    if isinstance(w, dict) and "start" in w else w
+                    for w in seg["words"]
+                ]
+            segments.append(seg_copy)
+        return {"text": result["text"], "segments": segments}
 
     # ------------------------------------------------------------------
-    def transcribe_file(self, video_path: str) -> Dict:
-        """Extract audio from video, chunk it, transcribe each chunk, merge results."""
-        audio_path = self._extract_audio(video_path)
-        chunk_paths = self._chunk_audio(audio_path)
+    def iter_transcribe_file(
+        self,
+        video_path: str,
+        cancel: Optional[CancelToken] = None,
+        cache: Optional["BlockingTranscriptCache"] = None,
+    ) -> Iterator[Dict]:
+        """
+        Extract audio, chunk it and yield one result per chunk, in order, as
+        soon as that chunk is transcribed, with timestamps already offset
+        onto the video's timeline.  Up to `self.concurrency` chunks are sent
+        to the API at once, so callers can start work on early chunks while
+        later ones are still in flight.
 
-        all_text = []
-        all_segments = []
-        total_offset = 0.0
+        With a `cache`, the extracted audio is fingerprinted first; a cached
+        transcript of the same recording is yielded as a single chunk and
+        nothing is transcribed, otherwise the finished transcript is stored.
+
+        `cancel` is checked before every chunk; the temp WAV files are
+        removed however the iteration ends.
+        """
+        audio_path = self._extract_audio(video_path, cancel)
+        created: List[str] = []
+        # Chunks are cut lazily, only as the in-flight window has room
+        next_chunk = self._iter_chunks(audio_path, created)
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="transcribe")
 
         try:
-            for chunk_path in chunk_paths:
-                result = self.transcribe(chunk_path)
-                all_text.append(result["text"])
-
-                for seg in result["segments"]:
-                    seg_copy = dict(seg)
-                    seg_copy["start"] += total_offset
-                    seg_copy["end"]   += total_offset
-                    all_segments.append(seg_copy)
-
-                if result["segments"]:
-                    total_offset = all_segments[-1]["end"]
+            fingerprint = None
+            if cache is not None and not self.use_mock:
+                fingerprint = audio_fingerprint(audio_path)
+                cached = cache.get(fingerprint)
+                if cached is not None:
+                    logger.info("Transcript cache hit for %s", os.path.basename(video_path))
+                    yield {"index": 0, "total": 1, "text": cached["text"], "segments": cached["segments"]}
+                    return
+
+            all_text: List[str] = []
+            all_segments: List[Dict] = []
+            pending: Deque[Future] = deque()
+            total = index = 0
+            while True:
+                for chunk_path, timeline, total in itertools.islice(next_chunk, self.concurrency - len(pending)):
+                    pending.append(pool.submit(self._transcribe_chunk, chunk_path, timeline, cancel))
+                if not pending:
+                    break
+
+                result = pending.popleft().result()
+                check_cancelled(cancel)
+                if fingerprint is not None:
+                    all_text.append(result["text"])
+                    all_segments.extend(result["segments"])
+                yield {
+                    "index":    index,
+                    "total":    max(total, index + 1),
+                    "text":     result["text"],
+                    "segments": result["segments"],
+                }
+                index += 1
+
+            if fingerprint is not None:
+                cache.put(fingerprint, {"text": " ".join(all_text), "segments": all_segments})
         finally:
-            for p in chunk_paths:
-                if p != audio_path and os.path.exists(p):
+            pool.shutdown(wait=True, cancel_futures=True)
+            next_chunk.close()
+            for p in created + [audio_path]:
+                if os.path.exists(p):
                     os.unlink(p)
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
+
+    # ------------------------------------------------------------------
+    def transcribe_file(self, video_path: str) -> Dict:
+        """Extract audio from video, chunk it, transcribe each chunk, merge results."""
+        all_text = []
+        all_segments = []
+
+        for chunk in self.iter_transcribe_file(video_path):
+            all_text.append(chunk["text"])
+            all_segments.extend(chunk["segments"])
 
         return {
             "text":     " ".join(all_text),
@@ -175,11 +492,11 @@ class WhisperTranscriber:
         }
 
     # ------------------------------------------------------------------
-    def get_segments(self, video_path: str) -> List[Dict]:
-        """High-level: transcribe a video and return enriched segment list."""
-        result = self.transcribe_file(video_path)
+    @staticmethod
+    def _enrich_segments(raw_segments: List[Dict]) -> List[Dict]:
+        """Reduce raw transcription segments to start/end/text/confidence."""
         segments = []
-        for seg in result["segments"]:
+        for seg in raw_segments:
             words = seg.get("words", [])
             confidence = 0.99
             if words:
@@ -194,3 +511,50 @@ class WhisperTranscriber:
                 "confidence": confidence,
             })
         return segments
+
+    @staticmethod
+    def _segment_table(raw_segments: List[Dict]) -> SegmentTable:
+        """Raw transcription segments as a SegmentTable, keeping word timings."""
+        words = [
+            [w for w in seg.get("words") or [] if isinstance(w, dict) and "start" in w]
+            for seg in raw_segments
+        ]
+        table = SegmentTable(
+            start=np.array([float(seg.get("start", 0)) for seg in raw_segments]),
+            end=np.array([float(seg.get("end", 0)) for seg in raw_segments]),
+            texts=[seg.get("text", "") for seg in raw_segments],
+            words=words,
+        )
+        if table.has_words:
+            # Confidence = mean word probability, for segments that have words
+            counts = np.diff(table.word_offsets)
+            rows = np.repeat(np.arange(len(table)), counts)
+            sums = np.bincount(rows, weights=table.word_probability, minlength=len(table))
+            has_words = counts > 0
+            table.confidence[has_words] = sums[has_words] / counts[has_words]
+        return table
+
+    def iter_segment_tables(
+        self,
+        video_path: str,
+        cancel: Optional[CancelToken] = None,
+        cache: Optional["BlockingTranscriptCache"] = None,
+    ) -> Iterator[SegmentTable]:
+        """Streaming transcription: yield a SegmentTable per audio chunk."""
+        for chunk in self.iter_transcribe_file(video_path, cancel, cache):
+            yield self._segment_table(chunk["segments"])
+
+    def iter_segments(
+        self,
+        video_path: str,
+        cancel: Optional[CancelToken] = None,
+        cache: Optional["BlockingTranscriptCache"] = None,
+    ) -> Iterator[List[Dict]]:
+        """Streaming `get_segments`: yield the enriched segments of each audio chunk."""
+        for chunk in self.iter_transcribe_file(video_path, cancel, cache):
+            yield self._enrich_segments(chunk["segments"])
+
+    def get_segments(self, video_path: str) -> List[Dict]:
+        """High-level: transcribe a video and return enriched segment list."""
+        result = self.transcribe_file(video_path)
+        return self._enrich_segments(result["segments"])
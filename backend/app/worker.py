@@ -0,0 +1,232 @@
+"""
+worker.py — Summarization worker process.
+
+Pulls queued jobs from the `tasks` collection (see core/task_store.py) and
+runs the summarization pipeline outside the API process.  Start one or more
+workers next to the API server:
+
+    python -m app.worker
+
+Each worker loads the ML models once, runs up to WORKER_MAX_JOBS jobs at a
+time and renews the lease on every job it holds.  At most
+WORKER_MAX_BATCH_JOBS of those come from batches, so interactive jobs
+always find a free slot.  Jobs left behind by a crashed worker are
+re-queued once their lease expires; a worker that finds it lost a lease
+stops that job, since another worker may have claimed it.  Cancellation
+requests (DELETE /api/summarize/status/{id}) are picked up on every poll
+and stop the job cooperatively (see core/cancellation.py).  Pipeline metrics
+recorded by the worker are served on WORKER_METRICS_PORT (Prometheus text
+format; 0 disables it).
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, Optional, Set
+
+from .core.cancellation import CancelToken
+from .core.config import settings
+from .core.constants import PRIORITY_INTERACTIVE
+from .core.cpu_pool import shutdown_cpu_pool, start_cpu_pool
+from .core.database import database
+from .core.llm_client import close_clients
+from .core.metrics import JOBS_TOTAL, start_metrics_server
+from .core.task_store import (
+    cancel_requested_ids,
+    claim_next_task,
+    get_task,
+    mark_failed,
+    renew_lease,
+    requeue_expired_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.whisper = None
+        self.summarizer = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_tokens: Dict[str, CancelToken] = {}
+        self._batch_jobs: Set[str] = set()
+        self._stop = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    def load_models(self):
+        """Load the ML models once per worker process."""
+        from .models.whisper_model import WhisperTranscriber
+        from .models.summarizer import VideoSummarizer
+
+        self.whisper = WhisperTranscriber(model_size=settings.WHISPER_MODEL)
+        self.summarizer = VideoSummarizer()
+        # Ranking/rendering processes import NumPy, scikit-learn and MoviePy up front
+        start_cpu_pool()
+        logger.info("Worker %s: models loaded", self.worker_id)
+
+    def stop(self):
+        logger.info("Worker %s: shutdown requested, finishing running jobs", self.worker_id)
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    async def _keep_lease(self, task_id: str):
+        """Renew the job lease until the job finishes; stop the job if the lease is lost."""
+        interval = max(1.0, settings.TASK_LEASE_SECONDS / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not await renew_lease(task_id, self.worker_id, settings.TASK_LEASE_SECONDS):
+                logger.warning("Worker %s: lost lease on task %s, stopping it", self.worker_id, task_id)
+                self._abandon(task_id)
+                return
+
+    def _abandon(self, task_id: str):
+        """
+        Stop a job this worker no longer holds the lease on.  The task was
+        re-queued and may already run elsewhere, so the job must not write
+        checkpoints or a final status: its asyncio task is cancelled (the
+        pipeline only records TaskCancelled and errors) and its token stops
+        the transcription threads, ffmpeg and pool renders it started.
+        """
+        token = self._cancel_tokens.get(task_id)
+        if token is not None:
+            token.cancel()
+        job = self._running.get(task_id)
+        if job is not None:
+            job.cancel()
+
+    async def _run_job(self, task: Dict):
+        from .api.summarize import _run_summarize_pipeline
+
+        task_id = task["task_id"]
+        payload = task.get("payload") or {}
+        cancel = self._cancel_tokens[task_id] = CancelToken(task_id)
+        lease = asyncio.create_task(self._keep_lease(task_id))
+        outcome = None
+        try:
+            logger.info("Worker %s: running task %s (attempt %d)", self.worker_id, task_id, task.get("attempts", 1))
+            await _run_summarize_pipeline(
+                task_id,
+                payload["video_path"],
+                payload.get("summary_ratio"),
+                payload.get("max_summary_length"),
+                task["user_id"],
+                self.whisper,
+                self.summarizer,
+                content_hash=payload.get("content_hash"),
+                cancel=cancel,
+                priority=task.get("priority", PRIORITY_INTERACTIVE),
+            )
+        except asyncio.CancelledError:
+            outcome = "abandoned"
+            raise
+        except Exception as e:
+            # The pipeline records its own failures; this only catches bad payloads
+            logger.exception("Worker %s: task %s crashed: %s", self.worker_id, task_id, e)
+            await mark_failed(task_id, str(e))
+        finally:
+            if outcome is None:
+                final = await get_task(task_id)
+                outcome = (final or {}).get("status", "unknown")
+            JOBS_TOTAL.labels(outcome=outcome).inc()
+            lease.cancel()
+            cancel.cleanup()
+            self._cancel_tokens.pop(task_id, None)
+            self._batch_jobs.discard(task_id)
+            self._running.pop(task_id, None)
+
+    async def _check_cancellations(self):
+        """Fire the cancel token of every running job the user cancelled."""
+        try:
+            cancelled = await cancel_requested_ids(list(self._running))
+        except Exception as e:
+            logger.warning("Worker %s: cancellation check failed: %s", self.worker_id, e)
+            return
+        for task_id in cancelled:
+            token = self._cancel_tokens.get(task_id)
+            if token is not None and not token.cancelled:
+                logger.info("Worker %s: cancelling task %s", self.worker_id, task_id)
+                token.cancel()
+
+    def _claim_limit(self) -> Optional[int]:
+        """Highest task priority this worker may claim right now (None = any)."""
+        if len(self._batch_jobs) >= settings.WORKER_MAX_BATCH_JOBS:
+            return PRIORITY_INTERACTIVE  # keep the remaining slots for interactive jobs
+        return None
+
+    # ------------------------------------------------------------------
+    async def run(self):
+        logger.info(
+            "Worker %s started (max_jobs=%d, max_batch_jobs=%d, stage limits: transcribe=%d llm=%d render=%d)",
+            self.worker_id, settings.WORKER_MAX_JOBS, settings.WORKER_MAX_BATCH_JOBS,
+            settings.STAGE_CONCURRENCY_TRANSCRIBE, settings.STAGE_CONCURRENCY_LLM,
+            settings.STAGE_CONCURRENCY_RENDER,
+        )
+        while not self._stop.is_set():
+            await requeue_expired_tasks(settings.TASK_MAX_ATTEMPTS)
+            await self._check_cancellations()
+
+            claimed = False
+            while len(self._running) < settings.WORKER_MAX_JOBS:
+                task = await claim_next_task(self.worker_id, settings.TASK_LEASE_SECONDS, self._claim_limit())
+                if task is None:
+                    break
+                claimed = True
+                stale = self._running.get(task["task_id"])
+                if stale is not None:
+                    # Our own lease on it expired and we re-claimed it: stop the old run first
+                    self._abandon(task["task_id"])
+                    await asyncio.gather(stale, return_exceptions=True)
+                if task.get("priority", PRIORITY_INTERACTIVE) > PRIORITY_INTERACTIVE:
+                    self._batch_jobs.add(task["task_id"])
+                self._running[task["task_id"]] = asyncio.create_task(self._run_job(task))
+
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=settings.WORKER_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        logger.info("Worker %s stopped", self.worker_id)
+
+
+async def run_worker():
+    await database.connect()
+    worker = Worker()
+    worker.load_models()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: fall back to KeyboardInterrupt
+
+    metrics_server = await start_metrics_server(settings.WORKER_METRICS_PORT)
+    try:
+        await worker.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        shutdown_cpu_pool()
+        await close_clients()
+        await database.close()
+
+
+def main():
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Offline performance benchmarks for the backend (run from backend/ with `python -m benchmarks.<name>`)."""
@@ -0,0 +1,107 @@
+"""
+bench_chunker.py — Peak memory of audio chunking for long inputs.
+
+Generates a 16 kHz mono WAV of each requested length (the format
+`extract_audio_fast` produces) and, in a fresh process per case, either
+  * "stream" — cuts it with `WhisperTranscriber._iter_chunks`, or
+  * "full"   — loads it whole with `sf.read`, as the chunker used to,
+then reports wall time and peak RSS.  Run from backend/:
+
+    python -m benchmarks.bench_chunker                   # 60 and 180 minutes
+    python -m benchmarks.bench_chunker --minutes 30 --modes stream
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.bench_pipeline import _peak_rss_mb
+
+DEFAULT_MINUTES = (60, 180)
+MODES = ("stream", "full")
+
+
+def make_synthetic_wav(path: str, seconds: float) -> str:
+    """Write a 440 Hz tone as 16 kHz mono 16-bit WAV."""
+    from app.core.audio import ffmpeg_binary
+    from app.core.constants import AUDIO_CHANNELS, AUDIO_SAMPLE_RATE
+
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate={AUDIO_SAMPLE_RATE}",
+        "-t", str(seconds),
+        "-ac", str(AUDIO_CHANNELS), "-acodec", "pcm_s16le",
+        path,
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def _run_once(wav_path: str, mode: str) -> Dict:
+    import soundfile as sf
+
+    from app.models.whisper_model import WhisperTranscriber
+
+    started = time.perf_counter()
+    chunks = 0
+    if mode == "stream":
+        transcriber = WhisperTranscriber()
+        created: List[str] = []
+        for path, _, _ in transcriber._iter_chunks(wav_path, created):
+            chunks += 1
+            os.unlink(path)  # stand-in for the upload finishing
+    else:
+        data, _ = sf.read(wav_path)
+        chunks = 1
+        del data
+    return {"mode": mode, "chunks": chunks, "wall_seconds": round(time.perf_counter() - started, 2), **_peak_rss_mb()}
+
+
+def _run_case(minutes: float, mode: str, workdir: str) -> Dict:
+    wav_path = str(Path(workdir) / f"synthetic_{minutes:g}min.wav")
+    if not os.path.exists(wav_path):
+        print(f"Generating {minutes:g} min synthetic WAV...", file=sys.stderr)
+        make_synthetic_wav(wav_path, minutes * 60)
+
+    cmd = [sys.executable, "-m", "benchmarks.bench_chunker", "--single", wav_path, "--modes", mode]
+    out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["minutes"] = minutes
+    result["wav_mb"] = round(os.path.getsize(wav_path) / 2**20, 1)
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=list(DEFAULT_MINUTES),
+                        help="input lengths to benchmark (default: 60 180)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--workdir", help="where synthetic WAVs go (default: a temp dir)")
+    parser.add_argument("--single", help=argparse.SUPPRESS)  # internal: run one case in this process
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-at-least-32-chars!!")
+    os.environ["GROQ_API_KEY"] = ""
+
+    if args.single:
+        print(json.dumps(_run_once(args.single, args.modes[0])))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="vsum-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    print(f"{'minutes':>8} {'WAV (MB)':>9} {'mode':>7} {'chunks':>7} {'wall (s)':>9} {'peak RSS (MB)':>14}")
+    for minutes in args.minutes:
+        for mode in args.modes:
+            r = _run_case(minutes, mode, workdir)
+            print(f"{minutes:>8g} {r['wav_mb']:>9} {mode:>7} {r['chunks']:>7} "
+                  f"{r['wall_seconds']:>9} {str(r['peak_rss_mb']):>14}")
+    print(f"\nWork directory: {workdir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
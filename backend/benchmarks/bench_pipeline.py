@@ -0,0 +1,225 @@
+"""
+bench_pipeline.py — End-to-end offline benchmark of the summarization pipeline.
+
+For each requested input length this
+  1. generates a synthetic video with ffmpeg lavfi (test pattern + sine tone),
+  2. runs `_run_summarize_pipeline` on it in a fresh Python process, with
+     FakeGroq (see fakes.py) in place of the Groq API and an in-memory
+     MongoDB (mongomock-motor),
+  3. reports wall time, per-stage time (from app.core.metrics) and peak RSS.
+
+Each case runs in its own process so peak RSS is not carried over between
+cases.  Run from backend/:
+
+    python -m benchmarks.bench_pipeline                  # 1, 10 and 60 minutes
+    python -m benchmarks.bench_pipeline --minutes 1 5 --llm-latency 0.2
+    python -m benchmarks.bench_pipeline --json bench_output.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_MINUTES = (1, 10, 60)
+STAGE_ORDER = (
+    "transcribe", "rank", "llm_input", "analysis", "summary", "key_points",
+    "subtitles", "highlights", "thumbnail", "render", "persist",
+)
+# Histograms reported next to the stages (name in the table → metric name)
+DETAIL_METRICS = {
+    "audio_extract": "summarizer_audio_extract_seconds",
+    "stt_chunks": "summarizer_transcribe_chunk_seconds",
+    "llm_calls": "summarizer_llm_call_seconds",
+    "scoring": "summarizer_rank_seconds",
+    "render_encode": "summarizer_render_seconds",
+    "db_persist": "summarizer_db_persist_seconds",
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic input
+# ---------------------------------------------------------------------------
+def make_synthetic_video(path: str, seconds: float, size: str = "640x360", fps: int = 24) -> str:
+    """Write a test-pattern video with a 440 Hz tone (H.264 + AAC)."""
+    from app.core.audio import ffmpeg_binary
+
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={fps}",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100",
+        "-t", str(seconds),
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "64k",
+        "-shortest",
+        path,
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Single run (child process)
+# ---------------------------------------------------------------------------
+def _peak_rss_mb() -> Dict[str, Optional[float]]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {"peak_rss_mb": None, "peak_child_rss_mb": None}
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def _histogram_sums(families: Dict, name: str) -> Dict[str, float]:
+    """{label value(s): total seconds} for one collected histogram."""
+    return {
+        "/".join(sample.labels.values()) or "total": round(sample.value, 3)
+        for sample in families.get(name, ()) if sample.name == f"{name}_sum"
+    }
+
+
+def _histogram_counts(families: Dict, name: str) -> int:
+    return int(sum(sample.value for sample in families.get(name, ()) if sample.name == f"{name}_count"))
+
+
+async def _run_once(video_path: str, workdir: str, args: argparse.Namespace) -> Dict:
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app.api.summarize import _run_summarize_pipeline
+    from app.core import database as db_module
+    from app.core.config import settings
+    from app.core.cpu_pool import shutdown_cpu_pool, start_cpu_pool
+    from app.core.metrics import collector_registry
+    from app.core.task_store import create_task, get_artifacts, get_task
+    from app.models.summarizer import VideoSummarizer
+    from app.models.whisper_model import WhisperTranscriber
+    from benchmarks.fakes import FakeGroq
+
+    client = AsyncMongoMockClient()
+    db_module.database.client = client
+    db_module.database.db = client["benchmark"]
+    await db_module.database._create_indexes()
+    settings.PROCESSED_DIR = str(Path(workdir) / "processed")
+    settings.CPU_POOL_WORKERS = args.cpu_workers
+    # FakeGroq has no rate limits (and sends no rate-limit headers)
+    settings.GROQ_LLM_REQUESTS_PER_MINUTE = settings.GROQ_LLM_TOKENS_PER_MINUTE = 0
+    settings.GROQ_STT_REQUESTS_PER_MINUTE = settings.GROQ_STT_AUDIO_SECONDS_PER_MINUTE = 0
+    settings.LLM_CACHE_MAX_MB = 0  # every run measures real (fake) LLM calls
+
+    fake = FakeGroq(args.stt_latency, args.stt_rtf, args.llm_latency, args.llm_word_s)
+    whisper = WhisperTranscriber()
+    whisper.client, whisper.use_mock = fake, False
+    summarizer = VideoSummarizer()
+    summarizer.client, summarizer.use_mock, summarizer.use_ollama = fake, False, False
+
+    start_cpu_pool()
+    task_id = "bench"
+    await create_task(task_id, "bench-user", payload={"video_path": video_path})
+
+    started = time.perf_counter()
+    await _run_summarize_pipeline(task_id, video_path, 0.3, 400, "bench-user", whisper, summarizer)
+    wall = time.perf_counter() - started
+    shutdown_cpu_pool()  # reap pool processes so their RSS is counted
+
+    task = await get_task(task_id)
+    artifacts = await get_artifacts(task_id)
+    # Includes the samples written by the (now stopped) pool processes
+    families = {family.name: family.samples for family in collector_registry().collect()}
+    return {
+        "status": task["status"],
+        "error": task.get("error"),
+        "wall_seconds": round(wall, 3),
+        "stages": _histogram_sums(families, "summarizer_stage_duration_seconds"),
+        "details": {label: _histogram_sums(families, metric) for label, metric in DETAIL_METRICS.items()},
+        "stt_requests": _histogram_counts(families, "summarizer_transcribe_chunk_seconds"),
+        "llm_requests": _histogram_counts(families, "summarizer_llm_call_seconds"),
+        "segments": len(artifacts.get("segments") or []),
+        "summary_video": bool(artifacts.get("summary_video_path")),
+        **_peak_rss_mb(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+def _run_case(minutes: float, workdir: str, args: argparse.Namespace) -> Dict:
+    video_path = str(Path(workdir) / f"synthetic_{minutes:g}min.mp4")
+    if not os.path.exists(video_path):
+        print(f"Generating {minutes:g} min synthetic video...", file=sys.stderr)
+        make_synthetic_video(video_path, minutes * 60)
+
+    cmd = [sys.executable, "-m", "benchmarks.bench_pipeline", "--single", video_path, "--workdir", workdir]
+    for flag in ("stt_latency", "stt_rtf", "llm_latency", "llm_word_s", "cpu_workers"):
+        cmd += [f"--{flag.replace('_', '-')}", str(getattr(args, flag))]
+    print(f"Running pipeline on {minutes:g} min input...", file=sys.stderr)
+    out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["minutes"] = minutes
+    return result
+
+
+def _print_table(results: List[Dict]):
+    columns = [f"{r['minutes']:g} min" for r in results]
+    rows = [("status", [r["status"] for r in results]),
+            ("wall (s)", [f"{r['wall_seconds']:.1f}" for r in results])]
+    for stage in STAGE_ORDER:
+        rows.append((f"  {stage} (s)", [f"{r['stages'].get(stage, 0):.1f}" for r in results]))
+    for label in DETAIL_METRICS:
+        rows.append((f"  {label} (s)", [f"{sum(r['details'][label].values()):.1f}" for r in results]))
+    rows += [
+        ("STT requests", [str(r["stt_requests"]) for r in results]),
+        ("LLM requests", [str(r["llm_requests"]) for r in results]),
+        ("segments", [str(r["segments"]) for r in results]),
+        ("summary video", ["yes" if r["summary_video"] else "no" for r in results]),
+        ("peak RSS (MB)", [str(r["peak_rss_mb"]) for r in results]),
+        ("peak child RSS (MB)", [str(r["peak_child_rss_mb"]) for r in results]),
+    ]
+
+    width = max(len(name) for name, _ in rows) + 2
+    print("".ljust(width) + "".join(c.rjust(12) for c in columns))
+    for name, values in rows:
+        print(name.ljust(width) + "".join(v.rjust(12) for v in values))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=list(DEFAULT_MINUTES),
+                        help="input lengths to benchmark (default: 1 10 60)")
+    parser.add_argument("--stt-latency", type=float, default=0.5, help="seconds per transcription request")
+    parser.add_argument("--stt-rtf", type=float, default=0.01, help="extra transcription seconds per audio second")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="seconds per chat completion")
+    parser.add_argument("--llm-word-s", type=float, default=0.002, help="extra seconds per generated word")
+    parser.add_argument("--cpu-workers", type=int, default=2, help="CPU pool processes (0 = threads)")
+    parser.add_argument("--workdir", help="where synthetic videos and outputs go (default: a temp dir)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--single", help=argparse.SUPPRESS)  # internal: run one case in this process
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-at-least-32-chars!!")
+    os.environ["GROQ_API_KEY"] = ""  # models start in mock mode; FakeGroq is injected afterwards
+
+    if args.single:
+        result = asyncio.run(_run_once(args.single, args.workdir, args))
+        print(json.dumps(result))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="vsum-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    results = [_run_case(minutes, workdir, args) for minutes in args.minutes]
+    _print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    print(f"\nWork directory: {workdir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+fakes.py — Deterministic offline stand-ins for the Groq API.
+
+`FakeGroq` exposes the two endpoints the pipeline uses —
+`client.audio.transcriptions.create` and `client.chat.completions.create` —
+with the same response shapes as the Groq SDK.  Output is derived from the
+request bytes/prompt, so the same input always gives the same result, and
+each call sleeps for a configurable latency to model the network round trip.
+"""
+import io
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+import soundfile as sf
+
+_VOCABULARY = (
+    "model data training network layer gradient loss accuracy feature vector "
+    "signal frequency sample audio video frame pixel encoder decoder attention "
+    "token sequence summary transcript segment ranking cluster pipeline worker "
+    "queue latency throughput memory cache storage database index query result "
+    "experiment baseline metric evaluation benchmark dataset label prediction"
+).split()
+
+SEGMENT_SECONDS = 4.0  # one transcript segment per 4 s of audio
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_VOCABULARY) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+class _Latency:
+    """Sleep `base + per_unit * units` seconds; counts calls for reporting."""
+
+    def __init__(self, base: float, per_unit: float):
+        self.base = base
+        self.per_unit = per_unit
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def wait(self, units: float = 0.0):
+        with self._lock:
+            self.calls += 1
+        delay = self.base + self.per_unit * units
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _Transcriptions:
+    def __init__(self, latency: _Latency):
+        self.latency = latency
+
+    def create(self, file, model=None, response_format=None, **kwargs):
+        name, data = file
+        info = sf.info(io.BytesIO(data))
+        duration = float(info.duration)
+        self.latency.wait(duration)
+
+        rng = random.Random(zlib.crc32(data))
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + SEGMENT_SECONDS)
+            words = rng.randint(8, 16)
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": " " + _sentence(rng, words),
+                "words": [{"word": "", "probability": round(rng.uniform(0.8, 1.0), 3)}],
+            })
+            start = end
+        return SimpleNamespace(
+            text="".join(seg["text"] for seg in segments).strip(),
+            segments=segments,
+            duration=duration,
+        )
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        sentences.append(_sentence(rng, 15))
+    return " ".join(sentences)
+
+
+class _ChatCompletions:
+    def __init__(self, latency: _Latency):
+        self.latency = latency
+
+    def create(self, model=None, messages=None, **kwargs):
+        prompt = (messages or [{}])[-1].get("content", "")
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")))
+
+        count = int((re.search(r"the (\d+) most important", prompt) or [None, 5])[1])
+        target = int((re.search(r"approximately (\d+) words", prompt) or [None, 200])[1])
+        if (kwargs.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({
+                "summary": _paragraph(rng, target),
+                "key_points": [_sentence(rng, 12) for _ in range(count)],
+                "description": _sentence(rng, 15),
+            })
+        elif "JSON array" in prompt:
+            content = json.dumps([_sentence(rng, 12) for _ in range(count)])
+        else:
+            content = _paragraph(rng, target)
+
+        # Latency scales with the generated length, like token streaming does
+        self.latency.wait(len(content.split()))
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+
+class FakeGroq:
+    """
+    Drop-in for `groq.Groq` in WhisperTranscriber / VideoSummarizer.
+
+    Args:
+        stt_latency:  fixed seconds per transcription request
+        stt_rtf:      extra seconds per second of audio (real-time factor)
+        llm_latency:  fixed seconds per chat completion
+        llm_word_s:   extra seconds per generated word
+    """
+
+    def __init__(self, stt_latency: float = 0.5, stt_rtf: float = 0.01,
+                 llm_latency: float = 1.0, llm_word_s: float = 0.002):
+        self.stt = _Latency(stt_latency, stt_rtf)
+        self.llm = _Latency(llm_latency, llm_word_s)
+        self.audio = SimpleNamespace(transcriptions=_Transcriptions(self.stt))
+        self.chat = SimpleNamespace(completions=_ChatCompletions(self.llm))
@@ -0,0 +1,48 @@
+"""test_cancellation.py — Tests for cooperative job cancellation."""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.core.cancellation import CancelToken, TaskCancelled, cancel_flag_set
+from app.core.task_store import create_task, request_cancel
+
+
+def test_check_raises_after_cancel():
+    token = CancelToken("t1")
+    token.check()
+    token.cancel()
+    with pytest.raises(TaskCancelled):
+        token.check()
+    token.cleanup()
+
+
+def test_cancel_writes_flag_for_other_processes():
+    token = CancelToken("t2")
+    assert not cancel_flag_set(token.flag_path)
+    token.cancel()
+    assert cancel_flag_set(token.flag_path)
+    token.cleanup()
+    assert not os.path.exists(token.flag_path)
+
+
+def test_cancel_kills_attached_process():
+    token = CancelToken("t3")
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    token.attach_process(proc)
+    token.cancel()
+    assert proc.wait(timeout=10) != 0
+    token.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_ends_for_cancelled_task(client):
+    await create_task("t4", "u1")
+    assert await request_cancel("t4") == "cancelled"
+
+    response = await asyncio.wait_for(client.get("/api/summarize/progress/t4"), timeout=5)
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [event["status"] for event in events] == ["cancelled"]
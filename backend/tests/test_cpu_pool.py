@@ -0,0 +1,26 @@
+"""test_cpu_pool.py — Tests for the CPU-bound stage process pool."""
+import os
+
+import pytest
+
+from app.core import cpu_pool
+from app.core.config import settings
+from app.models.summarizer import score_segments
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_falls_back_to_threads(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_WORKERS", 0)
+    assert cpu_pool.get_cpu_pool() is None
+    assert await cpu_pool.run_cpu(os.getpid) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_uses_worker_process(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_WORKERS", 1)
+    try:
+        assert await cpu_pool.run_cpu(os.getpid) != os.getpid()
+        scores = await cpu_pool.run_cpu(score_segments, ["too short", "also short"], [1.0, 1.0])
+        assert scores == [1.0, 1.0]
+    finally:
+        cpu_pool.shutdown_cpu_pool()
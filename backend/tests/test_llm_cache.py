@@ -0,0 +1,69 @@
+"""test_llm_cache.py — On-disk LLM completion cache: hits, TTL, LRU size cap."""
+import pytest
+
+from app.core import llm_cache
+from app.core.llm_cache import LLMResponseCache, cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    c = LLMResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=100, ttl_seconds=60)
+    yield c
+    c.close()
+
+
+def test_key_covers_backend_model_temperature_and_prompt():
+    base = cache_key("groq", "m", 0.2, "prompt")
+    assert base == cache_key("groq", "m", 0.2, "prompt")
+    assert len({base, cache_key("ollama", "m", 0.2, "prompt"), cache_key("groq", "m2", 0.2, "prompt"),
+                cache_key("groq", "m", 0.7, "prompt"), cache_key("groq", "m", 0.2, "other")}) == 5
+
+
+def test_hit_and_miss(cache):
+    assert cache.get("k") is None
+    cache.put("k", "answer")
+    assert cache.get("k") == "answer"
+
+
+def test_entries_expire(cache, clock):
+    cache.put("k", "answer")
+    clock[0] += 61
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_are_evicted_over_the_size_cap(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 40)
+        clock[0] += 1
+    # 120 bytes > 100: "a" (oldest) was dropped when "c" went in
+    assert cache.get("a") is None
+    clock[0] += 1
+    assert cache.get("b") is not None  # "b" is now more recent than "c"
+    clock[0] += 1
+    cache.put("d", "x" * 40)
+    assert cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+
+
+def test_summarizer_reuses_cached_completions(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.models.summarizer import VideoSummarizer
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    s = VideoSummarizer()
+    s.use_mock, s.use_ollama = False, False
+    calls = []
+    monkeypatch.setattr(s, "_complete", lambda prompt, timeout, json_mode: calls.append(prompt) or f"re: {prompt}")
+
+    assert s._generate("same prompt") == "re: same prompt"
+    assert s._generate("same prompt") == "re: same prompt"
+    s._generate("another prompt")
+    assert calls == ["same prompt", "another prompt"]
+    llm_cache._cache.close()
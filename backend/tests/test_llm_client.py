@@ -0,0 +1,83 @@
+"""test_llm_client.py — Shared provider clients and async calls through the rate limiter."""
+import pytest
+
+from app.core import llm_client
+from app.core.rate_limiter import RateLimitScheduler
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setattr(llm_client, "_http_client", None)
+    monkeypatch.setattr(llm_client, "_groq_client", None)
+    monkeypatch.setattr(llm_client, "_async_clients", {})
+    monkeypatch.setattr(llm_client, "_ollama_probe", (float("-inf"), False))
+
+
+def test_sync_http_client_is_shared_and_pooled():
+    from app.core.config import settings
+    client = llm_client.get_http_client()
+    assert llm_client.get_http_client() is client
+    assert client.timeout.read == settings.LLM_TIMEOUT_SECONDS
+    client.close()
+    assert llm_client.get_http_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_async_http_client_is_shared_per_loop():
+    client = llm_client.get_async_http_client()
+    assert llm_client.get_async_http_client() is client
+    await llm_client.close_clients()
+    assert client.is_closed
+
+
+def test_ollama_probe_is_cached(monkeypatch):
+    probes = []
+
+    class FakeResponse:
+        status_code = 200
+
+    class FakeClient:
+        def get(self, url, timeout):
+            probes.append(url)
+            return FakeResponse()
+
+    monkeypatch.setattr(llm_client, "get_http_client", lambda: FakeClient())
+    assert llm_client.ollama_available()
+    assert llm_client.ollama_available()
+    assert len(probes) == 1
+
+
+class FakeAPIError(Exception):
+    status_code = 503
+    headers = {}
+
+
+class FakeAsyncRaw:
+    headers = {"x-ratelimit-limit-tokens": "12000"}
+
+    async def parse(self):
+        return "answer"
+
+
+class FakeAsyncResource:
+    def __init__(self):
+        self.calls = 0
+        self.with_raw_response = self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise FakeAPIError()
+        return FakeAsyncRaw()
+
+
+@pytest.mark.asyncio
+async def test_acreate_retries_and_reads_headers(monkeypatch):
+    from app.core import rate_limiter
+    monkeypatch.setattr(rate_limiter, "BACKOFF_BASE_SECONDS", 0.01)
+    scheduler = RateLimitScheduler("test", requests_per_minute=0, tokens_per_minute=6000)
+    resource = FakeAsyncResource()
+
+    assert await scheduler.acreate(resource, tokens=10, model="m") == "answer"
+    assert resource.calls == 2
+    assert scheduler.tokens.per_minute == 12000
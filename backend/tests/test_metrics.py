@@ -0,0 +1,45 @@
+"""test_metrics.py — Tests for the Prometheus metrics and their multiprocess aggregation."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.core.metrics import ENCODED_BYTES, collector_registry, refresh_queue_gauges, render
+from app.core.task_store import claim_next_task, create_task
+
+
+def _encoded_bytes(kind: str) -> float:
+    return collector_registry().get_sample_value("summarizer_encoded_bytes_total", {"kind": kind}) or 0.0
+
+
+def _record_in_child(kind: str, size: int):
+    ENCODED_BYTES.labels(kind=kind).inc(size)
+
+
+def test_samples_from_pool_processes_are_aggregated():
+    before = _encoded_bytes("test_child")
+    ENCODED_BYTES.labels(kind="test_child").inc(10)
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pool.submit(_record_in_child, "test_child", 5).result()
+
+    assert _encoded_bytes("test_child") == before + 15
+
+
+@pytest.mark.asyncio
+async def test_queue_gauges_follow_task_store():
+    await create_task("t1", "u1")
+    await create_task("t2", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+
+    await refresh_queue_gauges()
+    text = render().decode()
+    assert "summarizer_queue_depth 1.0" in text
+    assert "summarizer_jobs_in_flight 1.0" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE summarizer_queue_depth gauge" in response.text
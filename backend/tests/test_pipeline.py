@@ -0,0 +1,376 @@
+"""test_pipeline.py — Tests for the summarization pipeline with stub models."""
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.task_store import create_task, get_task, save_artifact
+from app.models.segments import SegmentTable
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = tmp_path / "lecture.mp4"
+    path.write_bytes(b"\x00" * 1024)
+    return str(path)
+
+
+@pytest.fixture
+def stub_models(monkeypatch):
+    from app.core.config import settings
+    # Run CPU stages in threads — no worker processes in unit tests
+    monkeypatch.setattr(settings, "CPU_POOL_WORKERS", 0)
+    # Separate summary / key point calls; the combined analysis is tested on its own
+    monkeypatch.setattr(settings, "SUMMARIZE_COMBINED_ANALYSIS", False)
+    whisper = MagicMock()
+    whisper.segments = [
+        {"start": 0.0, "end": 5.0, "text": "Machine learning lets computers learn from data.", "confidence": 0.9},
+        {"start": 5.0, "end": 10.0, "text": "Neural networks are loosely inspired by the brain.", "confidence": 0.9},
+    ]
+    # One audio chunk per segment
+    whisper.iter_segment_tables.side_effect = lambda path, cancel=None, cache=None: iter(
+        [SegmentTable.from_dicts([seg]) for seg in whisper.segments]
+    )
+    summarizer = MagicMock()
+    summarizer.rank_segments.side_effect = lambda segs, scores=None: list(segs)
+    summarizer.summarize_text.return_value = "A short summary."
+    summarizer.extract_key_points.return_value = ["Point one"]
+    return whisper, summarizer
+
+
+@pytest.mark.asyncio
+async def test_pipeline_completes_and_checkpoints(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer)
+
+    task = await get_task("t1")
+    assert task["status"] == "done"
+    assert set(task["artifacts"]) >= {"segments", "ranked_segments", "text_summary", "key_points", "summary_id"}
+    summary = await mock_database.summaries.find_one({"summary_id": task["summary_id"]})
+    assert summary["text_summary"] == "A short summary."
+    # One chronological copy of the segments, carrying the ranking scores
+    assert "all_segments" not in summary
+    assert [seg["start"] for seg in summary["segments"]] == [0.0, 5.0]
+    assert all("relevance_score" in seg for seg in summary["segments"])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_checkpointed_stages(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+
+    await create_task("t1", "u1")
+    await save_artifact("t1", "segments", [{"start": 0.0, "end": 3.0, "text": "Cached transcript."}])
+    await save_artifact("t1", "text_summary", "Cached summary.")
+
+    await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer)
+
+    whisper.iter_segment_tables.assert_not_called()
+    summarizer.summarize_text.assert_not_called()
+    summarizer.extract_key_points.assert_called_once()
+    task = await get_task("t1")
+    summary = await mock_database.summaries.find_one({"summary_id": task["summary_id"]})
+    assert summary["text_summary"] == "Cached summary."
+
+
+@pytest.mark.asyncio
+async def test_identical_content_reuses_artifacts(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.content_store import get_content_artifacts
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline(
+        "t1", video_file, 0.3, 400, "u1", whisper, summarizer, content_hash="abc123",
+    )
+
+    shared = await get_content_artifacts("abc123", 400)
+    assert shared["text_summary"] == "A short summary."
+    assert shared["segments"] == whisper.segments
+    # A different summary length cannot reuse the summary text
+    assert "text_summary" not in await get_content_artifacts("abc123", 800)
+
+    # A second job for the same bytes, seeded from the content store
+    await create_task("t2", "u2", artifacts=shared)
+    await summarize._run_summarize_pipeline(
+        "t2", video_file, 0.3, 400, "u2", whisper, summarizer, content_hash="abc123",
+    )
+    assert whisper.iter_segment_tables.call_count == 1
+    assert summarizer.summarize_text.call_count == 1
+    assert (await get_task("t2"))["status"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_identical_upload_gets_the_full_summary_with_its_own_files(mock_database, video_file, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.content_store import save_content_artifacts
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    first_dir = tmp_path / "processed" / "u1"
+    first_dir.mkdir(parents=True)
+    files = {name: first_dir / name for name in ("summary_t1.mp4", "thumb_t1.jpg", "subtitles_t1.srt")}
+    for path in files.values():
+        path.write_bytes(b"data")
+    await save_content_artifacts("abc123", {
+        "segments": [{"start": 0.0, "end": 3.0, "text": "Shared transcript."}],
+        "ranked_segments": [[0, 1.0]],
+        "key_points": ["Point"],
+        "highlights": [{"start": 0.0, "end": 3.0}],
+        "text_summary": "Shared summary.",
+        "description": "A shared video.",
+        "subtitle_paths": {"srt": str(files["subtitles_t1.srt"])},
+        "thumbnail_path": str(files["thumb_t1.jpg"]),
+        "summary_video_path": str(files["summary_t1.mp4"]),
+    }, 400)
+
+    accepted = await summarize._enqueue_summary(
+        "u2", {"file_path": video_file, "file_id": "f2", "content_hash": "abc123"}, 0.3, 400,
+    )
+
+    assert accepted.status == "done"
+    summary = await mock_database.summaries.find_one({"task_id": accepted.task_id})
+    assert summary["highlights"] and summary["description"] == "A shared video."
+    # Same outputs as a fresh run, but as files of the requesting user
+    owned = [summary["summary_video_path"], summary["thumbnail_path"], summary["subtitle_paths"]["srt"]]
+    for path in owned:
+        assert path.startswith(str(tmp_path / "processed" / "u2")) and os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_shared_file_deleted_before_adoption_is_rendered_again(mock_database, video_file, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.content_store import save_content_artifacts
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    first_dir = tmp_path / "processed" / "u1"
+    first_dir.mkdir(parents=True)
+    video, thumbnail = first_dir / "summary_t1.mp4", first_dir / "thumb_t1.jpg"
+    for path in (video, thumbnail):
+        path.write_bytes(b"data")
+    await save_content_artifacts("abc123", {
+        "segments": [{"start": 0.0, "end": 3.0, "text": "Shared transcript."}],
+        "text_summary": "Shared summary.",
+        "thumbnail_path": str(thumbnail),
+        "summary_video_path": str(video),
+    }, 400)
+
+    # The first user deletes the video between the lookup and the copy
+    real_link_or_copy = summarize._link_or_copy
+
+    def link_or_copy(src, dst):
+        if src == str(video):
+            os.unlink(src)
+        return real_link_or_copy(src, dst)
+
+    monkeypatch.setattr(summarize, "_link_or_copy", link_or_copy)
+    accepted = await summarize._enqueue_summary(
+        "u2", {"file_path": video_file, "file_id": "f2", "content_hash": "abc123"}, 0.3, 400,
+    )
+
+    assert accepted.status == "pending"
+    artifacts = (await get_task(accepted.task_id))["artifacts"]
+    assert "summary_video_path" not in artifacts
+    assert artifacts["thumbnail_path"].startswith(str(tmp_path / "processed" / "u2"))
+
+
+@pytest.mark.asyncio
+async def test_other_summary_length_reuses_transcript_but_not_video(mock_database, video_file, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.content_store import get_content_artifacts, save_content_artifacts
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    first_dir = tmp_path / "processed" / "u1"
+    first_dir.mkdir(parents=True)
+    outputs = {}
+    for length in (400, 800):
+        video = first_dir / f"summary_{length}.mp4"
+        video.write_bytes(b"video")
+        outputs[length] = {
+            "segments": [{"start": 0.0, "end": 3.0, "text": "Shared transcript."}],
+            "text_summary": f"Summary in {length} characters.",
+            "summary_video_path": str(video),
+        }
+    await save_content_artifacts("abc123", outputs[400], 400)
+
+    # The video shows the 400-character summary: not reused for 800
+    shared = await get_content_artifacts("abc123", 800)
+    assert shared["segments"] == outputs[400]["segments"]
+    assert "text_summary" not in shared and "summary_video_path" not in shared
+    accepted = await summarize._enqueue_summary(
+        "u2", {"file_path": video_file, "file_id": "f2", "content_hash": "abc123"}, 0.3, 800,
+    )
+    assert accepted.status == "pending"
+    assert "summary_video_path" not in (await get_task(accepted.task_id))["artifacts"]
+
+    # Once rendered for 800, each length gets its own video
+    await save_content_artifacts("abc123", outputs[800], 800)
+    for length in (400, 800):
+        shared = await get_content_artifacts("abc123", length)
+        assert shared["text_summary"] == outputs[length]["text_summary"]
+        assert shared["summary_video_path"] == outputs[length]["summary_video_path"]
+
+
+@pytest.mark.asyncio
+async def test_map_phase_runs_on_each_transcribed_chunk(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+    summarizer.use_mock = False
+    summarizer.map_chunks.side_effect = lambda text, max_length, cancel=None: [f"summary of: {text[:20]}"]
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer)
+
+    assert summarizer.map_chunks.call_count == 2
+    transcript, max_length, partials = summarizer.summarize_text.call_args.args
+    assert max_length == 400
+    assert partials == [
+        "summary of: Machine learning let",
+        "summary of: Neural networks are ",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_combined_analysis_replaces_separate_calls(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.models.summarizer import ChunkAnalysis
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    monkeypatch.setattr(summarize.settings, "SUMMARIZE_COMBINED_ANALYSIS", True)
+    whisper, summarizer = stub_models
+    summarizer.use_mock = False
+    summarizer.map_analyses.side_effect = lambda text, max_length, cancel=None: [
+        ChunkAnalysis(summary=f"about: {text[:20]}", key_points=[text[:10]], description="d")
+    ]
+    summarizer.analyze_text.return_value = ChunkAnalysis(
+        summary="One summary.", key_points=["Point A", "Point B"], description="A video about learning."
+    )
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer)
+
+    assert summarizer.map_analyses.call_count == 2
+    assert len(summarizer.analyze_text.call_args.kwargs["partials"]) == 2
+    summarizer.summarize_text.assert_not_called()
+    summarizer.extract_key_points.assert_not_called()
+    task = await get_task("t1")
+    summary = await mock_database.summaries.find_one({"summary_id": task["summary_id"]})
+    assert summary["text_summary"] == "One summary."
+    assert summary["key_points"] == ["Point A", "Point B"]
+    assert summary["description"] == "A video about learning."
+
+
+@pytest.mark.asyncio
+async def test_long_transcript_is_pruned_to_top_segments(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.tokens import count_tokens
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+    whisper.segments.append(
+        {"start": 10.0, "end": 15.0, "text": "Training adjusts the weights to reduce the loss.", "confidence": 0.9}
+    )
+    texts = [seg["text"] for seg in whisper.segments]
+    monkeypatch.setattr(summarize, "score_segments", lambda texts, confidences: [0.9, 0.1, 0.8])
+    prune_calls = []
+    prune = summarize.prune_to_budget
+    monkeypatch.setattr(summarize, "prune_to_budget", lambda *a: prune_calls.append(a) or prune(*a))
+    monkeypatch.setattr(summarize.settings, "SUMMARIZE_INPUT_TOKENS", count_tokens(texts[0]) + count_tokens(texts[2]) + 2)
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer)
+
+    # The best two segments, in chronological order, for both LLM stages
+    expected = f"{texts[0]} {texts[2]}"
+    assert summarizer.summarize_text.call_args.args[0] == expected
+    assert summarizer.extract_key_points.call_args.args[0] == expected
+    assert len(prune_calls) == 1  # shared by the LLM stages, not redone in each
+    # The stored transcript is still complete
+    task = await get_task("t1")
+    summary = await mock_database.summaries.find_one({"summary_id": task["summary_id"]})
+    assert len(summary["segments"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_between_transcription_chunks(mock_database, video_file, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    from app.core.cancellation import CancelToken
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+    cancel = CancelToken("t1")
+
+    def iter_segment_tables(path, cancel=None, cache=None):
+        yield SegmentTable.from_dicts([whisper.segments[0]])
+        cancel.cancel()  # user cancels while the first chunk is processed
+        cancel.check()
+        yield SegmentTable.from_dicts([whisper.segments[1]])
+
+    whisper.iter_segment_tables.side_effect = iter_segment_tables
+
+    await create_task("t1", "u1")
+    try:
+        await summarize._run_summarize_pipeline("t1", video_file, 0.3, 400, "u1", whisper, summarizer, cancel=cancel)
+    finally:
+        cancel.cleanup()
+
+    task = await get_task("t1")
+    assert task["status"] == "cancelled"
+    assert "segments" not in task["artifacts"]
+    summarizer.summarize_text.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_youtube_captions_skip_transcription(mock_database, stub_models, tmp_path, monkeypatch):
+    from app.api import summarize
+    monkeypatch.setattr(summarize.settings, "PROCESSED_DIR", str(tmp_path / "processed"))
+    whisper, summarizer = stub_models
+    video_path = str(tmp_path / "yt.mp4")
+    captions = [
+        {"start": 0.0, "end": 4.0, "text": "Welcome to the lecture."},
+        {"start": 4.0, "end": 9.0, "text": "Today we cover gradient descent."},
+    ]
+    await mock_database.videos.insert_one({
+        "file_id": "yt1", "file_path": video_path, "source_url": "https://youtu.be/abc", "caption_segments": captions,
+    })
+    downloads = []
+
+    def fake_download(url, output_path, cancel=None):
+        downloads.append(url)
+        with open(output_path, "wb") as f:
+            f.write(b"\x00" * 2048)
+        return {"filepath": output_path, "title": "Lecture"}
+
+    monkeypatch.setattr(summarize, "download_video", fake_download)
+
+    await create_task("t1", "u1")
+    await summarize._run_summarize_pipeline("t1", video_path, 0.3, 400, "u1", whisper, summarizer)
+
+    task = await get_task("t1")
+    assert task["status"] == "done"
+    whisper.iter_segment_tables.assert_not_called()
+    assert [seg["text"] for seg in task["artifacts"]["segments"]] == [c["text"] for c in captions]
+    # Downloaded in the background for the summary video only
+    assert downloads == ["https://youtu.be/abc"]
+    assert (await mock_database.videos.find_one({"file_id": "yt1"}))["file_size"] == 2048
+
+
+@pytest.mark.asyncio
+async def test_batch_status_aggregates_member_tasks():
+    from app.api import summarize
+    from app.core.constants import PRIORITY_BATCH
+    from app.core.task_store import mark_done, update_task
+
+    for i in range(4):
+        await create_task(f"t{i}", "u1", payload={"file_id": f"f{i}"}, priority=PRIORITY_BATCH, batch_id="b1")
+    await mark_done("t0", "s0")
+    await update_task("t1", status="summarizing", progress=50)
+
+    status = await summarize.get_batch_status("b1", current_user={"_id": "u1"})
+    assert status["status"] == "processing"
+    assert status["finished"] == 1
+    assert status["progress"] == (100 + 50) // 4
+    assert [t["file_id"] for t in status["tasks"]] == ["f0", "f1", "f2", "f3"]
+
+    with pytest.raises(summarize.HTTPException):
+        await summarize.get_batch_status("b1", current_user={"_id": "someone-else"})
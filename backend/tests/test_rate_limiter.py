@@ -0,0 +1,144 @@
+"""test_rate_limiter.py — Token buckets, header tracking and retries of provider calls."""
+import pytest
+
+from app.core.rate_limiter import RateLimitScheduler, TokenBucket, is_retryable, parse_reset
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeRaw:
+    def __init__(self, value, headers):
+        self.value = value
+        self.headers = headers
+
+    def parse(self):
+        return self.value
+
+
+class FakeResource:
+    """Mimics an SDK resource with `create` and `with_raw_response.create`."""
+
+    def __init__(self, outcomes, headers=None):
+        self.outcomes = list(outcomes)
+        self.headers = headers or {}
+        self.calls = []
+        self.with_raw_response = self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeRaw(outcome, self.headers)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return RateLimitScheduler("test", requests_per_minute=0, max_retries=3, sleep=clock.sleep, clock=clock)
+
+
+def test_parse_reset():
+    assert parse_reset("7.66s") == pytest.approx(7.66)
+    assert parse_reset("2m59.56s") == pytest.approx(179.56)
+    assert parse_reset("120ms") == pytest.approx(0.12)
+    assert parse_reset("30") == 30.0
+    assert parse_reset("") is None
+
+
+def test_token_bucket_waits_for_overdraft():
+    bucket = TokenBucket(per_minute=60, now=0.0)
+    assert bucket.reserve(60, now=0.0) == 0.0
+    # Overdrawn by 30 tokens at 1 token/s
+    assert bucket.reserve(30, now=0.0) == pytest.approx(30.0)
+    assert bucket.reserve(0, now=10.0) == pytest.approx(20.0)
+
+
+def test_requests_are_spaced_out(clock):
+    scheduler = RateLimitScheduler("test", requests_per_minute=2, sleep=clock.sleep, clock=clock)
+    for _ in range(4):
+        scheduler.call(lambda: None)
+    # Two go out at once, the others wait 30 s each
+    assert sum(clock.sleeps) == pytest.approx(60.0)
+
+
+def test_is_retryable():
+    assert is_retryable(FakeAPIError(429))
+    assert is_retryable(FakeAPIError(503))
+    assert is_retryable(ConnectionError())
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("bad"))
+
+
+def test_retries_rate_limited_call(scheduler, clock):
+    resource = FakeResource([FakeAPIError(429, {"retry-after": "5"}), FakeAPIError(502), "ok"])
+    assert scheduler.create(resource, model="m") == "ok"
+    assert len(resource.calls) == 3
+    assert sum(clock.sleeps) >= 5.0
+
+
+def test_gives_up_after_max_retries(scheduler):
+    resource = FakeResource([FakeAPIError(500)] * 4)
+    with pytest.raises(FakeAPIError):
+        scheduler.create(resource)
+    assert len(resource.calls) == 4
+
+
+def test_client_errors_are_not_retried(scheduler):
+    resource = FakeResource([FakeAPIError(400), "ok"])
+    with pytest.raises(FakeAPIError):
+        scheduler.create(resource)
+    assert len(resource.calls) == 1
+
+
+def test_headers_set_token_limit_and_pause(scheduler, clock):
+    resource = FakeResource(["a", "b"], headers={
+        "x-ratelimit-limit-tokens": "6000",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+    })
+    scheduler.create(resource, tokens=10)
+    assert scheduler.tokens.per_minute == 6000
+    assert not clock.sleeps
+
+    # Nothing left: the next call waits for the request reset
+    scheduler.create(resource, tokens=10)
+    assert sum(clock.sleeps) == pytest.approx(2.0)
+
+
+def test_transcription_scheduler_ignores_token_headers(monkeypatch):
+    from app.core import rate_limiter
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "GROQ_STT_AUDIO_SECONDS_PER_MINUTE", 0)
+    monkeypatch.setattr(rate_limiter, "_schedulers", {})
+    stt = rate_limiter.get_scheduler("groq-stt")
+
+    # Its bucket counts audio seconds — LLM token limits must not create or resize it
+    stt.observe_headers({"x-ratelimit-limit-tokens": "6000", "x-ratelimit-remaining-tokens": "10"})
+    assert stt.tokens is None
+    llm = rate_limiter.get_scheduler("groq-llm")
+    llm.observe_headers({"x-ratelimit-limit-tokens": "6000"})
+    assert llm.tokens.per_minute == 6000
@@ -0,0 +1,63 @@
+"""test_segments.py — Tests for the columnar SegmentTable."""
+import numpy as np
+
+from app.models.segments import SegmentTable
+from app.models.whisper_model import WhisperTranscriber
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "text": " Hello there.", "confidence": 0.9,
+     "words": [{"word": " Hello", "start": 0.0, "end": 0.5, "probability": 0.8},
+               {"word": " there.", "start": 0.6, "end": 1.0, "probability": 0.6}]},
+    {"start": 2.0, "end": 5.0, "text": " General Kenobi.", "confidence": 0.7, "words": []},
+    {"start": 5.0, "end": 6.0, "text": " You are a bold one.", "confidence": 0.8,
+     "words": [{"word": " bold", "start": 5.2, "end": 5.5, "probability": 0.9}]},
+]
+
+
+def test_round_trips_the_dict_format():
+    table = SegmentTable.from_dicts(SEGMENTS)
+
+    assert len(table) == 3 and table.has_words
+    assert table.text(1) == " General Kenobi."
+    assert table.to_dicts() == SEGMENTS
+    assert table.transcript() == " Hello there.  General Kenobi.  You are a bold one."
+    assert table.spans() == [(0.0, 2.0), (2.0, 5.0), (5.0, 6.0)]
+
+
+def test_ranking_is_checkpointed_as_index_pairs():
+    table = SegmentTable.from_dicts(SEGMENTS)
+    table.score = np.array([0.2, 0.9, 0.2])
+
+    pairs = table.ranking_pairs()
+    assert pairs == [[1, 0.9], [0, 0.2], [2, 0.2]]  # stable for ties
+
+    restored = SegmentTable.from_dicts(SEGMENTS)
+    ranked = restored.with_ranking(pairs)
+    assert ranked.texts() == [" General Kenobi.", " Hello there.", " You are a bold one."]
+    assert ranked.words()[1][0]["word"] == " Hello"
+    assert restored.score.tolist() == [0.2, 0.9, 0.2]
+
+
+def test_with_ranking_accepts_legacy_segment_dicts():
+    legacy = [dict(SEGMENTS[2], relevance_score=0.7), dict(SEGMENTS[0], relevance_score=0.5)]
+    table = SegmentTable.from_dicts(SEGMENTS)
+
+    ranked = table.with_ranking(legacy)
+    assert ranked.start.tolist() == [5.0, 0.0]
+    assert table.score.tolist() == [0.5, 0.0, 0.7]
+
+
+def test_concat_keeps_words_aligned():
+    first = SegmentTable.from_dicts(SEGMENTS[1:2])  # no words
+    second = SegmentTable.from_dicts(SEGMENTS[2:])
+    combined = SegmentTable.concat([first, SegmentTable.empty(), second])
+
+    assert combined.words() == [[], SEGMENTS[2]["words"]]
+    assert SegmentTable.concat([]).to_dicts() == []
+
+
+def test_transcriber_builds_tables_with_word_confidence():
+    table = WhisperTranscriber._segment_table(SEGMENTS)
+
+    assert np.allclose(table.confidence, [0.7, 0.99, 0.9])
+    assert table.words()[0][1]["end"] == 1.0
@@ -0,0 +1,88 @@
+"""test_stage_graph.py — Tests for the dependency-graph stage executor."""
+import asyncio
+
+import pytest
+
+from app.core.stage_graph import Stage, StageGraph
+
+
+def _stage(name, deps=(), result=None, log=None, delay=0.0, fail=False, **kwargs):
+    async def run(inputs):
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        if log is not None:
+            log.append(("end", name))
+        return result if result is not None else inputs
+    return Stage(name, run, deps=tuple(deps), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_stages_receive_dependency_results():
+    graph = StageGraph([
+        _stage("a", result=1),
+        _stage("b", deps=["a"]),
+    ])
+    results = await graph.run()
+    assert results == {"a": 1, "b": {"a": 1}}
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    log = []
+    graph = StageGraph([
+        _stage("root", result="x", log=log),
+        _stage("left", deps=["root"], log=log, delay=0.05),
+        _stage("right", deps=["root"], log=log, delay=0.05),
+    ])
+    await graph.run()
+    # Both branches start before either finishes
+    assert log.index(("start", "right")) < log.index(("end", "left"))
+    assert log.index(("start", "left")) < log.index(("end", "right"))
+
+
+@pytest.mark.asyncio
+async def test_progress_reflects_finished_weight():
+    reports = []
+
+    async def on_progress(fraction, stage):
+        reports.append((stage, fraction))
+
+    graph = StageGraph([
+        _stage("a", result=1, weight=3),
+        _stage("b", deps=["a"], weight=1),
+    ])
+    await graph.run(on_progress=on_progress)
+    assert reports == [("a", 0.75), ("b", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_optional_stage_failure_is_non_fatal():
+    graph = StageGraph([
+        _stage("a", result=1),
+        _stage("extra", deps=["a"], fail=True, required=False),
+        _stage("final", deps=["extra"]),
+    ])
+    results = await graph.run()
+    assert results["extra"] is None
+    assert results["final"] == {"extra": None}
+
+
+@pytest.mark.asyncio
+async def test_required_stage_failure_aborts():
+    graph = StageGraph([
+        _stage("a", fail=True),
+        _stage("b", deps=["a"]),
+    ])
+    with pytest.raises(RuntimeError):
+        await graph.run()
+
+
+def test_cycles_and_unknown_deps_are_rejected():
+    noop = _stage("x").run
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", noop, deps=("b",)), Stage("b", noop, deps=("a",))])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", noop, deps=("missing",))])
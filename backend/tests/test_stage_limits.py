@@ -0,0 +1,46 @@
+"""test_stage_limits.py — Tests for the priority-ordered stage slots."""
+import asyncio
+
+import pytest
+
+from app.core.constants import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from app.core.stage_limits import PrioritySlots
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_go_before_batch_waiters():
+    slots = PrioritySlots(limit=1)
+    order = []
+
+    async def job(name, priority):
+        async with slots.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await slots.acquire()  # occupy the only slot
+    waiters = [
+        asyncio.create_task(job("batch-1", PRIORITY_BATCH)),
+        asyncio.create_task(job("batch-2", PRIORITY_BATCH)),
+        asyncio.create_task(job("interactive", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    slots.release()
+    await asyncio.gather(*waiters)
+
+    assert order == ["interactive", "batch-1", "batch-2"]
+    assert slots.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    slots = PrioritySlots(limit=1)
+    await slots.acquire()
+    waiter = asyncio.create_task(slots.acquire(PRIORITY_BATCH))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    slots.release()
+    assert slots.in_use == 0
+    await asyncio.wait_for(slots.acquire(), timeout=1)
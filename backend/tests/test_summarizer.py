@@ -17,8 +17,8 @@ def mock_segments():
 
 def test_summarize_text_mock_mode():
     """VideoSummarizer without ML packages should return first 300 chars + ellipsis."""
-    # Mock _HAS_GROQ to False or use_mock to True
-    with patch("app.models.summarizer._HAS_GROQ", False):
+    # Pretend the groq SDK is not installed
+    with patch("app.models.summarizer.groq_available", return_value=False):
         from app.models.summarizer import VideoSummarizer
         s = VideoSummarizer()
         text = "A " * 200   # 400 chars
@@ -62,3 +62,145 @@ def test_rank_segments_empty():
     from app.models.summarizer import VideoSummarizer
     s = VideoSummarizer()
     assert s.rank_segments([]) == []
+
+
+def test_rank_segments_uses_precomputed_scores(mock_segments):
+    """Scores computed elsewhere (e.g. in the CPU pool) are applied and sorted on."""
+    from app.models.summarizer import VideoSummarizer
+    s = VideoSummarizer()
+    scores = [0.2 + 0.1 * i for i in range(len(mock_segments))]
+    result = s.rank_segments(mock_segments, scores)
+    assert [seg["relevance_score"] for seg in result] == sorted(scores, reverse=True)
+
+
+@pytest.fixture
+def live_summarizer(monkeypatch):
+    """A summarizer whose LLM calls are recorded instead of sent."""
+    import threading
+    import time
+    from app.models.summarizer import VideoSummarizer
+    s = VideoSummarizer()
+    s.use_mock = False
+    s.calls = []
+    s.active = s.peak = 0
+    lock = threading.Lock()
+
+    def fake_generate(prompt, timeout=90.0, json_mode=False):
+        with lock:
+            s.calls.append(prompt)
+            s.active += 1
+            s.peak = max(s.peak, s.active)
+        time.sleep(0.01 * (len(s.calls) % 3))  # finish out of order
+        with lock:
+            s.active -= 1
+        return "summary of " + prompt[-12:]
+
+    monkeypatch.setattr(s, "_generate", fake_generate)
+    return s
+
+
+def test_map_chunks_runs_concurrently_in_order(live_summarizer, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "SUMMARIZE_CONCURRENCY", 3)
+    text = ". ".join(f"Sentence number {i} about topic {i % 7}" for i in range(40))
+    chunks = live_summarizer._chunk_text(text, max_chunk_chars=200)
+    monkeypatch.setattr(live_summarizer, "_chunk_text", lambda t: chunks)
+
+    summaries = live_summarizer.map_chunks(text, 100)
+
+    assert len(summaries) == len(chunks) > 3
+    assert live_summarizer.peak == 3
+    # Results follow chunk order, not completion order
+    assert summaries == ["summary of " + chunk[-12:] for chunk in chunks]
+
+
+def test_reduce_is_a_tree_within_budget(live_summarizer, monkeypatch):
+    from app.core.config import settings
+    from app.models import summarizer as summarizer_module
+    # Budget in characters, so the grouping does not depend on the tokenizer
+    monkeypatch.setattr(settings, "SUMMARIZE_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(summarizer_module, "count_tokens", len)
+    partials = [f"part {i:02d} " + "x" * 30 for i in range(16)]
+
+    result = live_summarizer.reduce_summaries(partials, 50)
+
+    assert result.startswith("summary of ")
+    # Two partials fit a combine prompt: 8 combines, then the (short) results 4 at a time, then 1
+    assert len(live_summarizer.calls) == 8 + 2 + 1
+    assert all(sum(p in call for p in partials) <= 2 for call in live_summarizer.calls)
+
+
+def test_reduce_never_exceeds_budget(live_summarizer, monkeypatch):
+    from app.core.config import settings
+    from app.models import summarizer as summarizer_module
+    monkeypatch.setattr(settings, "SUMMARIZE_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(summarizer_module, "count_tokens", len)
+    # Each over half the budget: no two fit one prompt
+    partials = [f"part {i:02d} " + "y" * 52 for i in range(4)]
+
+    result = live_summarizer.reduce_summaries(partials, 50)
+
+    assert result.startswith("summary of ")
+    assert all(sum(p in call for p in partials) <= 1 for call in live_summarizer.calls)
+    # Four condensed alone, then combined as a tree
+    assert len(live_summarizer.calls) == 4 + 1
+
+
+def test_reduce_single_summary_needs_no_call(live_summarizer):
+    assert live_summarizer.reduce_summaries(["only one"]) == "only one"
+    assert live_summarizer.calls == []
+
+
+def _analysis_json(summary, points=("a", "b"), description="One line."):
+    import json
+    return json.dumps({"summary": summary, "key_points": list(points), "description": description})
+
+
+def test_analyze_text_one_structured_call_per_chunk(live_summarizer, monkeypatch):
+    answers = {}
+
+    def fake_generate(prompt, timeout=90.0, json_mode=False):
+        assert json_mode
+        live_summarizer.calls.append(prompt)
+        return answers.get(len(live_summarizer.calls), _analysis_json(f"part {len(live_summarizer.calls)}"))
+
+    monkeypatch.setattr(live_summarizer, "_generate", fake_generate)
+    monkeypatch.setattr(live_summarizer, "_chunk_text", lambda t: ["chunk one", "chunk two"])
+    answers[3] = "```json\n" + _analysis_json("merged", ["k1", " ", "k2", "k3"], "  A   video.\n") + "\n```"
+
+    result = live_summarizer.analyze_text("chunk one. chunk two", 100, num_points=2)
+
+    # Two map calls and one reduce — no separate key point or description calls
+    assert len(live_summarizer.calls) == 3
+    assert '"summary":"part 1"' in live_summarizer.calls[2]
+    assert result.summary == "merged"
+    assert result.key_points == ["k1", "k2"]
+    assert result.description == "A video."
+
+
+def test_analyze_text_retries_invalid_json_then_falls_back(live_summarizer, monkeypatch):
+    replies = iter(['{"summary": 3}', _analysis_json("fixed")])
+
+    def fake_generate(prompt, timeout=90.0, json_mode=False):
+        live_summarizer.calls.append(prompt)
+        return next(replies)
+
+    monkeypatch.setattr(live_summarizer, "_generate", fake_generate)
+    assert live_summarizer.analyze_text("A transcript. About things.").summary == "fixed"
+    assert "rejected" in live_summarizer.calls[1]
+
+    # Still invalid after the retry: separate summary / key point calls
+    replies = iter(["not json", "still not json", "plain summary", '["point"]'])
+    result = live_summarizer.analyze_text("A transcript. About things.")
+    assert result.summary == "plain summary"
+    assert result.key_points == ["point"]
+
+
+def test_prune_to_budget_keeps_best_segments_in_order():
+    from app.models.summarizer import prune_to_budget
+    texts = ["a" * 10, "b" * 10, "c" * 10, "d" * 10]
+    scores = [0.2, 0.9, 0.1, 0.8]
+
+    assert prune_to_budget(texts, scores, 22, count=len) == [1, 3]
+    assert prune_to_budget(texts, scores, 1000, count=len) == [0, 1, 2, 3]
+    assert prune_to_budget(texts, scores, 5, count=len) == []
@@ -0,0 +1,171 @@
+"""test_task_store.py — Tests for the MongoDB-backed job queue."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.constants import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from app.core.task_store import (
+    cancel_requested_ids,
+    claim_next_task,
+    count_tasks,
+    create_task,
+    get_artifacts,
+    get_batch_tasks,
+    get_task,
+    mark_done,
+    mark_failed,
+    renew_lease,
+    request_cancel,
+    requeue_expired_tasks,
+    requeue_task,
+    save_artifact,
+)
+
+
+@pytest.mark.asyncio
+async def test_create_task_is_pending():
+    await create_task("t1", "u1", payload={"video_path": "/tmp/a.mp4"})
+    task = await get_task("t1")
+    assert task["status"] == "pending"
+    assert task["payload"]["video_path"] == "/tmp/a.mp4"
+    assert await count_tasks("pending") == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_oldest_task_once():
+    await create_task("first", "u1")
+    await create_task("second", "u1")
+
+    claimed = await claim_next_task("worker-a", lease_seconds=60)
+    assert claimed["task_id"] == "first"
+    assert claimed["status"] == "processing"
+    assert claimed["locked_by"] == "worker-a"
+    assert claimed["attempts"] == 1
+
+    claimed = await claim_next_task("worker-b", lease_seconds=60)
+    assert claimed["task_id"] == "second"
+    assert await claim_next_task("worker-c", lease_seconds=60) is None
+
+
+@pytest.mark.asyncio
+async def test_renew_lease_requires_owner():
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    assert await renew_lease("t1", "worker-a", 60)
+    assert not await renew_lease("t1", "worker-b", 60)
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_requeued(mock_database):
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    await mock_database.tasks.update_one(
+        {"task_id": "t1"},
+        {"$set": {"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}},
+    )
+
+    assert await requeue_expired_tasks(max_attempts=3) == 1
+    task = await get_task("t1")
+    assert task["status"] == "pending"
+    assert task["locked_by"] is None
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_fails_after_max_attempts(mock_database):
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    await mock_database.tasks.update_one(
+        {"task_id": "t1"},
+        {"$set": {"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}},
+    )
+
+    assert await requeue_expired_tasks(max_attempts=1) == 0
+    task = await get_task("t1")
+    assert task["status"] == "failed"
+    assert task["finished_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_with_cancel_request_finishes_cancelled(mock_database):
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    assert await request_cancel("t1") == "cancelling"
+    await mock_database.tasks.update_one(
+        {"task_id": "t1"},
+        {"$set": {"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}},
+    )
+
+    assert await requeue_expired_tasks(max_attempts=3) == 0
+    task = await get_task("t1")
+    assert task["status"] == "cancelled"
+    assert task["finished_at"] is not None
+
+@pytest.mark.asyncio
+async def test_mark_done_releases_lease():
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    await mark_done("t1", "summary-1")
+    task = await get_task("t1")
+    assert task["status"] == "done"
+    assert task["summary_id"] == "summary-1"
+    assert task["locked_by"] is None
+
+
+@pytest.mark.asyncio
+async def test_artifacts_survive_requeue():
+    await create_task("t1", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    await save_artifact("t1", "segments", [{"start": 0, "end": 1, "text": "hi"}])
+    await mark_failed("t1", "render crashed")
+
+    assert await requeue_task("t1")
+    task = await get_task("t1")
+    assert task["status"] == "pending"
+    assert task["error"] is None
+    assert (await get_artifacts("t1"))["segments"][0]["text"] == "hi"
+
+
+@pytest.mark.asyncio
+async def test_requeue_only_failed_tasks():
+    await create_task("t1", "u1")
+    assert not await requeue_task("t1")
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_task_is_immediate():
+    await create_task("t1", "u1")
+    assert await request_cancel("t1") == "cancelled"
+    assert (await get_task("t1"))["status"] == "cancelled"
+    assert await claim_next_task("worker-a", lease_seconds=60) is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_task_flags_it_for_the_worker():
+    await create_task("t1", "u1")
+    await create_task("t2", "u1")
+    await claim_next_task("worker-a", lease_seconds=60)
+    await claim_next_task("worker-a", lease_seconds=60)
+
+    assert await request_cancel("t1") == "cancelling"
+    assert await cancel_requested_ids(["t1", "t2"]) == {"t1"}
+    assert (await get_task("t1"))["status"] == "processing"
+
+
+@pytest.mark.asyncio
+async def test_cancel_finished_task_is_refused():
+    await create_task("t1", "u1")
+    await mark_done("t1", "summary-1")
+    assert await request_cancel("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_interactive_tasks_are_claimed_before_batch_tasks():
+    await create_task("b1", "u1", priority=PRIORITY_BATCH, batch_id="batch-1")
+    await create_task("b2", "u1", priority=PRIORITY_BATCH, batch_id="batch-1")
+    await create_task("i1", "u2")
+
+    assert (await claim_next_task("worker-a", lease_seconds=60))["task_id"] == "i1"
+    # A worker at its batch cap only takes interactive work
+    assert await claim_next_task("worker-a", lease_seconds=60, max_priority=PRIORITY_INTERACTIVE) is None
+    assert (await claim_next_task("worker-a", lease_seconds=60))["task_id"] == "b1"
+    assert [t["task_id"] for t in await get_batch_tasks("batch-1")] == ["b1", "b2"]
@@ -0,0 +1,57 @@
+"""test_tokens.py — Token estimates, per-backend budgets and budgeted chunking."""
+import pytest
+
+from app.core import tokens
+from app.core.tokens import chunk_token_budget, estimate_token_count, split_to_budget
+
+
+@pytest.fixture
+def estimated(monkeypatch):
+    """Count with the calibrated estimate even if tiktoken is installed."""
+    monkeypatch.setattr(tokens, "count_tokens", estimate_token_count)
+    return estimate_token_count
+
+
+def test_estimate_depends_on_script():
+    assert estimate_token_count("a" * 400) == 100
+    assert estimate_token_count("я" * 400) == 200
+    assert estimate_token_count("语" * 400) == 400
+
+
+def test_budget_per_backend(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "SUMMARIZE_CHUNK_TOKENS", 0)
+    monkeypatch.setattr(settings, "GROQ_LLM_TOKENS_PER_MINUTE", 0)
+    assert chunk_token_budget("groq") > chunk_token_budget("ollama") > 4000
+    # A Groq call never needs more than a minute of the token quota
+    monkeypatch.setattr(settings, "GROQ_LLM_TOKENS_PER_MINUTE", 6000)
+    assert chunk_token_budget("groq") < 6000
+    monkeypatch.setattr(settings, "SUMMARIZE_CHUNK_TOKENS", 1234)
+    assert chunk_token_budget("groq") == chunk_token_budget("ollama") == 1234
+
+
+def test_sentences_are_packed_up_to_the_budget(estimated):
+    text = " ".join(f"Sentence {i:03d} is about one topic." for i in range(100))  # ~9 tokens each
+    chunks = split_to_budget(text, 100, count=estimated)
+
+    assert all(estimated(c) <= 100 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)  # cut at sentence boundaries
+    assert len(chunks) == 10
+    assert " ".join(chunks) == text
+
+
+def test_run_on_text_is_split_at_words(estimated):
+    text = " ".join(f"word{i}" for i in range(1000))  # no punctuation at all
+    chunks = split_to_budget(text, 50, count=estimated)
+
+    assert len(chunks) > 1 and all(estimated(c) <= 50 for c in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_text_without_spaces_is_hard_split(estimated):
+    text = "语言模型" * 100 + "。" + "短句。"
+    chunks = split_to_budget(text, 64, count=estimated)
+
+    assert all(estimated(c) <= 64 for c in chunks)
+    assert "".join(chunks) == text
+    assert chunks[-1].endswith("短句。")
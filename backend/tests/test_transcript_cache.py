@@ -0,0 +1,133 @@
+"""test_transcript_cache.py — Tests for audio fingerprints and the transcript cache."""
+import asyncio
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.core.config import settings
+from app.core.constants import FINGERPRINT_MAX_BER
+from app.core.fingerprint import (
+    BAND_EDGES_HZ,
+    FRAME_SAMPLES,
+    HOP_SAMPLES,
+    audio_fingerprint,
+    band_energies,
+    bit_error_rate,
+)
+from app.core.metrics import collector_registry
+from app.core.transcript_cache import BlockingTranscriptCache, lookup_transcript, store_transcript
+
+SAMPLE_RATE = 16000
+TRANSCRIPT = {"text": "Hello world.", "segments": [{"start": 0.0, "end": 1.0, "text": "Hello world.", "words": []}]}
+
+
+def _tones(seed: int, seconds: int = 30) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    audio = np.zeros_like(t)
+    for _ in range(seconds * 3):
+        freq, start, length = rng.uniform(150, 2500), rng.uniform(0, seconds), rng.uniform(0.1, 0.6)
+        mask = (t > start) & (t < start + length)
+        audio[mask] += np.sin(2 * np.pi * freq * t[mask]) * rng.uniform(0.05, 0.3)
+    audio += rng.standard_normal(len(t)) * 0.005  # room noise
+    return audio.astype(np.float32)
+
+
+def _cache_hits() -> float:
+    return collector_registry().get_sample_value("summarizer_transcript_cache_total", {"result": "hit"}) or 0.0
+
+
+def _fingerprint(audio: np.ndarray, suffix: str = ".wav", subtype: str = None) -> np.ndarray:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        sf.write(path, audio, SAMPLE_RATE, subtype=subtype)
+        return audio_fingerprint(path)
+    finally:
+        os.unlink(path)
+
+
+def test_fingerprint_survives_gain_and_noise_but_not_other_audio():
+    audio = _tones(1)
+    original = _fingerprint(audio)
+    noise = np.random.default_rng(9).standard_normal(len(audio)).astype(np.float32) * 0.0005
+    degraded = _fingerprint(audio * 0.7 + noise)
+
+    assert len(original) == len(degraded) == (len(audio) - FRAME_SAMPLES) // HOP_SAMPLES + 1
+    assert bit_error_rate(original, degraded) < 0.15
+    assert bit_error_rate(original, _fingerprint(_tones(2))) > 0.4
+
+
+@pytest.mark.parametrize("delay_ms", [0, 30, 100, 250])
+def test_fingerprint_matches_shifted_reencoded_copy(delay_ms):
+    audio = _tones(1)
+    # Encoder priming: the copy starts later, then goes through a lossy codec
+    priming = np.random.default_rng(7).standard_normal(SAMPLE_RATE * delay_ms // 1000).astype(np.float32) * 0.005
+    reencoded = _fingerprint(np.concatenate([priming, audio]), suffix=".ogg", subtype="OPUS")
+    original = _fingerprint(audio)
+
+    assert bit_error_rate(original, reencoded) < FINGERPRINT_MAX_BER
+    assert bit_error_rate(reencoded, original) < FINGERPRINT_MAX_BER
+
+
+def test_bands_end_at_their_upper_edge():
+    bins = np.fft.rfftfreq(FRAME_SAMPLES, 1 / SAMPLE_RATE)
+    edges = np.searchsorted(bins, BAND_EDGES_HZ)
+    t = np.arange(FRAME_SAMPLES) / SAMPLE_RATE
+
+    def energies(freq):
+        frame = np.sin(2 * np.pi * freq * t) * np.hanning(FRAME_SAMPLES)
+        return band_energies(np.abs(np.fft.rfft(frame))[None, :] ** 2, edges)[0]
+
+    # A 1 kHz tone lands in the band whose edges enclose it
+    assert np.argmax(energies(1000)) == np.searchsorted(BAND_EDGES_HZ, 1000) - 1
+    # Above 3 kHz nothing reaches the top band (it used to run up to Nyquist)
+    assert energies(5000)[-1] < energies(2950)[-1] - 20
+
+
+@pytest.mark.asyncio
+async def test_lookup_matches_exact_and_near_fingerprints():
+    fingerprint = np.random.default_rng(0).integers(0, 2**32, 100, dtype=np.uint32)
+    await store_transcript(fingerprint, "groq:whisper-large-v3", TRANSCRIPT)
+
+    near = fingerprint.copy()
+    near[:10] ^= 0xFFFF  # 5% of bits flipped
+    other = np.random.default_rng(1).integers(0, 2**32, 100, dtype=np.uint32)
+    hits = _cache_hits()
+
+    assert await lookup_transcript(fingerprint, "groq:whisper-large-v3") == TRANSCRIPT
+    assert await lookup_transcript(near[:-2], "groq:whisper-large-v3") == TRANSCRIPT
+    assert await lookup_transcript(other, "groq:whisper-large-v3") is None
+    assert await lookup_transcript(fingerprint, "local:tiny") is None
+    assert _cache_hits() == hits + 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSCRIPT_CACHE_MAX_ENTRIES", 2)
+    rng = np.random.default_rng(3)
+    a, b, c = (rng.integers(0, 2**32, 50, dtype=np.uint32) for _ in range(3))
+
+    await store_transcript(a, "m", TRANSCRIPT)
+    await asyncio.sleep(0.01)
+    await store_transcript(b, "m", TRANSCRIPT)
+    await asyncio.sleep(0.01)
+    assert await lookup_transcript(a, "m") is not None  # a is now more recent than b
+    await asyncio.sleep(0.01)
+    await store_transcript(c, "m", TRANSCRIPT)
+
+    assert await lookup_transcript(a, "m") is not None
+    assert await lookup_transcript(b, "m") is None
+    assert await lookup_transcript(c, "m") is not None
+
+
+@pytest.mark.asyncio
+async def test_blocking_cache_runs_on_the_event_loop():
+    cache = BlockingTranscriptCache(asyncio.get_running_loop(), "m")
+    fingerprint = np.arange(40, dtype=np.uint32)
+
+    await asyncio.to_thread(cache.put, fingerprint, TRANSCRIPT)
+    assert await asyncio.to_thread(cache.get, fingerprint) == TRANSCRIPT
@@ -0,0 +1,45 @@
+"""test_vad.py — Tests for energy-based voice activity detection."""
+import numpy as np
+import pytest
+
+from app.core.constants import VAD_PAD_SECONDS
+from app.core.vad import TimelineMap, quietest_cut, speech_regions
+
+SAMPLE_RATE = 16000
+FRAME_LEN = 480  # 30 ms
+
+
+def _levels(pattern):
+    """Frame levels from (seconds, dBFS) runs."""
+    return np.concatenate([np.full(int(sec / 0.03), db, dtype=float) for sec, db in pattern])
+
+
+def test_long_pauses_are_dropped_short_ones_kept():
+    levels = _levels([(2, -20), (0.5, -80), (2, -20), (5, -80), (2, -20)])
+    regions = speech_regions(levels, FRAME_LEN, len(levels) * FRAME_LEN, SAMPLE_RATE)
+
+    assert len(regions) == 2
+    (s1, e1), (s2, e2) = regions
+    assert s1 == 0
+    assert e1 / SAMPLE_RATE == pytest.approx(4.5 + VAD_PAD_SECONDS, abs=0.1)
+    assert s2 / SAMPLE_RATE == pytest.approx(9.5 - VAD_PAD_SECONDS, abs=0.1)
+
+
+def test_constant_level_counts_as_speech_and_silence_as_none():
+    loud = np.full(100, -25.0)
+    assert speech_regions(loud, FRAME_LEN, 100 * FRAME_LEN, SAMPLE_RATE) == [(0, 100 * FRAME_LEN)]
+    assert speech_regions(np.full(100, -120.0), FRAME_LEN, 100 * FRAME_LEN, SAMPLE_RATE) is None
+
+
+def test_quietest_cut_picks_the_pause():
+    levels = np.full(100, -20.0)
+    levels[70] = -50.0
+    assert quietest_cut(levels, FRAME_LEN, 60 * FRAME_LEN, 90 * FRAME_LEN) == 70 * FRAME_LEN
+
+
+def test_timeline_map_skips_dropped_gaps():
+    timeline = TimelineMap([(0.0, 5.0), (3.0, 20.0)])
+    assert timeline.start == 5.0
+    assert timeline.to_original(1.0) == 6.0
+    assert timeline.to_original(3.5) == 20.5
+    assert TimelineMap.shifted(10.0).to_original(2.0) == 12.0
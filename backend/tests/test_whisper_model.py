@@ -0,0 +1,210 @@
+"""test_whisper_model.py — Tests for chunked transcription in WhisperTranscriber."""
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.core.cancellation import CancelToken, TaskCancelled
+from app.core.config import settings
+from app.models import whisper_model
+from app.models.whisper_model import WhisperTranscriber
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    """Transcriber over a 25 s WAV in 10 s chunks; `transcribe` is faked."""
+    fd, wav_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    sf.write(wav_path, np.zeros(25 * SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+    t = WhisperTranscriber(chunk_seconds=10, concurrency=3)
+    monkeypatch.setattr(t, "_extract_audio", lambda path, cancel=None: wav_path)
+    t.calls = []
+    t.active = 0
+    t.peak = 0
+    lock = threading.Lock()
+
+    def fake_transcribe(chunk_path):
+        with lock:
+            seconds = sf.info(chunk_path).duration
+            t.calls.append(seconds)
+            t.active += 1
+            t.peak = max(t.peak, t.active)
+        # The first (longest) chunks finish last
+        time.sleep(seconds / 100)
+        with lock:
+            t.active -= 1
+        return {
+            "text": f"{seconds:g}s",
+            "segments": [{"start": 1.0, "end": seconds, "text": f"{seconds:g}s", "words": []}],
+        }
+
+    monkeypatch.setattr(t, "transcribe", fake_transcribe)
+    yield t
+    if os.path.exists(wav_path):
+        os.unlink(wav_path)
+
+
+def test_chunks_run_concurrently_and_merge_in_order(transcriber):
+    chunks = list(transcriber.iter_transcribe_file("video.mp4"))
+
+    assert [c["index"] for c in chunks] == [0, 1, 2]
+    assert transcriber.peak > 1
+    # Offsets come from each chunk's first sample, not the previous transcript
+    starts = [c["segments"][0]["start"] for c in chunks]
+    ends = [c["segments"][0]["end"] for c in chunks]
+    assert starts == pytest.approx([1.0, 11.0, 21.0])
+    assert ends == pytest.approx([10.0, 20.0, 25.0])
+
+
+def test_concurrency_limit_is_respected(transcriber):
+    transcriber.concurrency = 1
+    result = transcriber.transcribe_file("video.mp4")
+
+    assert transcriber.peak == 1
+    assert result["text"] == "10s 10s 5s"
+    assert result["duration"] == pytest.approx(25.0)
+
+
+def test_cancel_stops_transcription(transcriber):
+    transcriber.concurrency = 1
+    token = CancelToken("whisper-test")
+    chunks = transcriber.iter_transcribe_file("video.mp4", cancel=token)
+    next(chunks)
+    token.cancel()
+    with pytest.raises(TaskCancelled):
+        next(chunks)
+    assert len(transcriber.calls) < 3
+    token.cleanup()
+
+
+def test_chunker_streams_one_chunk_at_a_time(transcriber):
+    created = []
+    chunks = transcriber._iter_chunks(transcriber._extract_audio("video.mp4"), created)
+
+    path, timeline, total = next(chunks)
+    assert created == [path] and timeline.start == 0.0 and total == 3
+    assert path.endswith(".flac")
+    assert sf.info(path).duration == pytest.approx(10.0)
+    assert [timeline.start for _, timeline, _ in chunks] == [10.0, 20.0]
+    assert len(created) == 3
+    for p in created:
+        os.unlink(p)
+
+
+@pytest.mark.parametrize("chunk_format", ["flac", "opus", "wav"])
+def test_chunks_are_sized_to_the_upload_limit(transcriber, chunk_format):
+    noise = (np.random.default_rng(0).standard_normal(25 * SAMPLE_RATE) * 3000).astype(np.int16)
+    sf.write(transcriber._extract_audio("video.mp4"), noise, SAMPLE_RATE)
+    transcriber.chunk_seconds = None
+    transcriber.chunk_format = chunk_format
+    transcriber.max_upload_bytes = 200_000
+
+    created = []
+    chunks = list(transcriber._iter_chunks(transcriber._extract_audio("video.mp4"), created))
+
+    sizes = [os.path.getsize(path) for path, _, _ in chunks]
+    durations = [sf.info(path).duration for path, _, _ in chunks]
+    assert all(size <= 200_000 for size in sizes)
+    assert sum(durations) == pytest.approx(25.0)
+    assert [timeline.start for _, timeline, _ in chunks] == pytest.approx(np.cumsum([0] + durations[:-1]))
+    for p in created:
+        os.unlink(p)
+
+
+def test_vad_drops_silence_and_keeps_original_timestamps(transcriber):
+    # 0-4 s tone, 4-14 s silence, 14-18 s tone
+    t = np.arange(18 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    audio[4 * SAMPLE_RATE : 14 * SAMPLE_RATE] = 0
+    sf.write(transcriber._extract_audio("video.mp4"), audio, SAMPLE_RATE)
+    transcriber.chunk_seconds = 60
+
+    chunks = list(transcriber.iter_transcribe_file("video.mp4"))
+
+    assert len(chunks) == 1
+    sent = transcriber.calls[0]
+    assert 8.0 < sent < 9.0  # both tones plus padding, not the 10 s gap
+    # The fake's one segment runs from 1 s into the chunk to its end
+    segment = chunks[0]["segments"][0]
+    assert segment["start"] == pytest.approx(1.0)
+    assert segment["end"] == pytest.approx(18.0)
+
+
+class FakeBatchedPipeline:
+    """Stands in for faster_whisper.BatchedInferencePipeline."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, batch_size=16, word_timestamps=False, **kwargs):
+        self.calls.append({"batch_size": batch_size, "word_timestamps": word_timestamps})
+        words = [SimpleNamespace(word=" Hello", start=0.5, end=0.9, probability=0.9),
+                 SimpleNamespace(word=" world.", start=1.0, end=1.4, probability=0.8)]
+        segments = iter([SimpleNamespace(start=0.5, end=1.4, text=" Hello world.", words=words)])
+        return segments, SimpleNamespace(language="en", duration=sf.info(audio).duration)
+
+
+def test_local_engine_loads_model_once_and_keeps_word_timestamps(monkeypatch):
+    loads = []
+
+    def fake_load(model_size, compute_type, cpu_threads):
+        loads.append((model_size, compute_type))
+        return pipeline
+
+    pipeline = FakeBatchedPipeline()
+    monkeypatch.setattr(settings, "TRANSCRIBE_ENGINE", "local")
+    monkeypatch.setattr(whisper_model, "_HAS_FASTER_WHISPER", True)
+    monkeypatch.setattr(whisper_model, "_load_local_model", fake_load)
+
+    t = WhisperTranscriber(model_size="base")
+    assert t.engine == "local" and t.chunk_format == "wav"
+    assert loads == [("base", settings.LOCAL_WHISPER_COMPUTE_TYPE)]
+
+    fd, wav_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    sf.write(wav_path, np.zeros(2 * SAMPLE_RATE, dtype=np.int16), SAMPLE_RATE)
+    try:
+        result = t.transcribe(wav_path)
+    finally:
+        os.unlink(wav_path)
+
+    assert pipeline.calls == [{"batch_size": settings.LOCAL_WHISPER_BATCH_SIZE, "word_timestamps": True}]
+    assert result["text"] == "Hello world."
+    assert [w["start"] for w in result["segments"][0]["words"]] == [0.5, 1.0]
+
+
+class DictCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, fingerprint):
+        return self.entries.get(fingerprint.tobytes())
+
+    def put(self, fingerprint, transcript):
+        self.entries[fingerprint.tobytes()] = transcript
+
+
+def test_transcript_cache_skips_transcription_on_a_hit(transcriber):
+    wav_path = transcriber._extract_audio("video.mp4")
+    t = np.arange(25 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    transcriber.use_mock = False
+    cache = DictCache()
+
+    sf.write(wav_path, audio, SAMPLE_RATE)
+    first = list(transcriber.iter_transcribe_file("video.mp4", cache=cache))
+    assert len(transcriber.calls) == 3 and len(cache.entries) == 1
+
+    sf.write(wav_path, audio, SAMPLE_RATE)  # the same recording again
+    second = list(transcriber.iter_transcribe_file("video.mp4", cache=cache))
+    assert len(transcriber.calls) == 3
+    assert len(second) == 1
+    assert second[0]["segments"] == [seg for chunk in first for seg in chunk["segments"]]
@@ -0,0 +1,40 @@
+"""test_worker.py — Tests for the worker's job leases."""
+import asyncio
+
+import pytest
+
+from app import worker as worker_module
+from app.core.task_store import claim_next_task, create_task, get_task
+
+
+@pytest.mark.asyncio
+async def test_job_stops_when_its_lease_is_lost(monkeypatch):
+    from app.api import summarize
+    started, tokens = asyncio.Event(), []
+
+    async def pipeline(task_id, *args, cancel=None, **kwargs):
+        tokens.append(cancel)
+        started.set()
+        while True:
+            cancel.check()
+            await asyncio.sleep(0.05)
+
+    async def renew_lease(task_id, worker_id, lease_seconds):
+        return False  # re-queued and claimed by another worker meanwhile
+
+    monkeypatch.setattr(summarize, "_run_summarize_pipeline", pipeline)
+    monkeypatch.setattr(worker_module.settings, "TASK_LEASE_SECONDS", 3)  # renewed every second
+    monkeypatch.setattr(worker_module, "renew_lease", renew_lease)
+    await create_task("t1", "u1", payload={"video_path": "v.mp4"})
+    task = await claim_next_task("other-worker", lease_seconds=60)
+
+    worker = worker_module.Worker()
+    job = worker._running["t1"] = asyncio.create_task(worker._run_job(task))
+    await started.wait()
+    await asyncio.wait_for(asyncio.gather(job, return_exceptions=True), timeout=5)
+
+    assert tokens[0].cancelled
+    assert not worker._running and not worker._cancel_tokens
+    # Nothing was written over the new owner's task
+    task = await get_task("t1")
+    assert task["status"] == "processing" and task["locked_by"] == "other-worker"
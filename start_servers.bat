@@ -7,11 +7,14 @@ echo.
 REM Auto-detect project root from this script's location
 set "PROJECT_DIR=%~dp0"
 
-echo [1/2] Starting Backend (port 8000)...
+echo [1/3] Starting Backend (port 8000)...
 cd /d "%PROJECT_DIR%backend"
 start "Backend Server" cmd /k "python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000"
 
-echo [2/2] Starting Frontend (port 3000)...
+echo [2/3] Starting Summarization Worker...
+start "Summarization Worker" cmd /k "python -m app.worker"
+
+echo [3/3] Starting Frontend (port 3000)...
 cd /d "%PROJECT_DIR%frontend"
 start "Frontend Server" cmd /k "set HOST=0.0.0.0 && npm start"
 